@@ -4,14 +4,38 @@
 
 """Eversolar PMU integration."""
 import logging
+import os
+import shutil
+from functools import partial
 
 import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 
-from .const import CONF_HOST, DOMAIN
+from .const import (
+    CONF_AUTO_SYNC_DELAY,
+    CONF_HOST,
+    DOMAIN,
+    GRID_QUALITY_STORAGE_KEY,
+    GRID_QUALITY_STORAGE_VERSION,
+    PERFORMANCE_STORAGE_KEY,
+    PERFORMANCE_STORAGE_VERSION,
+    ROLLUPS_STORAGE_KEY,
+    ROLLUPS_STORAGE_VERSION,
+    STATISTICS_STORAGE_KEY,
+    STATISTICS_STORAGE_VERSION,
+)
 from .coordinator import EversolarDataUpdateCoordinator
+from .metrics import EversolarMetricsView
+from .profiler import DEFAULT_PROFILE_POLLS, MAX_PROFILE_POLLS
+from .request_queue import async_release_request_queue
+from .rollups import PERIOD_DAY, PERIODS
+from .websocket import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,11 +43,21 @@ PLATFORMS = [Platform.SENSOR, Platform.BINARY_SENSOR, Platform.NUMBER]
 
 CONFIG_SCHEMA = vol.Schema({DOMAIN: vol.Schema({})}, extra=vol.ALLOW_EXTRA)
 
+# Samples returned by one samples service call
+DEFAULT_SAMPLES_LIMIT = 1000
+MAX_SAMPLES_LIMIT = 100000
+
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Eversolar PMU component."""
     hass.data.setdefault(DOMAIN, {})
 
+    # Prometheus metrics for all configured inverters
+    hass.http.register_view(EversolarMetricsView(hass))
+
+    # Live values for dashboards, without entity state writes
+    async_register_websocket_commands(hass)
+
     # Support YAML configuration (legacy)
     if DOMAIN in config:
         for conf in config[DOMAIN]:
@@ -43,9 +77,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
 
     coordinator = EversolarDataUpdateCoordinator(hass, entry)
+    await coordinator.async_load_storage()
 
     # Perform initial data fetch
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        await async_release_request_queue(hass, coordinator.request_queue)
+        raise
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
@@ -76,14 +115,146 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         ),
     )
 
+    async def handle_profile(call: ServiceCall) -> ServiceResponse:
+        """Handle profile service call."""
+        config_entry_id = call.data["config_entry_id"]
+        coord = hass.data[DOMAIN].get(config_entry_id)
+        if coord is None:
+            raise HomeAssistantError(f"Config entry {config_entry_id} not found")
+        return await coord.async_profile(call.data["polls"])
+
+    hass.services.async_register(
+        DOMAIN,
+        "profile",
+        handle_profile,
+        schema=vol.Schema(
+            {
+                vol.Required("config_entry_id"): str,
+                vol.Optional("polls", default=DEFAULT_PROFILE_POLLS): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=MAX_PROFILE_POLLS)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def handle_rollups(call: ServiceCall) -> ServiceResponse:
+        """Handle rollups service call."""
+        config_entry_id = call.data["config_entry_id"]
+        coord = hass.data[DOMAIN].get(config_entry_id)
+        if coord is None:
+            raise HomeAssistantError(f"Config entry {config_entry_id} not found")
+        period = call.data["period"]
+        return {
+            "period": period,
+            "rollups": coord.rollups.range(period, call.data.get("start"), call.data.get("end")),
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        "rollups",
+        handle_rollups,
+        schema=vol.Schema(
+            {
+                vol.Required("config_entry_id"): str,
+                vol.Optional("period", default=PERIOD_DAY): vol.In(PERIODS),
+                vol.Optional("start"): cv.date,
+                vol.Optional("end"): cv.date,
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def handle_samples(call: ServiceCall) -> ServiceResponse:
+        """Handle samples service call."""
+        config_entry_id = call.data["config_entry_id"]
+        coord = hass.data[DOMAIN].get(config_entry_id)
+        if coord is None:
+            raise HomeAssistantError(f"Config entry {config_entry_id} not found")
+        if coord.sample_store is None:
+            raise HomeAssistantError("The sample store is not enabled for this entry")
+        start = dt_util.as_timestamp(call.data["start"])
+        end = dt_util.as_timestamp(call.data.get("end") or dt_util.utcnow())
+        codes = call.data.get("codes")
+        return await hass.async_add_executor_job(
+            coord.sample_store.read_columns,
+            int(start),
+            int(end),
+            None if codes is None else set(codes),
+            call.data["limit"],
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        "samples",
+        handle_samples,
+        schema=vol.Schema(
+            {
+                vol.Required("config_entry_id"): str,
+                vol.Required("start"): cv.datetime,
+                vol.Optional("end"): cv.datetime,
+                vol.Optional("codes"): vol.All(
+                    cv.ensure_list, [vol.All(vol.Coerce(int), vol.Range(min=0, max=255))]
+                ),
+                vol.Optional("limit", default=DEFAULT_SAMPLES_LIMIT): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=MAX_SAMPLES_LIMIT)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def handle_grid_quality(call: ServiceCall) -> ServiceResponse:
+        """Handle grid_quality service call."""
+        config_entry_id = call.data["config_entry_id"]
+        coord = hass.data[DOMAIN].get(config_entry_id)
+        if coord is None:
+            raise HomeAssistantError(f"Config entry {config_entry_id} not found")
+        return {
+            "limits": {metric: list(limits) for metric, limits in coord.grid_quality.limits.items()},
+            "days": coord.grid_quality.range(call.data.get("start"), call.data.get("end")),
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        "grid_quality",
+        handle_grid_quality,
+        schema=vol.Schema(
+            {
+                vol.Required("config_entry_id"): str,
+                vol.Optional("start"): cv.date,
+                vol.Optional("end"): cv.date,
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+
     # Update entry options listener
     entry.add_update_listener(async_update_options)
 
     return True
 
 
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate a config entry to the current version."""
+    if entry.version == 1:
+        # Version 1 stored the auto sync delay in minutes; it is now in seconds
+        data = dict(entry.data)
+        options = dict(entry.options)
+        for values in (data, options):
+            if CONF_AUTO_SYNC_DELAY in values:
+                values[CONF_AUTO_SYNC_DELAY] = int(values[CONF_AUTO_SYNC_DELAY]) * 60
+        hass.config_entries.async_update_entry(entry, data=data, options=options, version=2)
+        _LOGGER.debug("Migrated %s to version 2", entry.title)
+    return True
+
+
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Handle options update."""
+    """Handle options update, reloading only when a setting cannot be applied in place."""
+    coordinator: EversolarDataUpdateCoordinator | None = hass.data[DOMAIN].get(entry.entry_id)
+    if coordinator is not None and coordinator.async_apply_options():
+        _LOGGER.debug("Applied options of %s without reloading", entry.title)
+        return
     await hass.config_entries.async_reload(entry.entry_id)
 
 
@@ -92,10 +263,41 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        # The PMU's request queue is dropped unless another entry polls the same address
+        await async_release_request_queue(hass, coordinator.request_queue)
 
         # If no more entries, remove domain data and unregister services
         if not hass.data[DOMAIN]:
             hass.services.async_remove(DOMAIN, "sync_time")
+            hass.services.async_remove(DOMAIN, "profile")
+            hass.services.async_remove(DOMAIN, "rollups")
+            hass.services.async_remove(DOMAIN, "samples")
+            hass.services.async_remove(DOMAIN, "grid_quality")
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove stored rollups, baselines, grid quality, statistics hour, samples, export spool and archive of a deleted entry."""
+    for version, key in (
+        (ROLLUPS_STORAGE_VERSION, ROLLUPS_STORAGE_KEY),
+        (PERFORMANCE_STORAGE_VERSION, PERFORMANCE_STORAGE_KEY),
+        (GRID_QUALITY_STORAGE_VERSION, GRID_QUALITY_STORAGE_KEY),
+        (STATISTICS_STORAGE_VERSION, STATISTICS_STORAGE_KEY),
+    ):
+        await Store(hass, version, f"{key}.{entry.entry_id}").async_remove()
+    for directory in ("samples", "spool"):
+        await hass.async_add_executor_job(
+            partial(shutil.rmtree, hass.config.path(DOMAIN, directory, entry.entry_id), ignore_errors=True)
+        )
+    archive_path = hass.config.path(DOMAIN, "archive", f"{entry.entry_id}.evarc")
+    await hass.async_add_executor_job(partial(_remove_file, archive_path))
+
+
+def _remove_file(path: str) -> None:
+    """Delete a file if it exists."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,281 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Compact archive of raw register history.
+
+An archive file is a magic header followed by blocks, normally one per hour.
+Each block header holds the time span, row count and code list, followed by
+the body length so readers can skip a block without decoding it. The body is
+column-major: timestamps, then one column per code. A column is a sequence of
+(zigzag delta, run length) varint pairs, where a run repeats the same delta,
+so constant registers, steadily counting registers and a fixed poll interval
+each cost a few bytes per block. This module has no Home Assistant dependency.
+"""
+import logging
+import os
+from array import array
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"EVAR\x01"
+
+
+def zigzag(value: int) -> int:
+    """Map a signed integer to an unsigned one (0, -1, 1, -2 -> 0, 1, 2, 3)."""
+    return (value << 1) if value >= 0 else ((-value) << 1) - 1
+
+
+def unzigzag(value: int) -> int:
+    """Invert zigzag."""
+    return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    """Append an unsigned LEB128 varint."""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(buf, pos: int) -> tuple:
+    """Return (value, next position) of the varint at pos."""
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def encode_column(out: bytearray, values, base: int = 0) -> None:
+    """Append values as runs of equal deltas from base."""
+    previous_delta = None
+    run = 0
+    previous = base
+    for value in values:
+        delta = value - previous
+        previous = value
+        if delta == previous_delta:
+            run += 1
+            continue
+        if run:
+            write_varint(out, zigzag(previous_delta))
+            write_varint(out, run)
+        previous_delta = delta
+        run = 1
+    if run:
+        write_varint(out, zigzag(previous_delta))
+        write_varint(out, run)
+
+
+def decode_column(buf, pos: int, rows: int, base: int = 0) -> tuple:
+    """Return (list of rows values, next position) of a column at pos."""
+    values = []
+    value = base
+    while len(values) < rows:
+        delta, pos = read_varint(buf, pos)
+        run, pos = read_varint(buf, pos)
+        delta = unzigzag(delta)
+        for _ in range(run):
+            value += delta
+            values.append(value)
+    return values, pos
+
+
+def encode_block(codes: tuple, timestamps: list, rows: list) -> bytes:
+    """Encode one block of samples; rows are register sequences aligned to codes."""
+    body = bytearray()
+    encode_column(body, timestamps, timestamps[0])
+    for i in range(len(codes)):
+        encode_column(body, (row[i] for row in rows))
+
+    header = bytearray()
+    write_varint(header, timestamps[0])
+    write_varint(header, timestamps[-1] - timestamps[0])
+    write_varint(header, len(timestamps))
+    write_varint(header, len(codes))
+    header += bytes(codes)
+    write_varint(header, len(body))
+    return bytes(header + body)
+
+
+def _read_file_varint(f, required: bool = False) -> int | None:
+    """Read a varint from a file; return None at a clean end of file unless required."""
+    result = 0
+    shift = 0
+    while True:
+        byte = f.read(1)
+        if not byte:
+            if shift or required:
+                raise EOFError("truncated block header")
+            return None
+        result |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return result
+        shift += 7
+
+
+def iter_blocks(f):
+    """Yield (first_ts, last_ts, rows, codes, body_len) for each block of an open archive.
+
+    The file is left positioned at the start of the block body; a consumer that
+    does not read the body must seek past body_len bytes. Raises EOFError if the
+    file ends inside a block header.
+    """
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not an Eversolar archive")
+    while True:
+        first_ts = _read_file_varint(f)
+        if first_ts is None:
+            return
+        # Past the first field, an end of file is a truncated block
+        last_ts = first_ts + _read_file_varint(f, True)
+        rows = _read_file_varint(f, True)
+        code_count = _read_file_varint(f, True)
+        codes = tuple(f.read(code_count))
+        if len(codes) < code_count:
+            raise EOFError("truncated code list")
+        body_len = _read_file_varint(f, True)
+        yield first_ts, last_ts, rows, codes, body_len
+
+
+def complete_length(f) -> int:
+    """Return the length of the header and complete blocks of an open archive.
+
+    Anything after that is the tail of an interrupted write. Returns 0 for an
+    empty file or a partial header; raises ValueError if the file is not an
+    archive.
+    """
+    size = f.seek(0, os.SEEK_END)
+    f.seek(0)
+    if size < len(MAGIC) and MAGIC.startswith(f.read()):
+        return 0
+    f.seek(0)
+    end = len(MAGIC)
+    try:
+        for _first_ts, _last_ts, _rows, _codes, body_len in iter_blocks(f):
+            body_end = f.tell() + body_len
+            if body_end > size:
+                break
+            end = f.seek(body_end)
+    except EOFError:
+        pass
+    return end
+
+
+def iter_samples(path: str, start: int | None = None, end: int | None = None):
+    """Yield (timestamp, codes, values) for samples in [start, end], oldest first.
+
+    Blocks outside the range are skipped without decoding their bodies. A
+    truncated last block, as left by an interrupted write, ends the stream.
+    """
+    with open(path, "rb") as f:
+        try:
+            for first_ts, last_ts, rows, codes, body_len in iter_blocks(f):
+                if (start is not None and last_ts < start) or (end is not None and first_ts > end):
+                    f.seek(body_len, os.SEEK_CUR)
+                    continue
+                body = f.read(body_len)
+                if len(body) < body_len:
+                    raise EOFError("truncated block body")
+                timestamps, pos = decode_column(body, 0, rows, first_ts)
+                columns = []
+                for _ in codes:
+                    column, pos = decode_column(body, pos, rows)
+                    columns.append(column)
+                for i, timestamp in enumerate(timestamps):
+                    if (start is None or timestamp >= start) and (end is None or timestamp <= end):
+                        yield timestamp, codes, tuple(column[i] for column in columns)
+        except EOFError as err:
+            _LOGGER.warning("Archive %s ends in an incomplete block: %s", path, err)
+
+
+class ArchiveWriter:
+    """Collect samples in memory and append them to an archive as blocks.
+
+    The caller decides block boundaries (normally on the hour) by calling
+    close_block; a change of code list also starts a new block. Closed blocks
+    are handed from take_blocks to write_blocks, which performs blocking I/O
+    and must run outside the event loop.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize writer."""
+        self.path = path
+        self._codes: tuple | None = None
+        self._timestamps: list = []
+        self._rows: list = []
+        self._blocks: list = []
+        # File size after the last write, so an unchanged file is not re-checked
+        self._size: int | None = None
+
+        # Counters
+        self.blocks_written = 0
+        self.bytes_written = 0
+
+    @property
+    def pending(self) -> int:
+        """Return the number of samples not yet written."""
+        return len(self._timestamps) + sum(len(block[1]) for block in self._blocks)
+
+    def add(self, timestamp: int, codes: tuple, raw: array) -> None:
+        """Buffer one sample."""
+        if self._codes is not None and codes != self._codes:
+            self.close_block()
+        self._codes = codes
+        if self._timestamps:
+            # Keep block spans non-negative if the host clock steps back
+            timestamp = max(timestamp, self._timestamps[-1])
+        self._timestamps.append(timestamp)
+        self._rows.append(array("H", raw))
+
+    def close_block(self) -> None:
+        """End the current block; it is returned by the next take_blocks."""
+        if self._timestamps:
+            self._blocks.append((self._codes, self._timestamps, self._rows))
+        self._codes = None
+        self._timestamps = []
+        self._rows = []
+
+    def take_blocks(self) -> list:
+        """Return and forget the closed blocks, to pass to write_blocks."""
+        blocks, self._blocks = self._blocks, []
+        return blocks
+
+    def write_blocks(self, blocks: list) -> int:
+        """Append blocks to the archive; return the bytes written.
+
+        The tail of an earlier interrupted write is cut off first, so readers
+        reach the new blocks.
+        """
+        if not blocks:
+            return 0
+        data = b"".join(encode_block(*block) for block in blocks)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "r+b" if os.path.exists(self.path) else "w+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size != self._size:
+                end = complete_length(f)
+                if end < size:
+                    _LOGGER.warning(
+                        "Archive %s ends in %d bytes of an incomplete block; removing them",
+                        self.path,
+                        size - end,
+                    )
+                    f.truncate(end)
+                size = end
+            f.seek(size)
+            if size == 0:
+                f.write(MAGIC)
+            f.write(data)
+            self._size = f.tell()
+        self.blocks_written += len(blocks)
+        self.bytes_written += len(data)
+        return len(data)
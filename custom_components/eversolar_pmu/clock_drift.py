@@ -0,0 +1,144 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Online estimator of PMU clock drift against the host clock."""
+from collections import deque
+
+# The window keeps at least this many samples and at least this much history,
+# so the fit spans MIN_FIT_SPAN at every scan interval
+DEFAULT_WINDOW = 60
+DEFAULT_WINDOW_SECONDS = 3600.0
+# Samples and time span needed before the slope is trusted for projection
+MIN_FIT_SAMPLES = 10
+MIN_FIT_SPAN = 600.0
+# A sample this far from the fit means the PMU clock was reset or stepped
+JUMP_THRESHOLD = 5.0
+# Consecutive polls without the PMU epoch advancing before the clock counts as stuck
+STUCK_SAMPLES = 2
+
+SYNC_REASON_UNCALIBRATED = "uncalibrated"
+SYNC_REASON_STUCK = "stuck"
+SYNC_REASON_OFFSET = "offset"
+
+
+class ClockDriftEstimator:
+    """Fit the PMU clock offset against host time over a sliding window.
+
+    The window holds the last window samples, extended to the last
+    window_seconds of samples when polls are more frequent than that.
+
+    Each sample is the offset pmu_epoch - host_time. A least-squares line
+    through the window gives the drift rate, which projects the offset forward
+    in time. Errors are measured against a reference offset taken from the first
+    sample after a time sync, so a PMU that keeps its clock in local time still
+    reads as correct. A sample far off the fit (a PMU reboot or a manual clock
+    change) restarts the window.
+    """
+
+    def __init__(
+        self, window: int = DEFAULT_WINDOW, window_seconds: float = DEFAULT_WINDOW_SECONDS
+    ) -> None:
+        """Initialize estimator."""
+        self._samples: deque = deque()
+        self._window = window
+        self._window_seconds = window_seconds
+        self.reference_offset: float | None = None
+        self._awaiting_reference = False
+        self.last_epoch: int | None = None
+        self.last_host_time: float | None = None
+        self.epoch_step: int | None = None
+        self._stalled = 0
+        self.resets = 0
+
+    @property
+    def stuck(self) -> bool:
+        """Return True if the PMU epoch has stopped advancing."""
+        return self._stalled >= STUCK_SAMPLES
+
+    @property
+    def calibrated(self) -> bool:
+        """Return True once a post-sync reference offset is known."""
+        return self.reference_offset is not None
+
+    def reset(self) -> None:
+        """Start over after a time sync; the next sample becomes the reference."""
+        self._samples.clear()
+        self.reference_offset = None
+        self._awaiting_reference = True
+        self._stalled = 0
+
+    def _fit(self) -> tuple | None:
+        """Return (mean_time, mean_offset, slope) for the window, or None."""
+        n = len(self._samples)
+        if n < MIN_FIT_SAMPLES or self._samples[-1][0] - self._samples[0][0] < MIN_FIT_SPAN:
+            return None
+        mean_t = sum(t for t, _ in self._samples) / n
+        mean_o = sum(o for _, o in self._samples) / n
+        sxx = sum((t - mean_t) ** 2 for t, _ in self._samples)
+        if not sxx:
+            return None
+        sxy = sum((t - mean_t) * (o - mean_o) for t, o in self._samples)
+        return mean_t, mean_o, sxy / sxx
+
+    def add(self, host_time: float, pmu_epoch: int) -> None:
+        """Add one sample taken at host_time (unix seconds)."""
+        if self.last_epoch is not None:
+            self.epoch_step = pmu_epoch - self.last_epoch
+            if self.epoch_step <= 0 and host_time - self.last_host_time >= 1.0:
+                self._stalled += 1
+            else:
+                self._stalled = 0
+        self.last_epoch = pmu_epoch
+        self.last_host_time = host_time
+
+        offset = pmu_epoch - host_time
+        if self._samples and not self.stuck:
+            expected = self.project(host_time)
+            if abs(offset - expected) > JUMP_THRESHOLD:
+                self._samples.clear()
+                self.resets += 1
+        if self.stuck:
+            return  # A frozen clock says nothing about drift
+        if self._awaiting_reference:
+            self.reference_offset = offset
+            self._awaiting_reference = False
+        self._samples.append((host_time, offset))
+        while (
+            len(self._samples) > self._window
+            and host_time - self._samples[0][0] > self._window_seconds
+        ):
+            self._samples.popleft()
+
+    def project(self, host_time: float) -> float:
+        """Return the projected offset at host_time."""
+        fit = self._fit()
+        if fit is None:
+            # Too little history for a slope: use the recent mean offset
+            recent = list(self._samples)[-MIN_FIT_SAMPLES:]
+            return sum(o for _, o in recent) / len(recent) if recent else 0.0
+        mean_t, mean_o, slope = fit
+        return mean_o + slope * (host_time - mean_t)
+
+    @property
+    def drift_ppm(self) -> float | None:
+        """Return the fitted drift rate in parts per million, or None."""
+        fit = self._fit()
+        return None if fit is None else fit[2] * 1e6
+
+    def error(self, host_time: float) -> float | None:
+        """Return the projected clock error at host_time, or None if uncalibrated."""
+        if self.reference_offset is None or not self._samples:
+            return None
+        return self.project(host_time) - self.reference_offset
+
+    def sync_reason(self, host_time: float, threshold: float) -> str | None:
+        """Return why the PMU clock needs a sync at host_time, or None."""
+        if self.stuck:
+            return SYNC_REASON_STUCK
+        if self.reference_offset is None:
+            return SYNC_REASON_UNCALIBRATED
+        error = self.error(host_time)
+        if error is not None and abs(error) >= threshold:
+            return SYNC_REASON_OFFSET
+        return None
@@ -3,29 +3,71 @@
 # https://github.com/aburow/eversolar-pmu-ha
 
 """Config flow for Eversolar PMU integration."""
+import ipaddress
 import logging
 from typing import Any, Dict, Optional
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.components.network import async_get_source_ip
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import config_validation as cv
 
 from .const import (
+    CONF_ARCHIVE,
     CONF_AUTO_SYNC_DELAY,
     CONF_AUTO_SYNC_ENABLED,
+    CONF_AUTO_SYNC_THRESHOLD,
+    CONF_EXPORT_BATCH_SIZE,
+    CONF_EXPORT_FLUSH_INTERVAL,
+    CONF_EXPORT_TOKEN,
+    CONF_EXPORT_URL,
+    CONF_GRID_FREQUENCY_HIGH,
+    CONF_GRID_FREQUENCY_LOW,
+    CONF_GRID_VOLTAGE_HIGH,
+    CONF_GRID_VOLTAGE_LOW,
     CONF_HOST,
+    CONF_NETWORK,
+    CONF_PERFORMANCE_LOWER_BOUND,
+    CONF_PERFORMANCE_UPPER_BOUND,
     CONF_PORT,
     CONF_PV_VOLTAGE_STATS_CUTOFF,
     CONF_PV_VOLTAGE_THRESHOLD,
+    CONF_SAMPLE_STORE,
+    CONF_SAMPLE_STORE_MAX_MB,
     CONF_SCAN_INTERVAL,
+    CONF_SLOW_PUBLISH_CHANGE,
+    CONF_SLOW_PUBLISH_INTERVAL,
+    CONF_SLOW_PUBLISH_SENSORS,
+    CONF_STATISTICS_BATCH_HOURS,
+    CONF_STATISTICS_IMPORT,
+    CONF_STATISTICS_SUPPRESS_STATES,
     CONF_TIMEOUT,
+    DEFAULT_AUTO_SYNC_DELAY,
+    DEFAULT_AUTO_SYNC_THRESHOLD,
+    DEFAULT_EXPORT_BATCH_SIZE,
+    DEFAULT_EXPORT_FLUSH_INTERVAL,
+    DEFAULT_GRID_FREQUENCY_HIGH,
+    DEFAULT_GRID_FREQUENCY_LOW,
+    DEFAULT_GRID_VOLTAGE_HIGH,
+    DEFAULT_GRID_VOLTAGE_LOW,
+    DEFAULT_PERFORMANCE_LOWER_BOUND,
+    DEFAULT_PERFORMANCE_UPPER_BOUND,
     DEFAULT_PORT,
+    DEFAULT_SAMPLE_STORE_MAX_MB,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SLOW_PUBLISH_CHANGE,
+    DEFAULT_SLOW_PUBLISH_INTERVAL,
+    DEFAULT_SLOW_PUBLISH_SENSORS,
+    DEFAULT_STATISTICS_BATCH_HOURS,
     DEFAULT_TIMEOUT,
     DOMAIN,
+    PUBLISH_SENSORS,
 )
+from .discovery import async_scan_network
 from .eversolar_protocol import EversolarPMU
+from .request_queue import async_get_request_queue, async_release_request_queue
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,23 +75,105 @@ _LOGGER = logging.getLogger(__name__)
 class EversolarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Eversolar PMU."""
 
-    VERSION = 1
+    VERSION = 2
+
+    def __init__(self) -> None:
+        """Initialize config flow."""
+        self._discovered: Dict[str, Any] = {}
+        self._discovery_port: int = DEFAULT_PORT
 
     async def async_step_user(
         self, user_input: Optional[Dict[str, Any]] = None
     ) -> FlowResult:
         """Handle the initial step."""
+        return self.async_show_menu(step_id="user", menu_options=["discover", "manual"])
+
+    async def async_step_discover(
+        self, user_input: Optional[Dict[str, Any]] = None
+    ) -> FlowResult:
+        """Scan a network range for PMUs."""
+        errors: Dict[str, str] = {}
+
+        if user_input is not None:
+            self._discovery_port = user_input.get(CONF_PORT, DEFAULT_PORT)
+            # Configured PMUs are not probed, so the scan never competes with their polls
+            try:
+                self._discovered = await async_scan_network(
+                    user_input[CONF_NETWORK],
+                    self._discovery_port,
+                    exclude=self._async_current_ids(),
+                )
+            except ValueError as err:
+                _LOGGER.debug("Invalid discovery network %s: %s", user_input[CONF_NETWORK], err)
+                errors[CONF_NETWORK] = "invalid_network"
+            else:
+                if not self._discovered:
+                    return self.async_abort(reason="no_devices_found")
+                return await self.async_step_pick()
+
+        default_network = ""
+        try:
+            source_ip = await async_get_source_ip(self.hass)
+            default_network = str(ipaddress.ip_network(f"{source_ip}/24", strict=False))
+        except Exception:  # Source IP is only a convenience default
+            pass
+
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_NETWORK, default=default_network): str,
+                vol.Optional(CONF_PORT, default=DEFAULT_PORT): int,
+            }
+        )
+
+        return self.async_show_form(step_id="discover", data_schema=schema, errors=errors)
+
+    async def async_step_pick(
+        self, user_input: Optional[Dict[str, Any]] = None
+    ) -> FlowResult:
+        """Let the user pick one of the discovered PMUs."""
+        if user_input is not None:
+            host = user_input[CONF_HOST]
+            await self.async_set_unique_id(host)
+            self._abort_if_unique_id_configured()
+
+            return self.async_create_entry(
+                title=f"Eversolar PMU ({host})",
+                data={
+                    CONF_HOST: host,
+                    CONF_PORT: self._discovery_port,
+                    CONF_SCAN_INTERVAL: DEFAULT_SCAN_INTERVAL,
+                    CONF_TIMEOUT: DEFAULT_TIMEOUT,
+                },
+            )
+
+        choices = {
+            host: f"{host} ({', '.join(result.inverter_ids)})"
+            for host, result in sorted(
+                self._discovered.items(), key=lambda item: ipaddress.ip_address(item[0])
+            )
+        }
+        schema = vol.Schema({vol.Required(CONF_HOST): vol.In(choices)})
+
+        return self.async_show_form(step_id="pick", data_schema=schema)
+
+    async def async_step_manual(
+        self, user_input: Optional[Dict[str, Any]] = None
+    ) -> FlowResult:
+        """Handle manual host entry."""
         errors: Dict[str, str] = {}
 
         if user_input is not None:
             host = user_input[CONF_HOST]
 
-            # Validate connection
+            # Validate connection, waiting for any operation already using this PMU
+            port = user_input.get(CONF_PORT, DEFAULT_PORT)
+            queue = async_get_request_queue(self.hass, host, port)
             try:
-                is_reachable = await self.hass.async_add_executor_job(
+                is_reachable = await queue.async_run(
+                    self.hass.async_add_executor_job,
                     EversolarPMU.test_connection,
                     host,
-                    user_input.get(CONF_PORT, DEFAULT_PORT),
+                    port,
                     user_input.get(CONF_TIMEOUT, DEFAULT_TIMEOUT),
                 )
                 if not is_reachable:
@@ -57,6 +181,8 @@ class EversolarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             except Exception as err:
                 _LOGGER.exception("Error testing connection: %s", err)
                 errors["base"] = "cannot_connect"
+            finally:
+                await async_release_request_queue(self.hass, queue)
 
             if not errors:
                 # Create unique ID based on host
@@ -82,7 +208,7 @@ class EversolarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=schema,
             errors=errors,
             description_placeholders={},
@@ -130,8 +256,12 @@ class EversolarOptionsFlow(config_entries.OptionsFlow):
                 ): bool,
                 vol.Optional(
                     CONF_AUTO_SYNC_DELAY,
-                    default=self.config_entry.options.get(CONF_AUTO_SYNC_DELAY, self.config_entry.data.get(CONF_AUTO_SYNC_DELAY, 1)),
-                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=60)),
+                    default=self.config_entry.options.get(CONF_AUTO_SYNC_DELAY, self.config_entry.data.get(CONF_AUTO_SYNC_DELAY, DEFAULT_AUTO_SYNC_DELAY)),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                vol.Optional(
+                    CONF_AUTO_SYNC_THRESHOLD,
+                    default=self.config_entry.options.get(CONF_AUTO_SYNC_THRESHOLD, self.config_entry.data.get(CONF_AUTO_SYNC_THRESHOLD, DEFAULT_AUTO_SYNC_THRESHOLD)),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
                 vol.Optional(
                     CONF_PV_VOLTAGE_THRESHOLD,
                     default=self.config_entry.options.get(CONF_PV_VOLTAGE_THRESHOLD, self.config_entry.data.get(CONF_PV_VOLTAGE_THRESHOLD, 50)),
@@ -140,6 +270,82 @@ class EversolarOptionsFlow(config_entries.OptionsFlow):
                     CONF_PV_VOLTAGE_STATS_CUTOFF,
                     default=self.config_entry.options.get(CONF_PV_VOLTAGE_STATS_CUTOFF, self.config_entry.data.get(CONF_PV_VOLTAGE_STATS_CUTOFF, 20)),
                 ): vol.All(vol.Coerce(int), vol.Range(min=1, max=200)),
+                vol.Optional(
+                    CONF_PERFORMANCE_LOWER_BOUND,
+                    default=self.config_entry.options.get(CONF_PERFORMANCE_LOWER_BOUND, DEFAULT_PERFORMANCE_LOWER_BOUND),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                vol.Optional(
+                    CONF_PERFORMANCE_UPPER_BOUND,
+                    default=self.config_entry.options.get(CONF_PERFORMANCE_UPPER_BOUND, DEFAULT_PERFORMANCE_UPPER_BOUND),
+                ): vol.All(vol.Coerce(int), vol.Range(min=100, max=1000)),
+                vol.Optional(
+                    CONF_GRID_VOLTAGE_LOW,
+                    default=self.config_entry.options.get(CONF_GRID_VOLTAGE_LOW, DEFAULT_GRID_VOLTAGE_LOW),
+                ): vol.All(vol.Coerce(float), vol.Range(min=100.0, max=300.0)),
+                vol.Optional(
+                    CONF_GRID_VOLTAGE_HIGH,
+                    default=self.config_entry.options.get(CONF_GRID_VOLTAGE_HIGH, DEFAULT_GRID_VOLTAGE_HIGH),
+                ): vol.All(vol.Coerce(float), vol.Range(min=100.0, max=300.0)),
+                vol.Optional(
+                    CONF_GRID_FREQUENCY_LOW,
+                    default=self.config_entry.options.get(CONF_GRID_FREQUENCY_LOW, DEFAULT_GRID_FREQUENCY_LOW),
+                ): vol.All(vol.Coerce(float), vol.Range(min=45.0, max=65.0)),
+                vol.Optional(
+                    CONF_GRID_FREQUENCY_HIGH,
+                    default=self.config_entry.options.get(CONF_GRID_FREQUENCY_HIGH, DEFAULT_GRID_FREQUENCY_HIGH),
+                ): vol.All(vol.Coerce(float), vol.Range(min=45.0, max=65.0)),
+                vol.Optional(
+                    CONF_SLOW_PUBLISH_INTERVAL,
+                    default=self.config_entry.options.get(CONF_SLOW_PUBLISH_INTERVAL, DEFAULT_SLOW_PUBLISH_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                vol.Optional(
+                    CONF_SLOW_PUBLISH_CHANGE,
+                    default=self.config_entry.options.get(CONF_SLOW_PUBLISH_CHANGE, DEFAULT_SLOW_PUBLISH_CHANGE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                vol.Optional(
+                    CONF_SLOW_PUBLISH_SENSORS,
+                    default=self.config_entry.options.get(CONF_SLOW_PUBLISH_SENSORS, DEFAULT_SLOW_PUBLISH_SENSORS),
+                ): cv.multi_select(PUBLISH_SENSORS),
+                vol.Optional(
+                    CONF_STATISTICS_IMPORT,
+                    default=self.config_entry.options.get(CONF_STATISTICS_IMPORT, False),
+                ): bool,
+                vol.Optional(
+                    CONF_STATISTICS_BATCH_HOURS,
+                    default=self.config_entry.options.get(CONF_STATISTICS_BATCH_HOURS, DEFAULT_STATISTICS_BATCH_HOURS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=24)),
+                vol.Optional(
+                    CONF_STATISTICS_SUPPRESS_STATES,
+                    default=self.config_entry.options.get(CONF_STATISTICS_SUPPRESS_STATES, False),
+                ): bool,
+                vol.Optional(
+                    CONF_SAMPLE_STORE,
+                    default=self.config_entry.options.get(CONF_SAMPLE_STORE, False),
+                ): bool,
+                vol.Optional(
+                    CONF_SAMPLE_STORE_MAX_MB,
+                    default=self.config_entry.options.get(CONF_SAMPLE_STORE_MAX_MB, DEFAULT_SAMPLE_STORE_MAX_MB),
+                ): vol.All(vol.Coerce(int), vol.Range(min=8, max=4096)),
+                vol.Optional(
+                    CONF_ARCHIVE,
+                    default=self.config_entry.options.get(CONF_ARCHIVE, False),
+                ): bool,
+                vol.Optional(
+                    CONF_EXPORT_URL,
+                    default=self.config_entry.options.get(CONF_EXPORT_URL, ""),
+                ): str,
+                vol.Optional(
+                    CONF_EXPORT_TOKEN,
+                    default=self.config_entry.options.get(CONF_EXPORT_TOKEN, ""),
+                ): str,
+                vol.Optional(
+                    CONF_EXPORT_BATCH_SIZE,
+                    default=self.config_entry.options.get(CONF_EXPORT_BATCH_SIZE, DEFAULT_EXPORT_BATCH_SIZE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=5000)),
+                vol.Optional(
+                    CONF_EXPORT_FLUSH_INTERVAL,
+                    default=self.config_entry.options.get(CONF_EXPORT_FLUSH_INTERVAL, DEFAULT_EXPORT_FLUSH_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
             }
         )
 
@@ -6,22 +6,63 @@
 
 DOMAIN = "eversolar_pmu"
 
+# hass.data key for the per-PMU request queues, keyed by (host, port)
+DATA_REQUEST_QUEUES = f"{DOMAIN}_request_queues"
+
 # Config keys
 CONF_HOST = "host"
 CONF_PORT = "port"
+CONF_NETWORK = "network"
 CONF_SCAN_INTERVAL = "scan_interval"
 CONF_TIMEOUT = "timeout"
 CONF_TIMEZONE = "timezone"
 CONF_AUTO_SYNC_ENABLED = "auto_sync_enabled"
 CONF_AUTO_SYNC_DELAY = "auto_sync_delay"
+CONF_AUTO_SYNC_THRESHOLD = "auto_sync_threshold"
 CONF_PV_VOLTAGE_THRESHOLD = "pv_voltage_threshold"
 CONF_PV_VOLTAGE_STATS_CUTOFF = "pv_voltage_stats_cutoff"
+CONF_STATISTICS_IMPORT = "statistics_import"
+CONF_STATISTICS_BATCH_HOURS = "statistics_batch_hours"
+CONF_STATISTICS_SUPPRESS_STATES = "statistics_suppress_states"
+CONF_EXPORT_URL = "export_url"
+CONF_EXPORT_TOKEN = "export_token"
+CONF_EXPORT_BATCH_SIZE = "export_batch_size"
+CONF_EXPORT_FLUSH_INTERVAL = "export_flush_interval"
+CONF_SAMPLE_STORE = "sample_store"
+CONF_SAMPLE_STORE_MAX_MB = "sample_store_max_mb"
+CONF_ARCHIVE = "archive"
+CONF_PERFORMANCE_LOWER_BOUND = "performance_lower_bound"
+CONF_PERFORMANCE_UPPER_BOUND = "performance_upper_bound"
+CONF_GRID_VOLTAGE_LOW = "grid_voltage_low"
+CONF_GRID_VOLTAGE_HIGH = "grid_voltage_high"
+CONF_GRID_FREQUENCY_LOW = "grid_frequency_low"
+CONF_GRID_FREQUENCY_HIGH = "grid_frequency_high"
+CONF_SLOW_PUBLISH_INTERVAL = "slow_publish_interval"
+CONF_SLOW_PUBLISH_CHANGE = "slow_publish_change"
+CONF_SLOW_PUBLISH_SENSORS = "slow_publish_sensors"
 
 # Defaults
 DEFAULT_PORT = 8080
 DEFAULT_SCAN_INTERVAL = 60
 DEFAULT_TIMEOUT = 5.0
 DEFAULT_TIMEZONE = "Australia/Brisbane"
+DEFAULT_AUTO_SYNC_DELAY = 1
+DEFAULT_AUTO_SYNC_THRESHOLD = 10
+DEFAULT_STATISTICS_BATCH_HOURS = 1
+DEFAULT_EXPORT_BATCH_SIZE = 500
+DEFAULT_EXPORT_FLUSH_INTERVAL = 10
+DEFAULT_SAMPLE_STORE_MAX_MB = 64
+# Span of one archive block; a crash loses at most the unwritten block
+ARCHIVE_BLOCK_SECONDS = 3600
+DEFAULT_PERFORMANCE_LOWER_BOUND = 80
+DEFAULT_PERFORMANCE_UPPER_BOUND = 120
+# Nominal 230 V +10%/-6% and the 49.85-50.15 Hz normal operating band
+DEFAULT_GRID_VOLTAGE_LOW = 216.0
+DEFAULT_GRID_VOLTAGE_HIGH = 253.0
+DEFAULT_GRID_FREQUENCY_LOW = 49.85
+DEFAULT_GRID_FREQUENCY_HIGH = 50.15
+DEFAULT_SLOW_PUBLISH_INTERVAL = 0
+DEFAULT_SLOW_PUBLISH_CHANGE = 5
 
 # Sensor types
 SENSOR_POWER = "power"
@@ -33,6 +74,74 @@ SENSOR_HOURS_TOTAL = "hours_total"
 SENSOR_PV_VOLTAGE = "pv_voltage"
 SENSOR_PV_CURRENT = "pv_current"
 SENSOR_PV_POWER = "pv_power"
+SENSOR_CLOCK_OFFSET = "clock_offset"
+SENSOR_ENERGY_MONTH = "energy_month"
+SENSOR_ENERGY_YEAR = "energy_year"
+SENSOR_PEAK_POWER_TODAY = "peak_power_today"
+SENSOR_RUN_HOURS_TODAY = "run_hours_today"
+SENSOR_PERFORMANCE_RATIO = "performance_ratio"
+SENSOR_VOLTAGE_P1_TODAY = "voltage_p1_today"
+SENSOR_VOLTAGE_P50_TODAY = "voltage_p50_today"
+SENSOR_VOLTAGE_P99_TODAY = "voltage_p99_today"
+SENSOR_VOLTAGE_OUTSIDE_TODAY = "voltage_outside_limits_today"
+SENSOR_FREQUENCY_P1_TODAY = "frequency_p1_today"
+SENSOR_FREQUENCY_P50_TODAY = "frequency_p50_today"
+SENSOR_FREQUENCY_P99_TODAY = "frequency_p99_today"
+SENSOR_FREQUENCY_OUTSIDE_TODAY = "frequency_outside_limits_today"
+SENSOR_OPERATION_MODE = "operation_mode"
+SENSOR_ERROR_MESSAGES = "error_messages"
+SENSOR_DAILY_EFFICIENCY = "daily_efficiency"
+# Publish class shared by all per-register sensors
+SENSOR_REGISTERS = "registers"
+
+# Sensors and sensor classes that can be moved to the slow publish tier
+PUBLISH_SENSORS = {
+    SENSOR_POWER: "Power",
+    SENSOR_VOLTAGE: "AC Voltage",
+    SENSOR_FREQUENCY: "AC Frequency",
+    SENSOR_ENERGY_TODAY: "Energy Today",
+    SENSOR_ENERGY_TOTAL: "Total Energy",
+    SENSOR_HOURS_TOTAL: "Total Operation Hours",
+    SENSOR_PV_VOLTAGE: "PV Voltage",
+    SENSOR_PV_CURRENT: "PV Current",
+    SENSOR_PV_POWER: "PV Power",
+    SENSOR_CLOCK_OFFSET: "PMU Clock Offset",
+    SENSOR_OPERATION_MODE: "Operation Mode",
+    SENSOR_ERROR_MESSAGES: "Error Messages",
+    SENSOR_DAILY_EFFICIENCY: "Daily Efficiency",
+    SENSOR_ENERGY_MONTH: "Energy This Month",
+    SENSOR_ENERGY_YEAR: "Energy This Year",
+    SENSOR_PEAK_POWER_TODAY: "Peak Power Today",
+    SENSOR_RUN_HOURS_TODAY: "Run Hours Today",
+    SENSOR_PERFORMANCE_RATIO: "Performance Ratio",
+    SENSOR_VOLTAGE_P1_TODAY: "AC Voltage P1 Today",
+    SENSOR_VOLTAGE_P50_TODAY: "AC Voltage Median Today",
+    SENSOR_VOLTAGE_P99_TODAY: "AC Voltage P99 Today",
+    SENSOR_VOLTAGE_OUTSIDE_TODAY: "AC Voltage Outside Limits Today",
+    SENSOR_FREQUENCY_P1_TODAY: "AC Frequency P1 Today",
+    SENSOR_FREQUENCY_P50_TODAY: "AC Frequency Median Today",
+    SENSOR_FREQUENCY_P99_TODAY: "AC Frequency P99 Today",
+    SENSOR_FREQUENCY_OUTSIDE_TODAY: "AC Frequency Outside Limits Today",
+    SENSOR_REGISTERS: "Register sensors",
+}
+DEFAULT_SLOW_PUBLISH_SENSORS = [
+    SENSOR_ENERGY_TOTAL,
+    SENSOR_HOURS_TOTAL,
+    SENSOR_CLOCK_OFFSET,
+    SENSOR_OPERATION_MODE,
+    SENSOR_DAILY_EFFICIENCY,
+    SENSOR_ENERGY_MONTH,
+    SENSOR_ENERGY_YEAR,
+    SENSOR_RUN_HOURS_TODAY,
+    SENSOR_VOLTAGE_P1_TODAY,
+    SENSOR_VOLTAGE_P50_TODAY,
+    SENSOR_VOLTAGE_P99_TODAY,
+    SENSOR_VOLTAGE_OUTSIDE_TODAY,
+    SENSOR_FREQUENCY_P1_TODAY,
+    SENSOR_FREQUENCY_P50_TODAY,
+    SENSOR_FREQUENCY_P99_TODAY,
+    SENSOR_FREQUENCY_OUTSIDE_TODAY,
+]
 
 # Sensor data keys (map to JSON response keys)
 SENSOR_DATA_KEYS = {
@@ -47,6 +156,49 @@ SENSOR_DATA_KEYS = {
     SENSOR_PV_POWER: "pv_w_est",
 }
 
+# Data codes reported in the 0x12 code list and decoded from 0x14 responses.
+# code -> (key, name, scale, unit, device class, enabled by default)
+# Codes already covered by the core sensors above are registered but disabled
+# by default; discovered codes missing from this table get a raw, disabled entity.
+CODE_REGISTRY = {
+    0x00: ("temperature", "Temperature", 0.1, "°C", "temperature", True),
+    0x01: ("pv1_voltage", "PV1 Voltage", 0.1, "V", "voltage", True),
+    0x02: ("pv2_voltage", "PV2 Voltage", 0.1, "V", "voltage", True),
+    0x04: ("pv1_current", "PV1 Current", 0.1, "A", "current", True),
+    0x05: ("pv2_current", "PV2 Current", 0.1, "A", "current", True),
+    0x0D: ("energy_today", "Energy Today Register", 0.01, "kWh", "energy", False),
+    0x40: ("pv_voltage", "PV Voltage Register", 0.1, "V", "voltage", False),
+    0x41: ("pv_current", "PV Current Register", 0.1, "A", "current", False),
+    0x42: ("ac_voltage", "AC Voltage Register", 0.1, "V", "voltage", False),
+    0x43: ("ac_frequency", "AC Frequency Register", 0.01, "Hz", "frequency", False),
+    0x44: ("ac_power", "AC Power Register", 1, "W", "power", False),
+    0x46: ("pv_current_alt", "PV Current Register (0x46)", 0.1, "A", "current", False),
+    0x47: ("energy_total_low", "Total Energy Low Word", None, None, None, False),
+    0x48: ("energy_total_high", "Total Energy High Word", None, None, None, False),
+    0x49: ("hours_total_low", "Total Hours Low Word", None, None, None, False),
+    0x4A: ("hours_total_high", "Total Hours High Word", None, None, None, False),
+    0x4C: ("mode", "Operation Mode Register", None, None, None, False),
+    0x4D: ("error_low", "Error Flags Low Word", None, None, None, False),
+    0x4E: ("error_high", "Error Flags High Word", None, None, None, False),
+}
+
+# Bus events, fired on edges only
+EVENT_MODE_CHANGED = f"{DOMAIN}_mode_changed"
+EVENT_ERROR_SET = f"{DOMAIN}_error_set"
+EVENT_ERROR_CLEARED = f"{DOMAIN}_error_cleared"
+EVENT_DC_CHANGED = f"{DOMAIN}_dc_changed"
+EVENT_TIME_SYNC = f"{DOMAIN}_time_sync"
+EVENT_REACHABILITY_CHANGED = f"{DOMAIN}_reachability_changed"
+EVENT_PERFORMANCE_DEVIATION = f"{DOMAIN}_performance_deviation"
+
+# Operation mode names (0x4C)
+MODE_NAMES = {
+    0x0000: "Wait",
+    0x0001: "Normal",
+    0x0002: "Fault",
+    0x0003: "Permanent Fault",
+}
+
 # Attributes for diagnostic sensor
 ATTR_INVERTER_ID = "inverter_id"
 ATTR_MODE = "mode"
@@ -54,6 +206,23 @@ ATTR_PMU_TIME_UTC = "pmu_time_utc"
 ATTR_PMU_EPOCH = "pmu_epoch"
 ATTR_PMU_EPOCH_STEP = "pmu_epoch_step"
 ATTR_PMU_TIME_STUCK = "pmu_time_stuck"
+ATTR_PMU_DRIFT_PPM = "pmu_drift_ppm"
+ATTR_PMU_CLOCK_ERROR = "pmu_clock_error"
+ATTR_PEAK_TIME = "peak_time"
+ATTR_EXPECTED_PV_POWER = "expected_pv_power_w"
+ATTR_LOWER_LIMIT = "lower_limit"
+ATTR_UPPER_LIMIT = "upper_limit"
+ATTR_SAMPLES = "samples"
+
+# Persistent storage (helpers.storage) versions and key prefixes
+ROLLUPS_STORAGE_VERSION = 1
+ROLLUPS_STORAGE_KEY = f"{DOMAIN}.rollups"
+PERFORMANCE_STORAGE_VERSION = 1
+PERFORMANCE_STORAGE_KEY = f"{DOMAIN}.performance"
+GRID_QUALITY_STORAGE_VERSION = 1
+GRID_QUALITY_STORAGE_KEY = f"{DOMAIN}.grid_quality"
+STATISTICS_STORAGE_VERSION = 1
+STATISTICS_STORAGE_KEY = f"{DOMAIN}.statistics"
 
 # Error Message Bit Flags (Table 3-7)
 ERROR_MESSAGES = {
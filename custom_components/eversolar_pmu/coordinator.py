@@ -3,57 +3,261 @@
 # https://github.com/aburow/eversolar-pmu-ha
 
 """Data update coordinator for Eversolar PMU."""
+import asyncio
 import logging
-from datetime import date, datetime, timedelta, timezone
+import time
+from datetime import datetime, timedelta, timezone
+from functools import partial
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    ARCHIVE_BLOCK_SECONDS,
+    CONF_ARCHIVE,
     CONF_AUTO_SYNC_DELAY,
     CONF_AUTO_SYNC_ENABLED,
+    CONF_AUTO_SYNC_THRESHOLD,
+    CONF_EXPORT_BATCH_SIZE,
+    CONF_EXPORT_FLUSH_INTERVAL,
+    CONF_EXPORT_TOKEN,
+    CONF_EXPORT_URL,
+    CONF_GRID_FREQUENCY_HIGH,
+    CONF_GRID_FREQUENCY_LOW,
+    CONF_GRID_VOLTAGE_HIGH,
+    CONF_GRID_VOLTAGE_LOW,
     CONF_HOST,
     CONF_PORT,
+    CONF_PERFORMANCE_LOWER_BOUND,
+    CONF_PERFORMANCE_UPPER_BOUND,
     CONF_PV_VOLTAGE_STATS_CUTOFF,
     CONF_PV_VOLTAGE_THRESHOLD,
+    CONF_SAMPLE_STORE,
+    CONF_SAMPLE_STORE_MAX_MB,
     CONF_SCAN_INTERVAL,
+    CONF_SLOW_PUBLISH_CHANGE,
+    CONF_SLOW_PUBLISH_INTERVAL,
+    CONF_SLOW_PUBLISH_SENSORS,
+    CONF_STATISTICS_BATCH_HOURS,
+    CONF_STATISTICS_IMPORT,
+    CONF_STATISTICS_SUPPRESS_STATES,
     CONF_TIMEOUT,
+    DEFAULT_AUTO_SYNC_DELAY,
+    DEFAULT_AUTO_SYNC_THRESHOLD,
+    DEFAULT_EXPORT_BATCH_SIZE,
+    DEFAULT_EXPORT_FLUSH_INTERVAL,
+    DEFAULT_GRID_FREQUENCY_HIGH,
+    DEFAULT_GRID_FREQUENCY_LOW,
+    DEFAULT_GRID_VOLTAGE_HIGH,
+    DEFAULT_GRID_VOLTAGE_LOW,
+    DEFAULT_PERFORMANCE_LOWER_BOUND,
+    DEFAULT_PERFORMANCE_UPPER_BOUND,
+    DEFAULT_SAMPLE_STORE_MAX_MB,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SLOW_PUBLISH_CHANGE,
+    DEFAULT_SLOW_PUBLISH_INTERVAL,
+    DEFAULT_SLOW_PUBLISH_SENSORS,
+    DEFAULT_STATISTICS_BATCH_HOURS,
     DEFAULT_TIMEOUT,
     DOMAIN,
+    ERROR_MESSAGES,
+    EVENT_DC_CHANGED,
+    EVENT_ERROR_CLEARED,
+    EVENT_ERROR_SET,
+    EVENT_MODE_CHANGED,
+    EVENT_PERFORMANCE_DEVIATION,
+    EVENT_REACHABILITY_CHANGED,
+    EVENT_TIME_SYNC,
+    GRID_QUALITY_STORAGE_KEY,
+    GRID_QUALITY_STORAGE_VERSION,
+    MODE_NAMES,
+    PERFORMANCE_STORAGE_KEY,
+    PERFORMANCE_STORAGE_VERSION,
+    ROLLUPS_STORAGE_KEY,
+    ROLLUPS_STORAGE_VERSION,
+    STATISTICS_STORAGE_KEY,
+    STATISTICS_STORAGE_VERSION,
 )
-from .eversolar_protocol import EversolarPMU
+from .archive import ArchiveWriter
+from .clock_drift import ClockDriftEstimator
+from .eversolar_protocol import CODE_NAMES, EversolarPMU, PollResult
+from .exporter import LineProtocolExporter
+from .external_statistics import EversolarStatisticsAggregator, async_import_statistics
+from .grid_quality import METRIC_FREQUENCY, METRIC_VOLTAGE, GridQuality
+from .live import LiveFeed, live_message
+from .performance import PerformanceBaseline
+from .profiler import PollProfiler
+from .request_queue import PMURequestQueue, async_get_request_queue
+from .rollups import ProductionRollups
+from .sample_store import SampleStore
 
 _LOGGER = logging.getLogger(__name__)
 
+# Scalar poll values written by the line-protocol exporter
+EXPORT_FIELDS = (
+    "power_w", "vac_v", "fac_hz", "e_today_kwh", "e_total_kwh", "h_total_hours",
+    "mode", "pv_v", "pv_a", "pv_w_est", "error_flags", "time_delta", "pmu_epoch",
+)
+
+# Extra time allowed past the PMU's own I/O budget before a blocking
+# operation is aborted from the event loop
+PMU_ABORT_GRACE = 1.0
+
+# Minimum time between automatic time sync attempts
+AUTO_SYNC_MIN_INTERVAL = 900.0
+
+# Extra time a profiling run may wait beyond N scheduled polls
+PROFILE_WAIT_MARGIN = 30.0
+
+# Options whose change rebuilds the statistics, storage or export pipelines,
+# or the sensors' state classes, and so reloads the entry
+RELOAD_OPTIONS = (
+    CONF_STATISTICS_IMPORT,
+    CONF_STATISTICS_SUPPRESS_STATES,
+    CONF_SAMPLE_STORE,
+    CONF_SAMPLE_STORE_MAX_MB,
+    CONF_ARCHIVE,
+    CONF_EXPORT_URL,
+    CONF_EXPORT_TOKEN,
+    CONF_EXPORT_BATCH_SIZE,
+    CONF_EXPORT_FLUSH_INTERVAL,
+)
+
+# Delay before rollup and baseline changes are written to storage
+STORAGE_SAVE_DELAY = 300
+
 
 class EversolarDataUpdateCoordinator(DataUpdateCoordinator):
     """Coordinate Eversolar PMU data updates."""
 
     def __init__(self, hass: HomeAssistant, entry) -> None:
         """Initialize coordinator."""
+        self.config_entry = entry
         self.pmu = EversolarPMU(
             host=entry.data[CONF_HOST],
             port=entry.data.get(CONF_PORT, 8080),
-            timeout=entry.data.get(CONF_TIMEOUT, DEFAULT_TIMEOUT),
+            timeout=self._get_config(CONF_TIMEOUT, DEFAULT_TIMEOUT),
         )
-        self.config_entry = entry
         self.inverter_id = None
 
+        # Every connection to this PMU goes through its shared request queue
+        self._queue = async_get_request_queue(hass, self.pmu.host, self.pmu.port)
+        self._refresh_scheduled = False
+
         # State tracking variables
         self._last_mode: int | None = None
-        self._synced_today: bool = False
-        self._last_sync_date: date | None = None
         self._is_fully_down: bool = False
         self._ac_online_time: datetime | None = None
         self._ac_offline_time: datetime | None = None
-        self._was_connected: bool = False
         self._time_sync_success: bool = False
 
+        # PMU clock drift tracking and on-demand time sync
+        self._clock = ClockDriftEstimator()
+        self._unsub_auto_sync: CALLBACK_TYPE | None = None
+        self._last_auto_sync: float | None = None
+
+        # Last observed states for edge-triggered events (None until first seen)
+        self._last_error_flags: int | None = None
+        self._last_dc_online: bool | None = None
+        self._reachable: bool | None = None
+
+        # Direct long-term statistics import (opt-in)
+        self._statistics: EversolarStatisticsAggregator | None = None
+        self._statistics_hour_closed: bool = False
+        if self._get_config(CONF_STATISTICS_IMPORT, False):
+            self._statistics = EversolarStatisticsAggregator()
+        # The hour still open at shutdown, carried over a restart
+        self._statistics_store: Store = Store(
+            hass, STATISTICS_STORAGE_VERSION, f"{STATISTICS_STORAGE_KEY}.{entry.entry_id}"
+        )
+
+        # Poll timings and health counters
+        self.last_poll_duration: float | None = None
+        self.polls_total: int = 0
+        self.poll_failures_total: int = 0
+        self.consecutive_failures: int = 0
+        self.last_success_time: datetime | None = None
+
+        # Daily, monthly and yearly production rollups
+        self.rollups = ProductionRollups()
+        self._rollups_store: Store = Store(
+            hass, ROLLUPS_STORAGE_VERSION, f"{ROLLUPS_STORAGE_KEY}.{entry.entry_id}"
+        )
+
+        # Time-of-day performance baseline and deviation tracking
+        self.performance = PerformanceBaseline()
+        self._performance_store: Store = Store(
+            hass, PERFORMANCE_STORAGE_VERSION, f"{PERFORMANCE_STORAGE_KEY}.{entry.entry_id}"
+        )
+        self._deviating: set = set()
+        self._pending_saves: set = set()
+
+        # Streaming AC voltage and frequency distributions per local day
+        self.grid_quality = GridQuality(self._grid_limits())
+        self._grid_quality_store: Store = Store(
+            hass, GRID_QUALITY_STORAGE_VERSION, f"{GRID_QUALITY_STORAGE_KEY}.{entry.entry_id}"
+        )
+
+        # Memory-mapped raw sample history (opt-in)
+        self._samples: SampleStore | None = None
+        if self._get_config(CONF_SAMPLE_STORE, False):
+            self._samples = SampleStore(
+                hass.config.path(DOMAIN, "samples", entry.entry_id),
+                max_bytes=self._get_config(CONF_SAMPLE_STORE_MAX_MB, DEFAULT_SAMPLE_STORE_MAX_MB) * 1024 * 1024,
+            )
+
+        # Compressed long-term register archive, one block per hour (opt-in)
+        self._archive: ArchiveWriter | None = None
+        self._archive_block = None
+        if self._get_config(CONF_ARCHIVE, False):
+            self._archive = ArchiveWriter(hass.config.path(DOMAIN, "archive", f"{entry.entry_id}.evarc"))
+
+        # Minimum publish interval of slow-tier sensors (0 = every poll)
+        self._load_publish_options()
+
+        # Live values for websocket subscribers, polled faster than the scan
+        # interval only while a subscriber asks for it
+        self.live = LiveFeed()
+        self._live_task: asyncio.Task | None = None
+
+        # On-demand profiling of the next N polls
+        self._profiler: PollProfiler | None = None
+        self._profile_done: asyncio.Future | None = None
+
+        # Line-protocol exporter (enabled when an export URL is configured)
+        self._exporter: LineProtocolExporter | None = None
+        self._exporter_flushing: bool = False
+        self._unsub_exporter_tick = None
+        export_url = self._get_config(CONF_EXPORT_URL)
+        if export_url:
+            flush_interval = self._get_config(CONF_EXPORT_FLUSH_INTERVAL, DEFAULT_EXPORT_FLUSH_INTERVAL)
+            try:
+                self._exporter = LineProtocolExporter(
+                    export_url,
+                    token=self._get_config(CONF_EXPORT_TOKEN) or None,
+                    batch_size=self._get_config(CONF_EXPORT_BATCH_SIZE, DEFAULT_EXPORT_BATCH_SIZE),
+                    flush_interval=flush_interval,
+                    spool_dir=hass.config.path(DOMAIN, "spool", entry.entry_id),
+                    timeout=self.pmu.timeout,
+                )
+            except ValueError as err:
+                _LOGGER.error("Invalid export URL %s: %s", export_url, err)
+            else:
+                self._unsub_exporter_tick = async_track_time_interval(
+                    hass, self._async_exporter_tick, timedelta(seconds=flush_interval)
+                )
+
         update_interval = timedelta(
-            seconds=entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+            seconds=self._get_config(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
         )
 
+        # Settings that can only take effect by reloading the entry
+        self._reload_settings = self._reload_snapshot()
+
         super().__init__(
             hass,
             _LOGGER,
@@ -63,15 +267,96 @@ class EversolarDataUpdateCoordinator(DataUpdateCoordinator):
 
     def _get_config(self, key: str, default=None):
         """Get config value from options first, then data, then default."""
-        return self.config_entry.options.get(key) or self.config_entry.data.get(key, default)
+        if key in self.config_entry.options:
+            return self.config_entry.options[key]
+        return self.config_entry.data.get(key, default)
+
+    def _load_publish_options(self) -> None:
+        """Read the slow publish tier options."""
+        self._slow_publish_interval = (
+            self._get_config(CONF_SLOW_PUBLISH_INTERVAL, DEFAULT_SLOW_PUBLISH_INTERVAL) * 60
+        )
+        self._slow_publish_change = (
+            self._get_config(CONF_SLOW_PUBLISH_CHANGE, DEFAULT_SLOW_PUBLISH_CHANGE) / 100
+        )
+        self._slow_publish_sensors = frozenset(
+            self._get_config(CONF_SLOW_PUBLISH_SENSORS, DEFAULT_SLOW_PUBLISH_SENSORS)
+        )
+
+    def _grid_limits(self) -> dict:
+        """Return the configured grid quality limits: metric -> (low, high)."""
+        return {
+            METRIC_VOLTAGE: (
+                self._get_config(CONF_GRID_VOLTAGE_LOW, DEFAULT_GRID_VOLTAGE_LOW),
+                self._get_config(CONF_GRID_VOLTAGE_HIGH, DEFAULT_GRID_VOLTAGE_HIGH),
+            ),
+            METRIC_FREQUENCY: (
+                self._get_config(CONF_GRID_FREQUENCY_LOW, DEFAULT_GRID_FREQUENCY_LOW),
+                self._get_config(CONF_GRID_FREQUENCY_HIGH, DEFAULT_GRID_FREQUENCY_HIGH),
+            ),
+        }
+
+    def _reload_snapshot(self) -> tuple:
+        """Return the current values of the settings that need a reload."""
+        return (
+            self.config_entry.data[CONF_HOST],
+            self.config_entry.data.get(CONF_PORT, 8080),
+            *(self._get_config(key) for key in RELOAD_OPTIONS),
+        )
+
+    @callback
+    def async_apply_options(self) -> bool:
+        """Apply changed options to the running coordinator.
+
+        Thresholds, cutoffs and sync settings are read when used; the scan
+        interval, timeout and publish tier are updated here. Returns False
+        without applying anything if a setting changed that needs a reload.
+        """
+        if self._reload_snapshot() != self._reload_settings:
+            return False
+
+        self.pmu.timeout = self._get_config(CONF_TIMEOUT, DEFAULT_TIMEOUT)
+        self._load_publish_options()
+        self.grid_quality.limits = self._grid_limits()
+
+        if not self._get_config(CONF_AUTO_SYNC_ENABLED, False) and self._unsub_auto_sync is not None:
+            self._unsub_auto_sync()
+            self._unsub_auto_sync = None
+
+        update_interval = timedelta(
+            seconds=self._get_config(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        )
+        if update_interval != self.update_interval:
+            self.update_interval = update_interval
+            if self._listeners:
+                # Move the pending poll to the new interval
+                self._schedule_refresh()
+            self._async_update_live_task()
+
+        # Re-evaluate availability against the new thresholds without polling
+        self.async_update_listeners()
+        return True
+
+    def publish_settings(self, sensor_key: str) -> tuple | None:
+        """Return (minimum interval in s, significant change fraction) for a slow-tier sensor.
+
+        Returns None for sensors that publish on every poll.
+        """
+        if not self._slow_publish_interval or sensor_key not in self._slow_publish_sensors:
+            return None
+        return self._slow_publish_interval, self._slow_publish_change
 
     @property
     def is_fully_down(self) -> bool:
         """Check if inverter is fully down (Wait mode + low PV voltage)."""
-        if not self.data:
+        return self._compute_fully_down(self.data)
+
+    def _compute_fully_down(self, data) -> bool:
+        """Return True if a poll result shows Wait mode with low PV voltage."""
+        if not data:
             return False
-        mode = self.data.get("mode")
-        pv_voltage = self.data.get("pv_v", 0) or 0
+        mode = data.get("mode")
+        pv_voltage = data.get("pv_v", 0) or 0
         threshold = self._get_config(CONF_PV_VOLTAGE_THRESHOLD, 50)
         return mode == 0x0000 and pv_voltage < threshold
 
@@ -84,94 +369,546 @@ class EversolarDataUpdateCoordinator(DataUpdateCoordinator):
         stats_cutoff = self._get_config(CONF_PV_VOLTAGE_STATS_CUTOFF, 20)
         return pv_voltage < stats_cutoff
 
+    @property
+    def request_queue(self) -> PMURequestQueue:
+        """Return the request queue shared by everything talking to this PMU."""
+        return self._queue
+
+    @property
+    def performance_deviations(self) -> list:
+        """Return the metrics currently outside the performance bounds."""
+        return sorted(self._deviating)
+
     @property
     def time_sync_success(self) -> bool:
         """Return True if time sync was successful."""
         return self._time_sync_success
 
-    async def _async_update_data(self) -> dict:
-        """Fetch data from PMU."""
+    @property
+    def statistics_import_enabled(self) -> bool:
+        """Return True if the coordinator imports long-term statistics itself."""
+        return self._statistics is not None
+
+    @property
+    def suppress_state_writes(self) -> bool:
+        """Return True if high-rate sensor states should be suppressed."""
+        return self._statistics is not None and bool(
+            self._get_config(CONF_STATISTICS_SUPPRESS_STATES, False)
+        )
+
+    @property
+    def sample_store(self) -> SampleStore | None:
+        """Return the raw sample store, or None when it is disabled."""
+        return self._samples
+
+    @property
+    def statistics_hour_closed(self) -> bool:
+        """Return True if the last poll closed an hourly statistics bucket."""
+        return self._statistics_hour_closed
+
+    @property
+    def discovered_codes(self) -> tuple:
+        """Return the code list reported by the PMU."""
+        if self.pmu.discovery is None:
+            return ()
+        return self.pmu.discovery.codes
+
+    async def _async_run_pmu(self, func, *args):
+        """Run a blocking PMU operation with a hard upper bound on its duration.
+
+        If the operation overruns or the caller is cancelled, the PMU socket is
+        shut down so the executor thread is released immediately.
+        """
+        profiler = self._profiler
+        if profiler is not None and profiler.active:
+            args = (func, *args)
+            func = profiler.run_profiled
+            profiler.pause()
+        try:
+            async with asyncio.timeout(self.pmu.timeout + PMU_ABORT_GRACE):
+                return await self.hass.async_add_executor_job(func, *args)
+        except (asyncio.CancelledError, TimeoutError):
+            self.pmu.abort()
+            raise
+        finally:
+            if profiler is not None:
+                profiler.resume()
+
+    async def async_load_storage(self) -> None:
+        """Restore rollups, performance baselines, grid quality and the open statistics hour."""
+        data = await self._rollups_store.async_load()
+        if data:
+            self.rollups.load_storage(data)
+        data = await self._performance_store.async_load()
+        if data:
+            self.performance.load_storage(data)
+        data = await self._grid_quality_store.async_load()
+        if data:
+            self.grid_quality.load_storage(data)
+        if self._statistics is not None:
+            data = await self._statistics_store.async_load()
+            if data:
+                self._statistics.load_storage(data)
+                # A crash before the next shutdown must not restore the hour again
+                await self._statistics_store.async_remove()
+
+    @callback
+    def _async_delay_save(self, store: Store, data_func) -> None:
+        """Schedule a delayed store write unless one is already pending.
+
+        Store.async_delay_save restarts its timer on every call, which would
+        postpone the write indefinitely when called every poll.
+        """
+        if store in self._pending_saves:
+            return
+        self._pending_saves.add(store)
+
+        def _data() -> dict:
+            self._pending_saves.discard(store)
+            return data_func()
+
+        store.async_delay_save(_data, STORAGE_SAVE_DELAY)
+
+    async def _async_refresh(self, *args, **kwargs) -> None:
+        """Refresh data, profiling the refresh while a profiling run is active."""
+        self._refresh_scheduled = kwargs.get("scheduled", False)
+        profiler = self._profiler
+        if profiler is None:
+            await super()._async_refresh(*args, **kwargs)
+            return
+
+        profiler.begin()
+        try:
+            await super()._async_refresh(*args, **kwargs)
+        finally:
+            if profiler.end() and self._profile_done is not None and not self._profile_done.done():
+                self._profile_done.set_result(None)
+
+    async def async_profile(self, polls: int) -> dict:
+        """Profile the next polls and write reports to the config directory."""
+        if self._profiler is not None:
+            raise HomeAssistantError("A profiling run is already in progress")
+
+        profiler = PollProfiler(polls)
+        self._profiler = profiler
+        self._profile_done = self.hass.loop.create_future()
+        interval = self.update_interval.total_seconds() if self.update_interval else 0.0
+        wait = polls * (interval + self.pmu.timeout + PMU_ABORT_GRACE) + PROFILE_WAIT_MARGIN
+        try:
+            async with asyncio.timeout(wait):
+                await self._profile_done
+        except TimeoutError:
+            _LOGGER.warning("Profiling stopped after %d of %d polls", profiler.completed, polls)
+        finally:
+            self._profiler = None
+            self._profile_done = None
+
+        basename = "{}_profile_{}_{}".format(
+            DOMAIN,
+            (self.inverter_id or self.config_entry.entry_id).lower(),
+            dt_util.utcnow().strftime("%Y%m%dT%H%M%S"),
+        )
+        return await self.hass.async_add_executor_job(
+            profiler.write_reports, self.hass.config.config_dir, basename
+        )
+
+    async def _async_update_data(self) -> PollResult:
+        """Fetch data from PMU through its request queue."""
+        return await self._queue.async_poll(self._async_poll, scheduled=self._refresh_scheduled)
+
+    async def _async_poll(self) -> PollResult:
+        """Poll the PMU and process the result."""
+        self.polls_total += 1
+        poll_started = time.monotonic()
         try:
-            data = await self.hass.async_add_executor_job(
+            data = await self._async_run_pmu(
                 self.pmu.connect_and_poll,
                 False,  # set_time=False for normal polling
                 self.hass.config.time_zone,
             )
+            self.last_poll_duration = time.monotonic() - poll_started
+            self.consecutive_failures = 0
+            self.last_success_time = dt_util.utcnow()
 
             # Store inverter ID on first successful poll
             if self.inverter_id is None:
                 self.inverter_id = data.get("inverter_id")
                 _LOGGER.debug("Inverter ID: %s", self.inverter_id)
 
-            current_date = datetime.now().date()
-
-            # Reset daily sync flag at midnight
-            if self._last_sync_date != current_date:
-                self._synced_today = False
-                self._last_sync_date = current_date
-
-            # Sync time on first poll of the day or after connection loss
-            should_sync = False
-            if not self._synced_today:
-                should_sync = True
-                _LOGGER.info("First successful poll of the day - syncing time")
-            elif not self._was_connected:
-                should_sync = True
-                _LOGGER.info("Connection restored - syncing time")
-
-            if should_sync:
-                success = await self.async_sync_time()
-                if success:
-                    self._synced_today = True
-                    self._time_sync_success = True
-                    _LOGGER.info("Time sync completed successfully")
-                else:
-                    self._time_sync_success = False
-                    _LOGGER.warning("Time sync failed")
-
-            # Mark connection as active
-            self._was_connected = True
+            self._track_clock(data)
+
+            self._set_reachable(True)
 
             # Track AC online/offline transitions
             current_mode = data.get("mode")
-            if current_mode is not None and self._last_mode is not None:
+            if current_mode is not None and self._last_mode is not None and current_mode != self._last_mode:
+                self._fire_event(
+                    EVENT_MODE_CHANGED,
+                    old_mode=self._last_mode,
+                    old_mode_name=MODE_NAMES.get(self._last_mode, "Unknown"),
+                    new_mode=current_mode,
+                    new_mode_name=MODE_NAMES.get(current_mode, "Unknown"),
+                )
                 if self._last_mode == 0x0000 and current_mode == 0x0001:
                     # Wait → Normal: AC came online
                     self._ac_online_time = datetime.now(timezone.utc)
-                    data["ac_online_time"] = self._ac_online_time.isoformat()
-                    _LOGGER.info("AC came online at %s", self._ac_online_time.isoformat())
+                    _LOGGER.info("AC came online at %s", self._ac_online_time)
                 elif self._last_mode == 0x0001 and current_mode == 0x0000:
                     # Normal → Wait: AC went offline
                     self._ac_offline_time = datetime.now(timezone.utc)
-                    data["ac_offline_time"] = self._ac_offline_time.isoformat()
-                    _LOGGER.info("AC went offline at %s", self._ac_offline_time.isoformat())
+                    _LOGGER.info("AC went offline at %s", self._ac_offline_time)
 
-            # Add timestamps to data if available
-            if self._ac_online_time:
-                data["ac_online_time"] = self._ac_online_time.isoformat()
-            if self._ac_offline_time:
-                data["ac_offline_time"] = self._ac_offline_time.isoformat()
+            if current_mode is not None:
+                self._last_mode = current_mode
+
+            # Carry timestamps on the result; they are formatted only when read
+            data.ac_online_time = self._ac_online_time
+            data.ac_offline_time = self._ac_offline_time
+
+            self._fire_error_edges(data.get("error_flags"))
+
+            self.rollups.add_sample(
+                dt_util.now(), data.get("e_total_kwh"), data.get("power_w"), data.get("h_total_hours")
+            )
+            self._async_delay_save(self._rollups_store, self.rollups.as_storage)
+            self._track_performance(data)
+            self.grid_quality.add_sample(
+                dt_util.now(),
+                {METRIC_VOLTAGE: data.get("vac_v"), METRIC_FREQUENCY: data.get("fac_hz")},
+            )
+            self._async_delay_save(self._grid_quality_store, self.grid_quality.as_storage)
 
             # Update fully_down state tracking
-            self._is_fully_down = self.is_fully_down
+            self._is_fully_down = self._compute_fully_down(data)
+            dc_online = not self._is_fully_down
+            if self._last_dc_online is not None and dc_online != self._last_dc_online:
+                self._fire_event(EVENT_DC_CHANGED, online=dc_online, pv_voltage=data.get("pv_v"))
+            self._last_dc_online = dc_online
+
+            if self._statistics is not None:
+                self._statistics_hour_closed = self._statistics.add_sample(
+                    dt_util.utcnow(), data
+                )
+                batch_hours = self._get_config(
+                    CONF_STATISTICS_BATCH_HOURS, DEFAULT_STATISTICS_BATCH_HOURS
+                )
+                if self._statistics.completed_hours >= batch_hours:
+                    await self.async_flush_statistics()
+
+            if self._exporter is not None:
+                self._export_sample(data)
+
+            if self._samples is not None:
+                await self._async_store_sample(data)
+
+            if self._archive is not None:
+                await self._async_archive_sample(data)
+
+            if self.live.subscribers:
+                self.live.publish(time.monotonic(), time.time(), data)
 
             return data
         except Exception as err:
-            self._was_connected = False
+            self._set_reachable(False, str(err))
+            self.last_poll_duration = time.monotonic() - poll_started
+            self.poll_failures_total += 1
+            self.consecutive_failures += 1
             raise UpdateFailed(f"Error communicating with PMU: {err}") from err
 
-    async def async_sync_time(self) -> bool:
+    @callback
+    def async_subscribe_live(self, send, fields: tuple, interval: float | None) -> CALLBACK_TYPE:
+        """Send compact poll values to send(message); return an unsubscribe callback.
+
+        With an interval shorter than the scan interval, extra polls are made
+        for live subscribers only; they do not update entities.
+        """
+        remove = self.live.add(send, fields, interval)
+        if self.data is not None and self.last_success_time is not None:
+            # Start with the latest values instead of waiting for the next poll
+            send(live_message(self.last_success_time.timestamp(), self.data, fields))
+        self._async_update_live_task()
+
+        @callback
+        def _unsubscribe() -> None:
+            remove()
+            self._async_update_live_task()
+
+        return _unsubscribe
+
+    @callback
+    def _async_update_live_task(self) -> None:
+        """Start or stop live polling to match the subscribed intervals."""
+        interval = self.live.min_interval
+        needed = interval is not None and (
+            self.update_interval is None or interval < self.update_interval.total_seconds()
+        )
+        if needed and self._live_task is None:
+            self._live_task = self.hass.async_create_background_task(
+                self._async_live_loop(), f"{DOMAIN} live polling"
+            )
+        elif not needed and self._live_task is not None:
+            self._live_task.cancel()
+            self._live_task = None
+
+    async def _async_live_loop(self) -> None:
+        """Poll at the shortest subscribed interval and send results to subscribers only."""
+        while True:
+            started = time.monotonic()
+            try:
+                data = await self._queue.async_run(
+                    self._async_run_pmu,
+                    self.pmu.connect_and_poll,
+                    False,
+                    self.hass.config.time_zone,
+                )
+            except Exception as err:
+                _LOGGER.debug("Live poll of %s failed: %s", self.pmu.host, err)
+            else:
+                self.live.publish(time.monotonic(), time.time(), data)
+            interval = self.live.min_interval or 0.0
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+    def _track_clock(self, data: PollResult) -> None:
+        """Feed the drift estimator and schedule a time sync when one is due."""
+        if data.pmu_epoch is None:
+            return
+        now = time.time()
+        self._clock.add(now, data.pmu_epoch)
+        data.pmu_epoch_step = self._clock.epoch_step
+        data.pmu_time_stuck = self._clock.stuck
+        drift_ppm = self._clock.drift_ppm
+        data.pmu_drift_ppm = None if drift_ppm is None else round(drift_ppm, 1)
+        error = self._clock.error(now)
+        data.pmu_clock_error = None if error is None else round(error, 1)
+
+        if not self._get_config(CONF_AUTO_SYNC_ENABLED, False) or self._unsub_auto_sync is not None:
+            return
+        if self._last_auto_sync is not None and now - self._last_auto_sync < AUTO_SYNC_MIN_INTERVAL:
+            return
+
+        # Sync before the projected error reaches the threshold at the next poll
+        delay = self._get_config(CONF_AUTO_SYNC_DELAY, DEFAULT_AUTO_SYNC_DELAY)
+        horizon = (self.update_interval.total_seconds() if self.update_interval else 0.0) + delay
+        threshold = self._get_config(CONF_AUTO_SYNC_THRESHOLD, DEFAULT_AUTO_SYNC_THRESHOLD)
+        reason = self._clock.sync_reason(now + horizon, threshold)
+        if reason is None:
+            return
+
+        _LOGGER.info("Scheduling PMU time sync in %ss (%s, projected error %s s)", delay, reason, error)
+        self._last_auto_sync = now
+        self._unsub_auto_sync = async_call_later(
+            self.hass, delay, partial(self._async_auto_sync, reason=reason)
+        )
+
+    def _track_performance(self, data: PollResult) -> None:
+        """Update the performance baseline and fire events on deviation edges."""
+        ratios = self.performance.add_sample(
+            dt_util.now(), data.get("pv_w_est"), data.get("pv_v"), data.get("pv_a"), data.get("power_w")
+        )
+        self._async_delay_save(self._performance_store, self.performance.as_storage)
+        if ratios is None:
+            return  # Deviation state holds overnight
+
+        expected = self.performance.expected_pv_w
+        lower = self._get_config(CONF_PERFORMANCE_LOWER_BOUND, DEFAULT_PERFORMANCE_LOWER_BOUND) / 100.0
+        upper = self._get_config(CONF_PERFORMANCE_UPPER_BOUND, DEFAULT_PERFORMANCE_UPPER_BOUND) / 100.0
+        for metric, ratio in ratios.items():
+            deviating = not lower <= ratio <= upper
+            if deviating == (metric in self._deviating):
+                continue
+            if deviating:
+                self._deviating.add(metric)
+            else:
+                self._deviating.discard(metric)
+            self._fire_event(
+                EVENT_PERFORMANCE_DEVIATION,
+                metric=metric,
+                deviating=deviating,
+                ratio=round(ratio, 3),
+                expected_pv_power_w=None if expected is None else round(expected),
+                pv_power_w=data.get("pv_w_est"),
+            )
+
+    async def _async_auto_sync(self, _now: datetime, reason: str) -> None:
+        """Run a scheduled automatic time sync."""
+        self._unsub_auto_sync = None
+        if await self.async_sync_time(reason):
+            _LOGGER.info("Time sync completed successfully")
+        else:
+            _LOGGER.warning("Time sync failed")
+
+    def _fire_event(self, event_type: str, **event_data) -> None:
+        """Fire an integration event on the bus."""
+        self.hass.bus.async_fire(
+            event_type,
+            {
+                "config_entry_id": self.config_entry.entry_id,
+                "inverter_id": self.inverter_id,
+                "host": self.pmu.host,
+                **event_data,
+            },
+        )
+
+    def _set_reachable(self, reachable: bool, error: str | None = None) -> None:
+        """Track PMU reachability and fire an event when it changes."""
+        if self._reachable is not None and reachable != self._reachable:
+            self._fire_event(EVENT_REACHABILITY_CHANGED, reachable=reachable, error=error)
+        self._reachable = reachable
+
+    def _fire_error_edges(self, error_flags: int | None) -> None:
+        """Fire an event for every error bit that was set or cleared since the last poll."""
+        if error_flags is None:
+            return
+        previous = self._last_error_flags
+        self._last_error_flags = error_flags
+        if previous is None:
+            return
+        changed = previous ^ error_flags
+        bit = 0
+        while changed:
+            if changed & 1:
+                self._fire_event(
+                    EVENT_ERROR_SET if (error_flags >> bit) & 1 else EVENT_ERROR_CLEARED,
+                    bit=bit,
+                    error=ERROR_MESSAGES.get(bit, f"Bit {bit}"),
+                    error_flags=error_flags,
+                )
+            changed >>= 1
+            bit += 1
+
+    async def async_flush_statistics(self) -> None:
+        """Import any completed hourly statistics into the recorder."""
+        if self._statistics is None or not self._statistics.completed_hours:
+            return
+        object_prefix = self.inverter_id or self.config_entry.entry_id
+        try:
+            await async_import_statistics(
+                self.hass,
+                self._statistics,
+                object_prefix,
+                f"Eversolar Inverter {self.inverter_id or 'Unknown'}",
+            )
+        except Exception as err:
+            _LOGGER.error("Error importing long-term statistics: %s", err)
+
+    async def _async_store_sample(self, data: PollResult) -> None:
+        """Append the raw registers of a poll to the sample store."""
+        try:
+            await self.hass.async_add_executor_job(
+                self._samples.append, int(time.time()), data.codes, data.raw
+            )
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Error writing sample store: %s", err)
+
+    async def _async_archive_sample(self, data: PollResult) -> None:
+        """Buffer a poll for the archive, writing the previous block on the hour."""
+        now = int(time.time())
+        block = now // ARCHIVE_BLOCK_SECONDS
+        if self._archive_block is not None and block != self._archive_block:
+            self._archive.close_block()
+            await self._async_write_archive()
+        self._archive_block = block
+        self._archive.add(now, data.codes, data.raw)
+
+    async def _async_write_archive(self) -> None:
+        """Append closed archive blocks from the executor."""
+        blocks = self._archive.take_blocks()
+        try:
+            await self.hass.async_add_executor_job(self._archive.write_blocks, blocks)
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Error writing archive: %s", err)
+
+    def _export_sample(self, data: PollResult) -> None:
+        """Queue a poll result for the line-protocol exporter."""
+        fields = {key: data.get(key) for key in EXPORT_FIELDS}
+        for code, value in data.iter_registers():
+            fields[f"raw_{CODE_NAMES[code]}"] = value
+        if self.last_poll_duration is not None:
+            fields["poll_duration_ms"] = round(self.last_poll_duration * 1000.0, 1)
+
+        self._exporter.add_sample(
+            {"inverter_id": data.get("inverter_id"), "host": self.pmu.host},
+            fields,
+        )
+        if self._exporter.should_flush():
+            self._schedule_exporter_flush()
+
+    def _schedule_exporter_flush(self) -> None:
+        """Flush the exporter in the background unless a flush is running."""
+        if self._exporter_flushing:
+            return
+        self._exporter_flushing = True
+        self.hass.async_create_background_task(
+            self._async_flush_exporter(), f"{DOMAIN} exporter flush"
+        )
+
+    async def _async_flush_exporter(self) -> None:
+        """Deliver queued export lines from the executor."""
+        try:
+            await self.hass.async_add_executor_job(self._exporter.flush)
+        except Exception as err:
+            _LOGGER.warning("Error flushing exporter: %s", err)
+        finally:
+            self._exporter_flushing = False
+
+    async def _async_exporter_tick(self, _now: datetime) -> None:
+        """Time-based exporter flush trigger."""
+        if self._exporter is not None and self._exporter.should_flush():
+            self._schedule_exporter_flush()
+
+    async def async_shutdown(self) -> None:
+        """Flush pending statistics, stored state and exports, then stop the coordinator."""
+        if self._unsub_auto_sync is not None:
+            self._unsub_auto_sync()
+            self._unsub_auto_sync = None
+        self.live.clear()
+        if self._live_task is not None:
+            self._live_task.cancel()
+            self._live_task = None
+        await self.async_flush_statistics()
+        if self._statistics is not None:
+            # The open hour is finished after a restart rather than lost
+            await self._statistics_store.async_save(self._statistics.as_storage())
+        # Write stored state now so a reload does not read an older copy
+        await self._rollups_store.async_save(self.rollups.as_storage())
+        await self._performance_store.async_save(self.performance.as_storage())
+        await self._grid_quality_store.async_save(self.grid_quality.as_storage())
+        self._pending_saves.clear()
+        if self._unsub_exporter_tick is not None:
+            self._unsub_exporter_tick()
+            self._unsub_exporter_tick = None
+        if self._exporter is not None and self._exporter.pending:
+            await self._async_flush_exporter()
+        if self._samples is not None:
+            await self.hass.async_add_executor_job(self._samples.close)
+        if self._archive is not None:
+            # The rest of the hour continues in a new block after a restart
+            self._archive.close_block()
+            await self._async_write_archive()
+        await super().async_shutdown()
+
+    async def async_sync_time(self, reason: str = "manual") -> bool:
         """Sync PMU time to host time."""
         try:
             tz_name = self.hass.config.time_zone
-            await self.hass.async_add_executor_job(
+            success = await self._queue.async_run(
+                self._async_run_pmu,
                 self.pmu.sync_time,
                 tz_name,
             )
-            _LOGGER.debug("PMU time synced")
-            # Request immediate refresh to update time_delta
-            await self.async_request_refresh()
-            return True
         except Exception as err:
             _LOGGER.error("Error syncing PMU time: %s", err)
+            success = False
+
+        self._time_sync_success = success
+        self._fire_event(EVENT_TIME_SYNC, success=success, reason=reason)
+        if not success:
             return False
+
+        # The clock was stepped; the next poll becomes the new reference
+        self._clock.reset()
+
+        _LOGGER.debug("PMU time synced")
+        # Request immediate refresh to update time_delta
+        await self.async_request_refresh()
+        return True
@@ -0,0 +1,70 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Concurrent subnet discovery of Eversolar PMUs."""
+import asyncio
+import ipaddress
+import logging
+
+from .eversolar_protocol import DiscoveryResult, EversolarPMU
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 64
+# Budget of one probe; the connect may use at most CONNECT_SHARE of it
+DEFAULT_PROBE_TIMEOUT = 2.0
+MAX_SCAN_HOSTS = 1024
+
+
+async def async_probe_pmu(
+    host: str,
+    port: int,
+    probe_timeout: float = DEFAULT_PROBE_TIMEOUT,
+) -> DiscoveryResult | None:
+    """Confirm a PMU with a 0x01/0x11 exchange; return its discovery result or None.
+
+    The exchange runs in the executor through EversolarPMU, so a probe reads
+    frames exactly as a poll does.
+    """
+    pmu = EversolarPMU(host, port, probe_timeout)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(None, pmu.discover)
+    except (OSError, RuntimeError) as err:
+        _LOGGER.debug("No PMU found at %s:%s: %s", host, port, err)
+        return None
+
+
+def hosts_in_network(network: str) -> list:
+    """Return the host addresses of a CIDR range.
+
+    Raises ValueError for an invalid range or one larger than MAX_SCAN_HOSTS.
+    """
+    net = ipaddress.ip_network(network, strict=False)
+    if net.num_addresses > MAX_SCAN_HOSTS + 2:
+        raise ValueError(f"Network {net} has more than {MAX_SCAN_HOSTS} hosts")
+    hosts = [str(addr) for addr in net.hosts()]
+    return hosts or [str(net.network_address)]
+
+
+async def async_scan_network(
+    network: str,
+    port: int,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    probe_timeout: float = DEFAULT_PROBE_TIMEOUT,
+    exclude=(),
+) -> dict:
+    """Scan a CIDR range for PMUs, skipping hosts in exclude; return host -> DiscoveryResult."""
+    hosts = [host for host in hosts_in_network(network) if host not in exclude]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _probe(host: str) -> tuple:
+        async with semaphore:
+            return host, await async_probe_pmu(host, port, probe_timeout)
+
+    found = {}
+    for host, result in await asyncio.gather(*(_probe(host) for host in hosts)):
+        if result is not None:
+            found[host] = result
+    _LOGGER.debug("Scanned %d hosts in %s, found %d PMUs", len(hosts), network, len(found))
+    return found
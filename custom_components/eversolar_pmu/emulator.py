@@ -0,0 +1,224 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Eversolar PMU emulator for load and protocol testing.
+
+Answers the 0x01, 0x11, 0x73 and 0x13 requests that EversolarPMU sends, with
+register values following a synthetic daylight curve. This module has no Home
+Assistant dependency.
+"""
+import asyncio
+import ipaddress
+import logging
+import math
+import random
+import struct
+import time
+
+from .eversolar_protocol import CRC_LEN, HEADER_LEN, SYNC, crc16_xmodem
+
+_LOGGER = logging.getLogger(__name__)
+
+# Code list in the order a single-phase inverter reports it
+DEFAULT_CODES = (
+    0x00, 0x01, 0x02, 0x04, 0x05, 0x0D, 0x40, 0x41, 0x42, 0x43,
+    0x44, 0x46, 0x47, 0x48, 0x49, 0x4A, 0x4C, 0x4D, 0x4E,
+)
+DEFAULT_PORT = 8080
+DEFAULT_PEAK_W = 5000
+
+
+def _frame(cmd: int, payload: bytes = b"") -> bytes:
+    """Build a response frame: AA 55 cmd 00 len payload CRC-16 (MSB first)."""
+    frame = SYNC + bytes([cmd, 0x00, len(payload)]) + payload
+    return frame + struct.pack(">H", crc16_xmodem(frame))
+
+
+class EmulatedPMU:
+    """One emulated PMU listening on a TCP address."""
+
+    def __init__(
+        self,
+        inverter_id: str,
+        codes: tuple = DEFAULT_CODES,
+        peak_w: int = DEFAULT_PEAK_W,
+        latency: float = 0.0,
+        clock_offset: float = 0.0,
+        noise: float = 0.0,
+        loss: float = 0.0,
+        corrupt: float = 0.0,
+    ) -> None:
+        """Initialize emulator state.
+
+        With noise > 0, that share of responses is preceded by a few garbage
+        bytes, as from a noisy serial-to-Ethernet bridge. With loss > 0, that
+        share of responses is never sent, as on a lossy wireless link. With
+        corrupt > 0, that share of responses has one byte after the sync word
+        altered, so it fails its CRC.
+        """
+        if len(inverter_id) != 16:
+            raise ValueError("Inverter ID must be 16 characters")
+        self.inverter_id = inverter_id
+        self.codes = tuple(codes)
+        self.peak_w = peak_w
+        self.latency = latency
+        self.clock_offset = clock_offset
+        self.noise = noise
+        self.loss = loss
+        self.corrupt = corrupt
+        self._random = random.Random(inverter_id)
+        self._server: asyncio.AbstractServer | None = None
+        self._energy_wh = 0.0
+        self._last_energy_time: float | None = None
+
+        # Counters
+        self.connections = 0
+        self.requests = 0
+        self.time_syncs = 0
+        self.responses_dropped = 0
+        self.responses_corrupted = 0
+
+    @property
+    def sockname(self) -> tuple | None:
+        """Return the bound (host, port), or None if not listening."""
+        if self._server is None or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> None:
+        """Start listening."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+
+    async def async_stop(self) -> None:
+        """Stop listening."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def registers(self, now: float) -> dict:
+        """Return code -> uint16 register values at unix time now."""
+        hour = (now % 86400) / 3600.0
+        sun = max(0.0, math.sin(math.pi * (hour - 6.0) / 12.0))
+        power_w = int(self.peak_w * sun)
+
+        if self._last_energy_time is not None:
+            self._energy_wh += power_w * (now - self._last_energy_time) / 3600.0
+        self._last_energy_time = now
+        if hour < 6.0:
+            self._energy_wh = 0.0
+
+        pv_v = 3200 + int(800 * sun) if sun else 0  # 0.1 V
+        pv_a = int(power_w * 10 / (pv_v / 10.0)) if pv_v else 0  # 0.1 A
+        e_total = 123450 + int(self._energy_wh / 100)  # 0.1 kWh
+        h_total = 20000 + int(now // 3600) % 10000
+        values = {
+            0x00: 350 + int(150 * sun),
+            0x01: pv_v,
+            0x02: pv_v,
+            0x04: pv_a,
+            0x05: pv_a,
+            0x0D: int(self._energy_wh / 10),
+            0x40: pv_v,
+            0x41: pv_a,
+            0x42: 2400 + int(30 * math.sin(now / 60.0)),
+            0x43: 5000 + int(5 * math.sin(now / 17.0)),
+            0x44: power_w,
+            0x46: pv_a,
+            0x47: e_total & 0xFFFF,
+            0x48: e_total >> 16,
+            0x49: h_total & 0xFFFF,
+            0x4A: h_total >> 16,
+            0x4C: 1 if sun else 0,
+            0x4D: 0,
+            0x4E: 0,
+        }
+        return {code: values.get(code, 0) & 0xFFFF for code in self.codes}
+
+    def _resp12(self, full: bool) -> bytes:
+        """Build the 0x12 discovery response."""
+        payload = b"\x00\x00" + self.inverter_id.encode("ascii")
+        if full:
+            payload += bytes(self.codes) + b"\x00" * 8
+        return _frame(0x12, payload)
+
+    def _resp14(self) -> bytes:
+        """Build the 0x14 normal-info response."""
+        now = time.time()
+        regs = self.registers(now)
+        pmu_epoch = int(now + self.clock_offset) & 0xFFFFFFFF
+        payload = b"\x00\x00" + struct.pack("<I", pmu_epoch) + b"\x00\x00"
+        payload += struct.pack(f"<{len(self.codes)}H", *(regs[code] for code in self.codes))
+        return _frame(0x14, payload)
+
+    def response(self, cmd: int, payload: bytes) -> bytes | None:
+        """Return the response frame for one request, or None to ignore it."""
+        if cmd == 0x01:
+            self.time_syncs += 1
+            self.clock_offset = 0.0
+            return _frame(0x02, b"\x00")
+        if cmd == 0x11:
+            return self._resp12(full=payload[:1] == b"\x00")
+        if cmd == 0x73:
+            return _frame(0x74)
+        if cmd == 0x13:
+            return self._resp14()
+        return None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one client connection."""
+        self.connections += 1
+        try:
+            while True:
+                hdr = await reader.readexactly(HEADER_LEN)
+                if hdr[:2] != SYNC:
+                    break
+                payload = await reader.readexactly(hdr[4]) if hdr[4] else b""
+                await reader.readexactly(CRC_LEN)
+                self.requests += 1
+
+                resp = self.response(hdr[2], payload)
+                if resp is None:
+                    continue
+                if self.loss and self._random.random() < self.loss:
+                    self.responses_dropped += 1
+                    continue
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                if self.corrupt and self._random.random() < self.corrupt:
+                    self.responses_corrupted += 1
+                    resp = bytearray(resp)
+                    resp[self._random.randrange(len(SYNC), len(resp))] ^= 1 << self._random.randrange(8)
+                    resp = bytes(resp)
+                if self.noise and self._random.random() < self.noise:
+                    resp = self._random.randbytes(self._random.randint(1, 8)) + resp
+                writer.write(resp)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def fleet_hosts(count: int, first_host: str = "127.0.1.1") -> list:
+    """Return count consecutive loopback addresses starting at first_host."""
+    first = ipaddress.ip_address(first_host)
+    return [str(first + i) for i in range(count)]
+
+
+async def async_start_fleet(
+    count: int,
+    first_host: str = "127.0.1.1",
+    port: int = DEFAULT_PORT,
+    latency: float = 0.0,
+    noise: float = 0.0,
+) -> list:
+    """Start count emulated PMUs, one per loopback address."""
+    fleet = []
+    for i, host in enumerate(fleet_hosts(count, first_host)):
+        pmu = EmulatedPMU(f"EMU{i:013d}", latency=latency, noise=noise)
+        await pmu.async_start(host, port)
+        fleet.append(pmu)
+    _LOGGER.debug("Started %d emulated PMUs from %s:%s", count, first_host, port)
+    return fleet
@@ -6,7 +6,11 @@
 import re
 import socket
 import struct
+import sys
+import time
+from array import array
 from datetime import datetime, timezone
+from typing import NamedTuple
 
 try:
     from zoneinfo import ZoneInfo
@@ -15,6 +19,106 @@ except ImportError:
 
 
 SYNC = b"\xAA\x55"
+HEADER_LEN = 5
+CRC_LEN = 2
+
+INVERTER_ID_RE = re.compile(rb"[A-Z0-9]{16}")
+# A run of at least 4 zero bytes after the first 2 codes marks the end of the code list
+CODE_LIST_PADDING = b"\x00\x00\x00\x00"
+
+# Preformatted register names, so raw_u16 keys are not re-formatted every poll
+CODE_NAMES = tuple(f"0x{code:02x}" for code in range(256))
+
+# Bytes requested per recv by FrameReader
+RECV_CHUNK = 512
+
+# Response command for each request command
+RESPONSE_CMD = {0x01: 0x02, 0x11: 0x12, 0x13: 0x14, 0x73: 0x74}
+
+# Smoothing gains and variance factor of the RTT estimator (RFC 6298)
+RTT_ALPHA = 0.125
+RTT_BETA = 0.25
+RTT_K = 4
+# Floor of the adaptive request timeout, and of its variance term
+MIN_REQUEST_TIMEOUT = 0.05
+RTT_GRANULARITY = 0.01
+
+# Requests that can be re-sent within a session without side effects
+IDEMPOTENT_CMDS = frozenset((0x11, 0x13, 0x73))
+# Response commands a late or duplicate frame may carry
+RESPONSE_CMDS = frozenset(RESPONSE_CMD.values())
+# Re-sends allowed per request, and per poll in total
+REQUEST_RETRIES = 1
+POLL_RETRY_BUDGET = 2
+# Share of the remaining budget an attempt waits before its request is re-sent
+RETRY_WAIT_SHARE = 0.5
+
+# Share of the remaining poll budget that each step may use at most; time a
+# step does not use carries forward to the next one
+CONNECT_SHARE = 0.3
+HANDSHAKE_SHARE = 0.7
+
+
+class Deadline:
+    """Absolute time budget shared by a sequence of socket operations."""
+
+    __slots__ = ("expires",)
+
+    def __init__(self, budget_s: float) -> None:
+        """Start a budget of budget_s seconds from now."""
+        self.expires = time.monotonic() + budget_s
+
+    def remaining(self) -> float:
+        """Return seconds left, raising socket.timeout once the budget is spent."""
+        left = self.expires - time.monotonic()
+        if left <= 0:
+            raise socket.timeout("Deadline exceeded")
+        return left
+
+    def step(self, share: float) -> "Deadline":
+        """Return a sub-deadline capped at a share of the remaining budget."""
+        return Deadline(self.remaining() * share)
+
+
+class RttEstimator:
+    """Smoothed round-trip time and variance of one PMU, in the style of TCP RTO.
+
+    Each answered request that was not re-sent gives a sample (Karn's rule).
+    The request timeout is SRTT + 4 * RTTVAR, raised to MIN_REQUEST_TIMEOUT,
+    then doubled for every timeout since the last sample and capped at the
+    caller's upper bound.
+    """
+
+    __slots__ = ("srtt", "rttvar", "samples", "_backoff")
+
+    def __init__(self) -> None:
+        """Initialize with no samples."""
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self.samples = 0
+        self._backoff = 1
+
+    def add(self, rtt: float) -> None:
+        """Add a round-trip time sample in seconds."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar += RTT_BETA * (abs(self.srtt - rtt) - self.rttvar)
+            self.srtt += RTT_ALPHA * (rtt - self.srtt)
+        self.samples += 1
+        self._backoff = 1
+
+    def backoff(self) -> None:
+        """Double the timeout after a request timed out."""
+        self._backoff = min(self._backoff * 2, 64)
+
+    def timeout(self, upper: float) -> float | None:
+        """Return the request timeout capped at upper, or None without samples."""
+        if self.srtt is None:
+            return None
+        rto = max(self.srtt + max(RTT_GRANULARITY, RTT_K * self.rttvar), MIN_REQUEST_TIMEOUT)
+        return min(rto * self._backoff, upper)
 
 
 def crc16_xmodem(data: bytes) -> int:
@@ -30,28 +134,144 @@ def crc16_xmodem(data: bytes) -> int:
     return crc
 
 
-def recv_exact(sock: socket.socket, n: int, timeout_s: float = 5.0) -> bytes:
-    """Receive exactly n bytes from socket."""
-    sock.settimeout(timeout_s)
-    out = bytearray()
-    while len(out) < n:
-        chunk = sock.recv(n - len(out))
-        if not chunk:
-            raise RuntimeError(
-                f"Socket closed while reading {n} bytes (got {len(out)})"
-            )
-        out.extend(chunk)
-    return bytes(out)
+class FrameReader:
+    """Buffered frame reader that resynchronises on the AA 55 sync word.
+
+    Bytes before a sync word are discarded. A candidate frame is accepted when
+    its reserved header byte is zero, its command is the expected one (if
+    given) and it passes its check; otherwise the reader skips that sync byte
+    and scans on. A complete frame with another response command, such as a
+    late reply to a request that was re-sent, is skipped whole.
+
+    Once the peer has been seen to append a CRC-16 to its frames (checksums is
+    True), every frame must carry a matching one. Until then a CRC that
+    follows a frame, even in a later segment, is consumed with it, and a frame
+    whose length field does not end at a CRC or the next sync word is
+    rejected as corrupt.
+    """
+
+    def __init__(self, sock: socket.socket, checksums: bool | None = None) -> None:
+        """Initialize reader for one connection; checksums carries what is known of the peer."""
+        self._sock = sock
+        self._buf = bytearray()
+        self._pending_crc = b""
+        self.checksums = checksums
+        self.resyncs = 0
+        self.discarded_bytes = 0
+        self.stale_frames = 0
+        self.bad_frames = 0
+
+    def _fill(self, n: int, deadline: Deadline) -> None:
+        """Buffer at least n bytes within the deadline."""
+        while len(self._buf) < n:
+            self._sock.settimeout(deadline.remaining())
+            chunk = self._sock.recv(max(n - len(self._buf), RECV_CHUNK))
+            if not chunk:
+                raise RuntimeError(
+                    f"Socket closed while reading {n} bytes (got {len(self._buf)})"
+                )
+            self._buf.extend(chunk)
+
+    def _discard(self, n: int) -> None:
+        """Drop n bytes from the front of the buffer."""
+        del self._buf[:n]
+        self.discarded_bytes += n
+
+    def _consume_pending_crc(self, deadline: Deadline) -> None:
+        """Drop the previous frame's CRC if it arrived after the frame itself."""
+        if self._pending_crc:
+            self._fill(len(self._pending_crc), deadline)
+            if self._buf.startswith(self._pending_crc):
+                del self._buf[:len(self._pending_crc)]
+                self.checksums = True
+            self._pending_crc = b""
+
+    def _take_frame(self, deadline: Deadline) -> bytes | None:
+        """Remove and return the complete frame at the front of the buffer.
+
+        Returns None, leaving the buffer as it was, if the frame fails its CRC
+        or length check.
+        """
+        total = HEADER_LEN + self._buf[4]
+        if self.checksums:
+            self._fill(total + CRC_LEN, deadline)
+            frame = bytes(self._buf[:total])
+            if self._buf[total:total + CRC_LEN] != struct.pack(">H", crc16_xmodem(frame)):
+                return None
+            del self._buf[:total + CRC_LEN]
+            return frame
+
+        self._fill(total, deadline)
+        frame = bytes(self._buf[:total])
+        crc = struct.pack(">H", crc16_xmodem(frame))
+        rest = bytes(self._buf[total:total + CRC_LEN])
+        if crc.startswith(rest):
+            if len(rest) == CRC_LEN:
+                self.checksums = True
+        elif SYNC.startswith(rest):
+            rest = b""
+        else:
+            # Neither a CRC nor the next frame follows: the length is wrong
+            return None
+        del self._buf[:total + len(rest)]
+        # Expect the rest of the CRC, unless it could be the next sync word
+        pending = crc[len(rest):]
+        self._pending_crc = b"" if SYNC.startswith(pending) else pending
+        return frame
+
+    def _drop_bad_frame(self) -> None:
+        """Skip the sync byte of a frame that failed its check."""
+        self.bad_frames += 1
+        self._discard(1)
+
+    def read_frame(self, deadline: Deadline, expect: int | None = None) -> bytes:
+        """Return the next valid frame: AA 55 cmd 00 len payload."""
+        self._consume_pending_crc(deadline)
+
+        discarded = self.discarded_bytes
+        try:
+            while True:
+                idx = self._buf.find(SYNC)
+                if idx == -1:
+                    # Keep a trailing AA that may be the start of a sync word
+                    keep = 1 if self._buf.endswith(SYNC[:1]) else 0
+                    if len(self._buf) > keep:
+                        self._discard(len(self._buf) - keep)
+                    self._fill(len(self._buf) + 1, deadline)
+                    continue
+                if idx:
+                    self._discard(idx)
+
+                self._fill(HEADER_LEN, deadline)
+                if self._buf[3] != 0x00:
+                    self._discard(1)
+                    continue
+                if expect is not None and self._buf[2] != expect:
+                    if self._buf[2] in RESPONSE_CMDS:
+                        # A late or duplicate response to a re-sent request
+                        if self._take_frame(deadline) is None:
+                            self._drop_bad_frame()
+                        else:
+                            self.stale_frames += 1
+                            self._consume_pending_crc(deadline)
+                    else:
+                        self._discard(1)
+                    continue
+
+                frame = self._take_frame(deadline)
+                if frame is None:
+                    self._drop_bad_frame()
+                    continue
+                return frame
+        finally:
+            if self.discarded_bytes != discarded:
+                self.resyncs += 1
 
 
-def recv_frame(sock: socket.socket, timeout_s: float = 5.0) -> bytes:
-    """Receive a frame: AA 55 cmd 00 len payload."""
-    hdr = recv_exact(sock, 5, timeout_s=timeout_s)
-    if hdr[:2] != SYNC:
-        raise RuntimeError(f"Bad sync in response header: {hdr.hex()}")
-    payload_len = hdr[4]
-    payload = recv_exact(sock, payload_len, timeout_s=timeout_s) if payload_len else b""
-    return hdr + payload
+def send_frame(sock: socket.socket, frame: bytes, deadline: Deadline) -> None:
+    """Send a frame within the remaining budget."""
+    sock.settimeout(deadline.remaining())
+    sock.sendall(frame)
 
 
 def build_req(cmd: int, payload: bytes) -> bytes:
@@ -95,62 +315,287 @@ def build_init_payload(now_local: datetime) -> bytes:
     return payload
 
 
-def parse_inverter_id(resp12: bytes) -> str:
-    """Extract inverter ID from 0x12 response."""
-    payload = resp12[5:]
-    m = re.search(rb"[A-Z0-9]{16}", payload)
-    if not m:
-        raise RuntimeError("Could not find inverter ID in 0x12 response")
-    return m.group(0).decode("ascii", errors="ignore")
+class DiscoveryResult(NamedTuple):
+    """Structured contents of a 0x12 discovery response.
+
+    Offsets are relative to the start of the payload. The result is hashable, so
+    a session can compare it against the previous poll to detect layout changes.
+    """
 
+    inverter_ids: tuple
+    codes: tuple
+    padding_offset: int
+    trailer_offset: int
 
-def parse_code_list_from_resp12(resp12: bytes) -> list:
-    """Extract data codes from 0x12 response."""
-    payload = resp12[5:]
-    m = re.search(rb"[A-Z0-9]{16}", payload)
+    @property
+    def inverter_id(self) -> str:
+        """Return the primary inverter ID."""
+        return self.inverter_ids[0]
+
+
+def parse_resp12(resp12: bytes) -> DiscoveryResult:
+    """Parse a 0x12 response into inverter ID(s), code list and layout offsets."""
+    m = INVERTER_ID_RE.search(resp12, HEADER_LEN)
     if not m:
-        raise RuntimeError("Could not locate inverter ID in 0x12 response")
-    i = m.end()
-
-    tail = payload[i:]
-    codes: list = []
-    pos = 0
-    while pos < len(tail):
-        b = tail[pos]
-        if b == 0x00:
-            # count zero-run
-            zr = 1
-            while (pos + zr) < len(tail) and tail[pos + zr] == 0x00:
-                zr += 1
-            # if this looks like padding (>=4 zeros) and we already have real codes, stop
-            if zr >= 4 and len(codes) >= 2:
-                break
-            # otherwise, 0x00 is a legitimate code; keep it and continue
-            codes.append(0x00)
-            pos += 1
-            continue
-        codes.append(b)
-        pos += 1
+        raise RuntimeError("Could not find inverter ID in 0x12 response")
 
+    start = m.end()
+    end = len(resp12)
+    # 0x00 is a legitimate code, so padding only counts once 2 codes precede it
+    padding = resp12.find(CODE_LIST_PADDING, start + 2)
+    if padding == -1:
+        padding = end
+    codes = tuple(resp12[start:padding])
     if not codes:
         raise RuntimeError("No codes parsed from 0x12 response")
-    return codes
+
+    trailer = end - len(resp12[padding:].lstrip(b"\x00"))
+    inverter_ids = [m.group(0).decode("ascii", errors="ignore")]
+    for extra in INVERTER_ID_RE.finditer(resp12, trailer):
+        inverter_ids.append(extra.group(0).decode("ascii", errors="ignore"))
+
+    return DiscoveryResult(
+        inverter_ids=tuple(inverter_ids),
+        codes=codes,
+        padding_offset=padding - HEADER_LEN,
+        trailer_offset=trailer - HEADER_LEN,
+    )
 
 
 def decode_normal_info_from_resp14(resp14: bytes, codes: list) -> dict:
     """Decode data values from 0x14 response."""
-    payload = resp14[5:]
-    start = 0x08
+    start = HEADER_LEN + 0x08
     need = start + len(codes) * 2
-    if len(payload) < need:
-        raise RuntimeError(f"0x14 payload too short: {len(payload)} < {need}")
+    if len(resp14) < need:
+        raise RuntimeError(f"0x14 payload too short: {len(resp14) - HEADER_LEN} < {need - HEADER_LEN}")
+    return dict(zip(codes, struct.unpack_from(f"<{len(codes)}H", resp14, start)))
 
-    vals = {}
-    for idx, code in enumerate(codes):
-        off = start + idx * 2
-        v = payload[off] + (payload[off + 1] << 8)  # uint16 LE
-        vals[code] = v
-    return vals
+
+def decode_registers_from_resp14(resp14: bytes, codes) -> array:
+    """Decode all 0x14 values into a uint16 array aligned to the code list."""
+    start = HEADER_LEN + 0x08
+    need = start + len(codes) * 2
+    if len(resp14) < need:
+        raise RuntimeError(f"0x14 payload too short: {len(resp14) - HEADER_LEN} < {need - HEADER_LEN}")
+    raw = array("H")
+    raw.frombytes(resp14[start:need])
+    if sys.byteorder == "big":
+        raw.byteswap()
+    return raw
+
+
+class PollResult:
+    """Result of one poll.
+
+    Raw registers are kept as an array('H') aligned to the code list and
+    timestamps as datetimes. Scaled values, ISO strings and dict views are only
+    produced when something reads them. Supports the read-only dict access
+    (get, [], in) that entities use.
+    """
+
+    __slots__ = (
+        "inverter_id",
+        "codes",
+        "raw",
+        "pmu_epoch",
+        "pmu_time",
+        "time_delta",
+        "ac_online_time",
+        "ac_offline_time",
+        "pmu_epoch_step",
+        "pmu_time_stuck",
+        "pmu_drift_ppm",
+        "pmu_clock_error",
+        "_index",
+    )
+
+    KEYS = frozenset(
+        (
+            "inverter_id", "power_w", "vac_v", "fac_hz", "e_today_kwh", "e_total_kwh",
+            "h_total_hours", "mode", "pv_v", "pv_a", "pv_w_est", "error_flags",
+            "pmu_time_utc", "time_delta", "pmu_epoch", "ac_online_time",
+            "ac_offline_time", "registers", "raw_u16", "pmu_epoch_step",
+            "pmu_time_stuck", "pmu_drift_ppm", "pmu_clock_error",
+        )
+    )
+
+    def __init__(
+        self,
+        inverter_id: str,
+        codes: tuple,
+        raw: array,
+        index: dict,
+        pmu_epoch: int | None = None,
+        pmu_time: datetime | None = None,
+        time_delta: int | None = None,
+    ) -> None:
+        """Initialize result; index maps code -> position in raw."""
+        self.inverter_id = inverter_id
+        self.codes = codes
+        self.raw = raw
+        self._index = index
+        self.pmu_epoch = pmu_epoch
+        self.pmu_time = pmu_time
+        self.time_delta = time_delta
+        self.ac_online_time: datetime | None = None
+        self.ac_offline_time: datetime | None = None
+        self.pmu_epoch_step: int | None = None
+        self.pmu_time_stuck: bool | None = None
+        self.pmu_drift_ppm: float | None = None
+        self.pmu_clock_error: float | None = None
+
+    # Mapping-style access
+
+    def get(self, key: str, default=None):
+        """Return a value by its legacy dict key."""
+        if key not in self.KEYS:
+            return default
+        value = getattr(self, key)
+        if value is None and key in ("ac_online_time", "ac_offline_time"):
+            return default
+        return value
+
+    def __getitem__(self, key: str):
+        """Return a value by its legacy dict key."""
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        """Return True for legacy dict keys."""
+        return key in self.KEYS
+
+    def as_dict(self) -> dict:
+        """Return a JSON-friendly dict of all values."""
+        out = {key: self.get(key) for key in sorted(self.KEYS) if key != "registers"}
+        for key in ("ac_online_time", "ac_offline_time"):
+            if out[key] is not None:
+                out[key] = out[key].isoformat()
+        return out
+
+    # Registers
+
+    def register(self, code: int) -> int | None:
+        """Return the raw value of a code, or None if it is not available."""
+        idx = self._index.get(code)
+        if idx is None:
+            return None
+        return self.raw[idx]
+
+    def iter_registers(self):
+        """Yield (code, raw value) for every available code."""
+        raw = self.raw
+        for code, idx in self._index.items():
+            yield code, raw[idx]
+
+    @property
+    def registers(self) -> dict:
+        """Return available raw values keyed by code."""
+        return dict(self.iter_registers())
+
+    @property
+    def raw_u16(self) -> dict:
+        """Return available raw values keyed by '0x..' register name."""
+        return {CODE_NAMES[code]: value for code, value in self.iter_registers()}
+
+    # Scaled values
+
+    def _scaled(self, code: int, divisor: float) -> float | None:
+        """Return a register divided by a scale, or None."""
+        idx = self._index.get(code)
+        return None if idx is None else self.raw[idx] / divisor
+
+    def _word32(self, low: int, high: int, high_scale: int = 65536) -> int | None:
+        """Return a value split over a low and a high register, or None."""
+        lo = self._index.get(low)
+        hi = self._index.get(high)
+        if lo is None or hi is None:
+            return None
+        return self.raw[lo] + self.raw[hi] * high_scale
+
+    @property
+    def power_w(self) -> int | None:
+        """Return AC power in W."""
+        idx = self._index.get(0x44)
+        return None if idx is None else self.raw[idx]
+
+    @property
+    def vac_v(self) -> float | None:
+        """Return AC voltage in V."""
+        return self._scaled(0x42, 10.0)
+
+    @property
+    def fac_hz(self) -> float | None:
+        """Return grid frequency in Hz."""
+        return self._scaled(0x43, 100.0)
+
+    @property
+    def e_today_kwh(self) -> float | None:
+        """Return energy today in kWh."""
+        return self._scaled(0x0D, 100.0)
+
+    @property
+    def mode(self) -> int | None:
+        """Return the operation mode."""
+        idx = self._index.get(0x4C)
+        return None if idx is None else self.raw[idx]
+
+    @property
+    def pv_v(self) -> float | None:
+        """Return PV voltage in V from the first valid voltage code."""
+        for code in (0x01, 0x02, 0x40):
+            idx = self._index.get(code)
+            if idx is not None and self.raw[idx] not in (0, 0xFFFF):
+                return self.raw[idx] / 10.0
+        return None
+
+    @property
+    def pv_a(self) -> float | None:
+        """Return PV current in A, estimated from power if no current code is valid."""
+        for code in (0x41, 0x04, 0x05, 0x46):
+            idx = self._index.get(code)
+            if idx is not None:
+                raw = self.raw[idx]
+                if raw not in (0, 0xFFFF) and raw <= 2000:
+                    return raw / 10.0
+        pv_v = self.pv_v
+        power_w = self.power_w
+        if pv_v and power_w is not None and pv_v > 0:
+            return round(power_w / pv_v, 3)
+        return None
+
+    @property
+    def pv_w_est(self) -> float | None:
+        """Return estimated PV power in W."""
+        pv_v = self.pv_v
+        pv_a = self.pv_a
+        if pv_v is None or pv_a is None:
+            return None
+        return round(pv_v * pv_a, 1)
+
+    @property
+    def e_total_kwh(self) -> float | None:
+        """Return lifetime energy in kWh."""
+        lo = self._index.get(0x47)
+        hi = self._index.get(0x48)
+        if lo is None or hi is None:
+            return None
+        return round((self.raw[lo] / 10.0) + (self.raw[hi] * 6553.6), 1)
+
+    @property
+    def h_total_hours(self) -> int | None:
+        """Return lifetime operation hours."""
+        return self._word32(0x49, 0x4A)
+
+    @property
+    def error_flags(self) -> int | None:
+        """Return the 32-bit error flags (low 16 bits in 0x4D, high 16 bits in 0x4E)."""
+        return self._word32(0x4D, 0x4E)
+
+    @property
+    def pmu_time_utc(self) -> str | None:
+        """Return the PMU clock as an ISO string."""
+        return None if self.pmu_time is None else self.pmu_time.isoformat()
 
 
 class EversolarPMU:
@@ -163,32 +608,181 @@ class EversolarPMU:
         self.timeout = timeout
         self._inverter_id = None
         self._codes = None
+        self._resp12_raw: bytes | None = None
+        self.discovery: DiscoveryResult | None = None
+        self._code_index: dict = {}
+        self._active_socks: set = set()
+
+        # Framing errors recovered by resynchronising the stream
+        self.resyncs = 0
+        self.discarded_bytes = 0
+        self.bad_frames = 0
+        # Whether the PMU appends a CRC-16 to its frames, once seen
+        self.frame_checksums: bool | None = None
+
+        # Round-trip times of this PMU per request command, which set the
+        # timeouts of re-sendable requests; the PMU answers a data or code
+        # list request more slowly than a keepalive
+        self.rtt = {cmd: RttEstimator() for cmd in RESPONSE_CMD}
+
+        # Requests re-sent after a lost response, and late responses skipped
+        self.request_retries = 0
+        self.stale_frames = 0
+        self._retry_budget = 0
+
+        # Optional callable(direction, frame) told of every frame sent ("tx")
+        # and received ("rx"), used by the command-line frame capture
+        self.frame_log = None
+
+    def _send(self, s: socket.socket, frame: bytes, deadline: Deadline) -> None:
+        """Send a frame, logging it if a frame log is set."""
+        if self.frame_log is not None:
+            self.frame_log("tx", frame)
+        send_frame(s, frame, deadline)
+
+    def _read(self, reader: FrameReader, deadline: Deadline, expect: int) -> bytes:
+        """Read a frame, logging it if a frame log is set."""
+        frame = reader.read_frame(deadline, expect)
+        if self.frame_log is not None:
+            self.frame_log("rx", frame)
+        return frame
+
+    def _request(
+        self, s: socket.socket, reader: FrameReader, cmd: int, payload: bytes, deadline: Deadline
+    ) -> bytes:
+        """Send a request and return its response, re-sending an idempotent one once.
+
+        An attempt that may be followed by a re-send waits for the command's
+        adaptive request timeout, or without RTT samples yet, for part of the
+        remaining budget. The last attempt, and any attempt of a request that
+        is never re-sent, waits for all of the remaining budget. If the
+        response is lost the request is sent again; should the first response
+        still turn up, whichever arrives first is used and the other is
+        skipped by a later read.
+        """
+        frame = build_req(cmd, payload)
+        rtt = self.rtt[cmd]
+        retries = REQUEST_RETRIES if cmd in IDEMPOTENT_CMDS else 0
+        first = True
+        while True:
+            last = not retries or not self._retry_budget
+            if last:
+                wait = deadline
+            else:
+                timeout = rtt.timeout(self.timeout)
+                if timeout is not None:
+                    wait = Deadline(min(timeout, deadline.remaining()))
+                else:
+                    wait = deadline.step(RETRY_WAIT_SHARE)
+            self._send(s, frame, deadline)
+            sent = time.monotonic()
+            try:
+                response = self._read(reader, wait, RESPONSE_CMD[cmd])
+            except socket.timeout:
+                rtt.backoff()
+                if last:
+                    raise
+                retries -= 1
+                self._retry_budget -= 1
+                self.request_retries += 1
+                first = False
+                continue
+            if first:
+                # A re-sent request's response cannot be matched to one send
+                rtt.add(time.monotonic() - sent)
+            return response
+
+    def _connect(self, deadline: Deadline) -> socket.socket:
+        """Open a tracked connection, using at most the connect share of the budget."""
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._active_socks.add(s)
+        try:
+            s.settimeout(deadline.step(CONNECT_SHARE).remaining())
+            s.connect((self.host, self.port))
+        except Exception:
+            self._release(s)
+            raise
+        return s
+
+    def _release(self, s: socket.socket, reader: FrameReader | None = None) -> None:
+        """Close a tracked connection and account for its resyncs."""
+        self._active_socks.discard(s)
+        s.close()
+        if reader is not None:
+            self.resyncs += reader.resyncs
+            self.discarded_bytes += reader.discarded_bytes
+            self.stale_frames += reader.stale_frames
+            self.bad_frames += reader.bad_frames
+            if reader.checksums:
+                self.frame_checksums = True
+
+    def abort(self) -> None:
+        """Release any open connection immediately.
+
+        Safe to call from another thread: shutting the socket down wakes a
+        blocked recv, which then fails and closes the socket in its own thread.
+        """
+        for s in list(self._active_socks):
+            try:
+                s.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
 
     @staticmethod
     def test_connection(host: str, port: int, timeout: float = 5.0) -> bool:
         """Test if PMU is reachable by attempting init handshake."""
         try:
+            deadline = Deadline(timeout)
             s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            s.settimeout(timeout)
-            s.connect((host, port))
-
-            # Send init command
-            now_local = datetime.now(timezone.utc)
-            s.sendall(build_req(0x01, build_init_payload(now_local)))
-            recv_frame(s, timeout_s=timeout)
-
-            s.close()
+            try:
+                s.settimeout(deadline.step(CONNECT_SHARE).remaining())
+                s.connect((host, port))
+
+                # Send init command
+                now_local = datetime.now(timezone.utc)
+                send_frame(s, build_req(0x01, build_init_payload(now_local)), deadline)
+                FrameReader(s).read_frame(deadline, RESPONSE_CMD[0x01])
+            finally:
+                s.close()
             return True
         except Exception:
             return False
 
-    def connect_and_poll(self, set_time: bool = False, tz_name: str = "Australia/Brisbane") -> dict:
-        """Connect, initialize, and poll data from PMU."""
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.settimeout(self.timeout)
+    def discover(self) -> DiscoveryResult:
+        """Connect, initialize and return the PMU's 0x12 discovery response.
 
+        Used to confirm that a host is a PMU; raises on any failure.
+        """
+        deadline = Deadline(self.timeout)
+        s = self._connect(deadline)
+        reader = FrameReader(s, self.frame_checksums)
+        self._retry_budget = POLL_RETRY_BUDGET
         try:
-            s.connect((self.host, self.port))
+            now_local = datetime.now(timezone.utc)
+            self._request(s, reader, 0x01, build_init_payload(now_local), deadline)
+            self.discovery = parse_resp12(self._request(s, reader, 0x11, b"\x00", deadline))
+            return self.discovery
+        finally:
+            self._release(s, reader)
+
+    def connect_and_poll(
+        self,
+        set_time: bool = False,
+        tz_name: str = "Australia/Brisbane",
+    ) -> PollResult:
+        """Connect, initialize, and poll data from PMU.
+
+        The whole exchange shares one budget of self.timeout seconds, split
+        across the connect, handshake and data steps; each request also has
+        its own adaptive timeout from the PMU's round-trip times.
+        """
+        deadline = Deadline(self.timeout)
+        s = self._connect(deadline)
+        reader = FrameReader(s, self.frame_checksums)
+        self._retry_budget = POLL_RETRY_BUDGET
+
+        try:
+            handshake = deadline.step(HANDSHAKE_SHARE)
 
             # 1) INIT (0x01) -> (0x02)
             if ZoneInfo:
@@ -196,138 +790,78 @@ class EversolarPMU:
             else:
                 now_local = datetime.now()
 
-            s.sendall(build_req(0x01, build_init_payload(now_local)))
-            recv_frame(s, timeout_s=self.timeout)
+            self._request(s, reader, 0x01, build_init_payload(now_local), handshake)
 
             # 2) 0x11 0x00 -> 0x12 (contains inverter id + code list)
-            s.sendall(build_req(0x11, b"\x00"))
-            resp12_long = recv_frame(s, timeout_s=self.timeout)
-            inverter_id = parse_inverter_id(resp12_long)
-            codes = parse_code_list_from_resp12(resp12_long)
+            resp12_long = self._request(s, reader, 0x11, b"\x00", handshake)
+            # An identical response has an identical layout; skip re-parsing it
+            if resp12_long != self._resp12_raw or self.discovery is None:
+                self.discovery = parse_resp12(resp12_long)
+                self._resp12_raw = resp12_long
+                self._code_index = {code: idx for idx, code in enumerate(self.discovery.codes)}
+            inverter_id = self.discovery.inverter_id
+            codes = self.discovery.codes
 
             # Store for later use
             self._inverter_id = inverter_id
             self._codes = codes
 
             # 3) keepalive 0x73 -> 0x74
-            s.sendall(build_req(0x73, b""))
-            recv_frame(s, timeout_s=self.timeout)
+            self._request(s, reader, 0x73, b"", handshake)
 
             # 4) 0x11 0x01 -> 0x12 short (compatibility)
-            s.sendall(build_req(0x11, b"\x01"))
-            recv_frame(s, timeout_s=self.timeout)
+            self._request(s, reader, 0x11, b"\x01", handshake)
 
             # 5) keepalive again
-            s.sendall(build_req(0x73, b""))
-            recv_frame(s, timeout_s=self.timeout)
+            self._request(s, reader, 0x73, b"", handshake)
 
             # 6) 0x13 inverter_id -> 0x14 values
-            s.sendall(build_req(0x13, inverter_id.encode("ascii")))
-            resp14 = recv_frame(s, timeout_s=self.timeout)
+            resp14 = self._request(s, reader, 0x13, inverter_id.encode("ascii"), deadline)
 
             # Parse PMU time
             pmu_epoch = None
-            pmu_time_utc = None
+            pmu_time = None
             time_delta = None
 
             try:
-                payload14 = resp14[5:]
-                pmu_epoch = int.from_bytes(payload14[2:6], "little")
-                pmu_dt_utc = datetime.fromtimestamp(pmu_epoch, tz=timezone.utc)
-                pmu_time_utc = pmu_dt_utc.isoformat()
-
-                host_dt_utc = datetime.now(timezone.utc)
-                time_delta = int((pmu_dt_utc - host_dt_utc).total_seconds())
+                pmu_epoch = int.from_bytes(resp14[HEADER_LEN + 2:HEADER_LEN + 6], "little")
+                pmu_time = datetime.fromtimestamp(pmu_epoch, tz=timezone.utc)
+                time_delta = int((pmu_time - datetime.now(timezone.utc)).total_seconds())
             except Exception:
                 pmu_epoch = None
-                pmu_time_utc = None
+                pmu_time = None
                 time_delta = None
 
-            # Decode values
-            vals = decode_normal_info_from_resp14(resp14, codes)
-
-            # Parse and scale values
-            power_w = vals.get(0x44)
-            vac_v = (vals.get(0x42) / 10.0) if (0x42 in vals) else None
-            fac_hz = (vals.get(0x43) / 100.0) if (0x43 in vals) else None
-            e_today_kwh = (vals.get(0x0D) / 100.0) if (0x0D in vals) else None
-            mode = vals.get(0x4C)
-
-            # PV-side telemetry
-            pv_v = None
-            for code in (0x01, 0x02, 0x40):
-                if code in vals:
-                    raw = vals.get(code)
-                    if raw not in (None, 0, 0xFFFF):
-                        pv_v = raw / 10.0
-                        break
-
-            pv_a = None
-            for code in (0x41, 0x04, 0x05, 0x46):
-                if code in vals:
-                    raw = vals.get(code)
-                    if raw not in (None, 0, 0xFFFF) and raw <= 2000:
-                        pv_a = raw / 10.0
-                        break
-
-            if pv_a is None and pv_v and power_w is not None and pv_v > 0:
-                pv_a = round(power_w / pv_v, 3)
-
-            pv_w_est = round(pv_v * pv_a, 1) if (pv_v is not None and pv_a is not None) else None
-
-            # Total energy
-            e_total_kwh = None
-            if (0x47 in vals) and (0x48 in vals):
-                e_total_kwh = round((vals[0x47] / 10.0) + (vals[0x48] * 6553.6), 1)
-
-            # Total operation hours
-            h_total_hours = None
-            if (0x49 in vals) and (0x4A in vals):
-                h_total_hours = vals[0x49] + (vals[0x4A] * 65536)
-
-            # Error flags (32-bit: low 16 bits in 0x4D, high 16 bits in 0x4E)
-            error_flags = None
-            if (0x4D in vals) and (0x4E in vals):
-                error_flags = vals[0x4D] + (vals[0x4E] << 16)
-
-            return {
-                "inverter_id": inverter_id,
-                "power_w": power_w,
-                "vac_v": vac_v,
-                "fac_hz": fac_hz,
-                "e_today_kwh": e_today_kwh,
-                "e_total_kwh": e_total_kwh,
-                "h_total_hours": h_total_hours,
-                "mode": mode,
-                "pv_v": pv_v,
-                "pv_a": pv_a,
-                "pv_w_est": pv_w_est,
-                "error_flags": error_flags,
-                "pmu_time_utc": pmu_time_utc,
-                "time_delta": time_delta,
-                "pmu_epoch": pmu_epoch,
-                "raw_u16": {f"0x{k:02x}": v for k, v in vals.items()},
-            }
+            # Values are scaled lazily by PollResult when read
+            return PollResult(
+                inverter_id,
+                codes,
+                decode_registers_from_resp14(resp14, codes),
+                self._code_index,
+                pmu_epoch=pmu_epoch,
+                pmu_time=pmu_time,
+                time_delta=time_delta,
+            )
         finally:
-            s.close()
+            self._release(s, reader)
 
     def sync_time(self, tz_name: str = "Australia/Brisbane") -> bool:
         """Sync PMU time to host time."""
         try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            s.settimeout(self.timeout)
-            s.connect((self.host, self.port))
-
-            # Send init with current time
-            if ZoneInfo:
-                now_local = datetime.now(ZoneInfo(tz_name))
-            else:
-                now_local = datetime.now()
-
-            s.sendall(build_req(0x01, build_init_payload(now_local)))
-            recv_frame(s, timeout_s=self.timeout)
-
-            s.close()
+            deadline = Deadline(self.timeout)
+            s = self._connect(deadline)
+            reader = FrameReader(s, self.frame_checksums)
+            try:
+                # Send init with current time
+                if ZoneInfo:
+                    now_local = datetime.now(ZoneInfo(tz_name))
+                else:
+                    now_local = datetime.now()
+
+                self._send(s, build_req(0x01, build_init_payload(now_local)), deadline)
+                self._read(reader, deadline, RESPONSE_CMD[0x01])
+            finally:
+                self._release(s, reader)
             return True
         except Exception:
             return False
@@ -0,0 +1,330 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Buffered InfluxDB line-protocol exporter for Eversolar PMU samples.
+
+This module has no Home Assistant dependency so it can be exercised against a
+local stand-in listener (an HTTP server, a UDP socket or a plain file).
+"""
+import gzip
+import logging
+import os
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from urllib.parse import urlsplit
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MEASUREMENT = "eversolar_pmu"
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 10.0
+DEFAULT_MAX_QUEUE = 10000
+DEFAULT_MAX_SPOOL_BYTES = 16 * 1024 * 1024
+UDP_MAX_DATAGRAM = 1400
+
+
+def _escape_key(value: str) -> str:
+    """Escape a measurement, tag key, tag value or field key."""
+    return value.replace("\\", "\\\\").replace(",", "\\,").replace("=", "\\=").replace(" ", "\\ ")
+
+
+def _format_field(value) -> str | None:
+    """Format a field value, or return None if it cannot be exported."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return f"{value}i"
+    if isinstance(value, float):
+        if value != value:  # NaN is not representable in line protocol
+            return None
+        return repr(value)
+    if isinstance(value, str):
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return None
+
+
+def encode_line(measurement: str, tags: dict, fields: dict, timestamp_ns: int) -> str | None:
+    """Encode one sample as a line-protocol line."""
+    field_parts = []
+    for key, value in fields.items():
+        formatted = _format_field(value)
+        if formatted is not None:
+            field_parts.append(f"{_escape_key(key)}={formatted}")
+    if not field_parts:
+        return None
+
+    head = _escape_key(measurement)
+    for key in sorted(tags):
+        value = tags[key]
+        if value is None or value == "":
+            continue
+        head += f",{_escape_key(key)}={_escape_key(str(value))}"
+    return f"{head} {','.join(field_parts)} {timestamp_ns}"
+
+
+class RejectedBatchError(Exception):
+    """The sink refused a batch for good; sending it again will not help."""
+
+
+class _HttpSink:
+    """POST batches to an HTTP write endpoint (e.g. InfluxDB /api/v2/write)."""
+
+    def __init__(self, url: str, token: str | None, use_gzip: bool, timeout: float) -> None:
+        """Initialize HTTP sink."""
+        self._url = url
+        self._token = token
+        self._gzip = use_gzip
+        self._timeout = timeout
+
+    def send(self, body: bytes) -> None:
+        """POST one batch, gzip-compressed if enabled."""
+        headers = {"Content-Type": "text/plain; charset=utf-8"}
+        if self._gzip:
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+        if self._token:
+            headers["Authorization"] = f"Token {self._token}"
+        req = urllib.request.Request(self._url, data=body, headers=headers, method="POST")
+        try:
+            with urllib.request.urlopen(req, timeout=self._timeout) as resp:
+                if resp.status >= 300:
+                    raise RuntimeError(f"HTTP sink returned status {resp.status}")
+        except urllib.error.HTTPError as err:
+            # 4xx other than 429 (bad line protocol, auth) fails the same way on retry
+            if 400 <= err.code < 500 and err.code != 429:
+                raise RejectedBatchError(f"HTTP sink rejected batch: {err.code} {err.reason}") from err
+            raise
+
+
+class _UdpSink:
+    """Send batches as UDP datagrams, splitting on line boundaries."""
+
+    def __init__(self, host: str, port: int) -> None:
+        """Initialize UDP sink."""
+        self._addr = (host, port)
+
+    def send(self, body: bytes) -> None:
+        """Send one batch as one or more datagrams."""
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            chunk = bytearray()
+            for line in body.splitlines(keepends=True):
+                if chunk and len(chunk) + len(line) > UDP_MAX_DATAGRAM:
+                    s.sendto(bytes(chunk), self._addr)
+                    chunk.clear()
+                chunk.extend(line)
+            if chunk:
+                s.sendto(bytes(chunk), self._addr)
+        finally:
+            s.close()
+
+
+class _FileSink:
+    """Append batches to a local file."""
+
+    def __init__(self, path: str) -> None:
+        """Initialize file sink."""
+        self._path = path
+
+    def send(self, body: bytes) -> None:
+        """Append one batch to the file."""
+        with open(self._path, "ab") as f:
+            f.write(body)
+
+
+def create_sink(url: str, token: str | None = None, use_gzip: bool = True, timeout: float = 5.0):
+    """Create a sink for an http(s)://, udp://host:port or file:///path URL."""
+    parts = urlsplit(url)
+    if parts.scheme in ("http", "https"):
+        return _HttpSink(url, token, use_gzip, timeout)
+    if parts.scheme == "udp":
+        if not parts.hostname or not parts.port:
+            raise ValueError(f"UDP export URL needs a host and port: {url}")
+        return _UdpSink(parts.hostname, parts.port)
+    if parts.scheme == "file":
+        return _FileSink(parts.path)
+    raise ValueError(f"Unsupported export URL scheme: {url}")
+
+
+class LineProtocolExporter:
+    """Batch samples into line protocol and flush them to a sink.
+
+    Samples are queued in a bounded in-memory deque (oldest samples are dropped
+    when it is full). A flush is due once the queue reaches the batch size or the
+    flush interval has elapsed. Batches that cannot be delivered are spooled to
+    disk and replayed ahead of new data once the sink is reachable again;
+    batches the sink rejects outright are logged and dropped.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: str | None = None,
+        measurement: str = DEFAULT_MEASUREMENT,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        spool_dir: str | None = None,
+        max_spool_bytes: int = DEFAULT_MAX_SPOOL_BYTES,
+        use_gzip: bool = True,
+        timeout: float = 5.0,
+    ) -> None:
+        """Initialize exporter."""
+        self._sink = create_sink(url, token, use_gzip, timeout)
+        self._measurement = measurement
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: deque = deque(maxlen=max_queue)
+        self._spool_dir = spool_dir
+        self._max_spool_bytes = max_spool_bytes
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+        # Counters
+        self.samples_queued = 0
+        self.samples_dropped = 0
+        self.samples_sent = 0
+        self.flush_failures = 0
+        self.spooled_batches = 0
+        self.rejected_batches = 0
+
+    @property
+    def pending(self) -> int:
+        """Return the number of queued lines."""
+        return len(self._queue)
+
+    def add_sample(self, tags: dict, fields: dict, timestamp_ns: int | None = None) -> None:
+        """Encode and queue one sample."""
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        line = encode_line(self._measurement, tags, fields, timestamp_ns)
+        if line is None:
+            return
+        with self._lock:
+            if len(self._queue) == self._queue.maxlen:
+                self.samples_dropped += 1
+            self._queue.append(line)
+        self.samples_queued += 1
+
+    def should_flush(self, now: float | None = None) -> bool:
+        """Return True if a size- or time-based flush is due."""
+        if not self._queue:
+            return False
+        if len(self._queue) >= self._batch_size:
+            return True
+        if now is None:
+            now = time.monotonic()
+        return now - self._last_flush >= self._flush_interval
+
+    def flush(self) -> int:
+        """Deliver spooled and queued lines; return the number of lines sent.
+
+        This performs blocking I/O and must run outside the event loop.
+        """
+        if not self._flush_lock.acquire(blocking=False):
+            return 0
+        try:
+            self._last_flush = time.monotonic()
+            with self._lock:
+                lines = list(self._queue)
+                self._queue.clear()
+
+            if not self._replay_spool():
+                if lines:
+                    self._spool(lines)
+                return 0
+
+            sent = 0
+            for start in range(0, len(lines), self._batch_size):
+                batch = lines[start:start + self._batch_size]
+                body = ("\n".join(batch) + "\n").encode("utf-8")
+                try:
+                    self._sink.send(body)
+                except RejectedBatchError as err:
+                    self._reject(len(batch), err)
+                    continue
+                except Exception as err:
+                    self.flush_failures += 1
+                    _LOGGER.debug("Export sink unavailable, spooling %d lines: %s", len(lines) - start, err)
+                    self._spool(lines[start:])
+                    break
+                sent += len(batch)
+            self.samples_sent += sent
+            return sent
+        finally:
+            self._flush_lock.release()
+
+    def _spool_files(self) -> list:
+        """Return spool file paths, oldest first."""
+        if not self._spool_dir or not os.path.isdir(self._spool_dir):
+            return []
+        return sorted(
+            os.path.join(self._spool_dir, name)
+            for name in os.listdir(self._spool_dir)
+            if name.endswith(".lp")
+        )
+
+    def _spool(self, lines: list) -> None:
+        """Write undelivered lines to disk, dropping them if the spool is full."""
+        if not self._spool_dir:
+            self.samples_dropped += len(lines)
+            return
+        body = ("\n".join(lines) + "\n").encode("utf-8")
+        try:
+            os.makedirs(self._spool_dir, exist_ok=True)
+            used = sum(os.path.getsize(p) for p in self._spool_files())
+            if used + len(body) > self._max_spool_bytes:
+                self.samples_dropped += len(lines)
+                _LOGGER.warning("Export spool full, dropping %d lines", len(lines))
+                return
+            path = os.path.join(self._spool_dir, f"{time.time_ns():020d}.lp")
+            with open(path, "wb") as f:
+                f.write(body)
+            self.spooled_batches += 1
+        except OSError as err:
+            self.samples_dropped += len(lines)
+            _LOGGER.warning("Could not spool export batch: %s", err)
+
+    def _reject(self, lines: int, err: Exception) -> None:
+        """Drop a batch the sink refused for good."""
+        self.rejected_batches += 1
+        self.samples_dropped += lines
+        _LOGGER.warning("Dropping %d export lines: %s", lines, err)
+
+    def _replay_spool(self) -> bool:
+        """Send spooled batches oldest first; return False if the sink is still down."""
+        for path in self._spool_files():
+            try:
+                with open(path, "rb") as f:
+                    body = f.read()
+            except OSError as err:
+                # An unreadable spool file must not hold back the ones behind it
+                _LOGGER.warning("Dropping unreadable export spool file %s: %s", path, err)
+                self._remove_spool_file(path)
+                continue
+            try:
+                self._sink.send(body)
+            except RejectedBatchError as err:
+                self._reject(body.count(b"\n"), err)
+                self._remove_spool_file(path)
+                continue
+            except Exception as err:
+                self.flush_failures += 1
+                _LOGGER.debug("Export sink still unavailable: %s", err)
+                return False
+            self.samples_sent += body.count(b"\n")
+            self._remove_spool_file(path)
+        return True
+
+    def _remove_spool_file(self, path: str) -> None:
+        """Delete a replayed or dropped spool file."""
+        try:
+            os.remove(path)
+        except OSError as err:
+            _LOGGER.warning("Could not remove export spool file %s: %s", path, err)
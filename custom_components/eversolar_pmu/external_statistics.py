@@ -0,0 +1,232 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Direct long-term statistics import for Eversolar PMU."""
+import logging
+from datetime import datetime
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util.unit_conversion import (
+    DurationConverter,
+    ElectricCurrentConverter,
+    ElectricPotentialConverter,
+    EnergyConverter,
+    PowerConverter,
+)
+
+from .const import DOMAIN
+
+try:
+    from homeassistant.components.recorder.models import StatisticMeanType
+except ImportError:  # Recorders before 2025.4 only know has_mean
+    StatisticMeanType = None
+
+_LOGGER = logging.getLogger(__name__)
+
+# Data keys aggregated into hourly mean/min/max statistics: key -> (name, unit, unit class)
+MEAN_STATISTICS = {
+    "power_w": ("Power", "W", PowerConverter.UNIT_CLASS),
+    "vac_v": ("AC Voltage", "V", ElectricPotentialConverter.UNIT_CLASS),
+    "fac_hz": ("AC Frequency", "Hz", None),
+    "pv_v": ("PV Voltage", "V", ElectricPotentialConverter.UNIT_CLASS),
+    "pv_a": ("PV Current", "A", ElectricCurrentConverter.UNIT_CLASS),
+    "pv_w_est": ("PV Power", "W", PowerConverter.UNIT_CLASS),
+}
+
+# Monotonic counters aggregated into hourly state/sum statistics: key -> (name, unit, unit class)
+SUM_STATISTICS = {
+    "e_total_kwh": ("Total Energy", "kWh", EnergyConverter.UNIT_CLASS),
+    "h_total_hours": ("Total Operation Hours", "h", DurationConverter.UNIT_CLASS),
+}
+
+
+class _HourBucket:
+    """Running aggregate of one data key over one hour."""
+
+    __slots__ = ("count", "total", "min", "max", "last")
+
+    def __init__(self, value: float) -> None:
+        """Initialize bucket with its first sample."""
+        self.count = 1
+        self.total = value
+        self.min = value
+        self.max = value
+        self.last = value
+
+    @classmethod
+    def from_storage(cls, data: list) -> "_HourBucket":
+        """Restore a bucket written by as_storage."""
+        bucket = cls(0.0)
+        bucket.count, bucket.total, bucket.min, bucket.max, bucket.last = data
+        return bucket
+
+    def as_storage(self) -> list:
+        """Return the compact form written to storage."""
+        return [self.count, self.total, self.min, self.max, self.last]
+
+    def add(self, value: float) -> None:
+        """Add a sample to the bucket."""
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.last = value
+
+
+class EversolarStatisticsAggregator:
+    """Aggregate poll samples into hourly long-term statistics rows."""
+
+    def __init__(self) -> None:
+        """Initialize aggregator."""
+        self._hour_start: datetime | None = None
+        self._buckets: dict[str, _HourBucket] = {}
+        self._completed: dict[str, list[StatisticData]] = {}
+        self._completed_hours = 0
+        # key -> (last state, last sum) of the most recent imported sum row
+        self._sum_bases: dict[str, tuple[float, float]] = {}
+
+    @property
+    def completed_hours(self) -> int:
+        """Return the number of closed hours waiting to be imported."""
+        return self._completed_hours
+
+    def add_sample(self, when: datetime, data) -> bool:
+        """Add one poll result; return True if an hour bucket was closed."""
+        hour_start = when.replace(minute=0, second=0, microsecond=0)
+        closed = False
+        if self._hour_start is not None and hour_start != self._hour_start:
+            self._close_hour()
+            closed = True
+        self._hour_start = hour_start
+
+        for key in (*MEAN_STATISTICS, *SUM_STATISTICS):
+            value = data.get(key)
+            if value is None:
+                continue
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                self._buckets[key] = _HourBucket(float(value))
+            else:
+                bucket.add(float(value))
+        return closed
+
+    def _close_hour(self) -> None:
+        """Move the current hour buckets to the completed rows."""
+        if self._buckets:
+            self._completed_hours += 1
+        for key, bucket in self._buckets.items():
+            row: StatisticData = {"start": self._hour_start}
+            if key in MEAN_STATISTICS:
+                row["mean"] = bucket.total / bucket.count
+                row["min"] = bucket.min
+                row["max"] = bucket.max
+            else:
+                row["state"] = bucket.last
+            self._completed.setdefault(key, []).append(row)
+        self._buckets = {}
+
+    def as_storage(self) -> dict:
+        """Return the open hour in the form written to storage."""
+        return {
+            "hour_start": self._hour_start.isoformat() if self._hour_start else None,
+            "buckets": {key: bucket.as_storage() for key, bucket in self._buckets.items()},
+        }
+
+    def load_storage(self, data: dict) -> None:
+        """Restore an open hour written by as_storage, before the first sample.
+
+        An hour that has ended since is closed by the next sample, as usual.
+        """
+        if self._hour_start is not None or not data.get("hour_start"):
+            return
+        self._hour_start = datetime.fromisoformat(data["hour_start"])
+        self._buckets = {
+            key: _HourBucket.from_storage(stored)
+            for key, stored in data.get("buckets", {}).items()
+            if key in MEAN_STATISTICS or key in SUM_STATISTICS
+        }
+
+    def has_sum_base(self, key: str) -> bool:
+        """Return True if the running sum for a counter key is known."""
+        return key in self._sum_bases
+
+    def seed_sum(self, key: str, state: float | None, total: float | None) -> None:
+        """Seed the running sum of a counter key from previously imported rows."""
+        if state is None or total is None:
+            return
+        self._sum_bases[key] = (state, total)
+
+    def pop_completed(self) -> dict[str, list[StatisticData]]:
+        """Return and clear completed rows, filling in running sums for counters."""
+        completed = self._completed
+        self._completed = {}
+        self._completed_hours = 0
+
+        for key, rows in completed.items():
+            if key not in SUM_STATISTICS:
+                continue
+            last_state, last_sum = self._sum_bases.get(key, (rows[0]["state"], 0.0))
+            for row in rows:
+                delta = row["state"] - last_state
+                # A counter that goes backwards was reset or replaced; rebase on it
+                if delta > 0:
+                    last_sum += delta
+                last_state = row["state"]
+                row["sum"] = last_sum
+            self._sum_bases[key] = (last_state, last_sum)
+        return completed
+
+
+def statistic_id_for(object_prefix: str, key: str) -> str:
+    """Return the external statistic ID for a data key."""
+    return f"{DOMAIN}:{object_prefix}_{key}".lower()
+
+
+async def async_import_statistics(
+    hass: HomeAssistant,
+    aggregator: EversolarStatisticsAggregator,
+    object_prefix: str,
+    name_prefix: str,
+) -> None:
+    """Push completed hourly rows to the recorder as external statistics."""
+    for key in SUM_STATISTICS:
+        if aggregator.has_sum_base(key):
+            continue
+        statistic_id = statistic_id_for(object_prefix, key)
+        last = await get_instance(hass).async_add_executor_job(
+            get_last_statistics, hass, 1, statistic_id, True, {"state", "sum"}
+        )
+        if last.get(statistic_id):
+            row = last[statistic_id][0]
+            aggregator.seed_sum(key, row.get("state"), row.get("sum"))
+
+    for key, rows in aggregator.pop_completed().items():
+        has_mean = key in MEAN_STATISTICS
+        name, unit, unit_class = MEAN_STATISTICS[key] if has_mean else SUM_STATISTICS[key]
+
+        metadata: StatisticMetaData = {
+            "has_sum": not has_mean,
+            "name": f"{name_prefix} {name}",
+            "source": DOMAIN,
+            "statistic_id": statistic_id_for(object_prefix, key),
+            "unit_class": unit_class,
+            "unit_of_measurement": unit,
+        }
+        if StatisticMeanType is not None:
+            metadata["mean_type"] = StatisticMeanType.ARITHMETIC if has_mean else StatisticMeanType.NONE
+        else:
+            metadata["has_mean"] = has_mean
+        async_add_external_statistics(hass, metadata, rows)
+        _LOGGER.debug(
+            "Imported %d hourly statistics rows for %s", len(rows), metadata["statistic_id"]
+        )
+
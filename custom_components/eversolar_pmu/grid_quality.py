@@ -0,0 +1,266 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Streaming grid voltage and frequency quality statistics.
+
+Each poll updates, per metric and local day, P² estimators of the 1st, 50th
+and 99th percentiles, a fixed-bin histogram, min/max/mean and the time spent
+outside the configured limits. Memory per day is constant whatever the poll
+rate; closed days are kept as compact summaries.
+"""
+from datetime import date, datetime
+
+METRIC_VOLTAGE = "vac_v"
+METRIC_FREQUENCY = "fac_hz"
+
+QUANTILES = (0.01, 0.5, 0.99)
+QUANTILE_NAMES = ("p1", "p50", "p99")
+# Scalar fields of a day summary, in output order
+SUMMARY_FIELDS = QUANTILE_NAMES + ("min", "max", "mean", "samples", "outside_limits_s")
+
+# Histogram layout per metric: (lower edge, bin width, bin count); values
+# below or above the range are counted in an extra first and last bin
+HISTOGRAMS = {
+    METRIC_VOLTAGE: (200.0, 1.0, 60),
+    METRIC_FREQUENCY: (49.5, 0.02, 50),
+}
+METRICS = tuple(HISTOGRAMS)
+
+# Days of summaries kept in storage
+MAX_DAYS = 400
+# Longest gap between two polls attributed to the later one; longer gaps
+# (outages, restarts) count as this much
+MAX_SAMPLE_GAP = 300
+
+
+class P2Quantile:
+    """P² estimator of one quantile (Jain and Chlamtac, 1985).
+
+    Five markers track the minimum, the quantile, the maximum and two points
+    between them; each observation moves them by at most one position with
+    a parabolic (or linear) height adjustment. Constant memory and time.
+    """
+
+    __slots__ = ("p", "count", "heights", "positions", "desired", "_increments")
+
+    def __init__(self, p: float) -> None:
+        """Initialize an estimator of quantile p (0 < p < 1)."""
+        self.p = p
+        self.count = 0
+        self.heights: list = []
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self._increments = (0.0, p / 2, p, (1 + p) / 2, 1.0)
+
+    def add(self, x: float) -> None:
+        """Add one observation."""
+        self.count += 1
+        q = self.heights
+        if self.count <= 5:
+            q.append(x)
+            q.sort()
+            return
+
+        n = self.positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self._increments[i]
+
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                height = q[i] + step / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < height < q[i + 1]:
+                    # Parabola overshoots a neighbour; move linearly instead
+                    height = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = height
+                n[i] += step
+
+    @property
+    def value(self) -> float | None:
+        """Return the current estimate, or None before the first observation."""
+        if not self.heights:
+            return None
+        if self.count <= 5:
+            # Nearest rank of the few observations seen so far
+            return self.heights[min(int(self.p * self.count), self.count - 1)]
+        return self.heights[2]
+
+    def as_storage(self) -> list:
+        """Return the compact form written to storage."""
+        return [self.count, self.heights, self.positions, self.desired]
+
+    def load_storage(self, data: list) -> None:
+        """Restore state written by as_storage."""
+        self.count, heights, positions, desired = data
+        self.heights = list(heights)
+        self.positions = list(positions)
+        self.desired = list(desired)
+
+
+class MetricDay:
+    """Statistics of one metric over one day."""
+
+    __slots__ = ("metric", "quantiles", "minimum", "maximum", "total", "samples", "outside_s", "histogram")
+
+    def __init__(self, metric: str) -> None:
+        """Initialize empty statistics."""
+        self.metric = metric
+        self.quantiles = [P2Quantile(p) for p in QUANTILES]
+        self.minimum: float | None = None
+        self.maximum: float | None = None
+        self.total = 0.0
+        self.samples = 0
+        self.outside_s = 0.0
+        self.histogram = [0] * (HISTOGRAMS[metric][2] + 2)
+
+    def add(self, value: float, gap: float, limits: tuple) -> None:
+        """Add one sample that stands for the gap seconds before it."""
+        for estimator in self.quantiles:
+            estimator.add(value)
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self.total += value
+        self.samples += 1
+        low, high = limits
+        if value < low or value > high:
+            self.outside_s += gap
+
+        lower, width, bins = HISTOGRAMS[self.metric]
+        index = int((value - lower) // width) + 1
+        self.histogram[min(max(index, 0), bins + 1)] += 1
+
+    def field(self, name: str):
+        """Return one scalar field of the summary without building the rest."""
+        if name == "samples":
+            return self.samples
+        if name == "outside_limits_s":
+            return round(self.outside_s)
+        if name in QUANTILE_NAMES:
+            value = self.quantiles[QUANTILE_NAMES.index(name)].value
+        elif name == "min":
+            value = self.minimum
+        elif name == "max":
+            value = self.maximum
+        elif name == "mean":
+            value = self.total / self.samples if self.samples else None
+        else:
+            raise KeyError(name)
+        return None if value is None else round(value, 3 if self.metric == METRIC_FREQUENCY else 1)
+
+    def summary(self) -> dict:
+        """Return a JSON-friendly summary."""
+        lower, width, _bins = HISTOGRAMS[self.metric]
+        out = {name: self.field(name) for name in SUMMARY_FIELDS}
+        out["histogram"] = {"lower": lower, "width": width, "counts": list(self.histogram)}
+        return out
+
+    def as_storage(self) -> list:
+        """Return the compact form written to storage."""
+        return [
+            [estimator.as_storage() for estimator in self.quantiles],
+            self.minimum,
+            self.maximum,
+            self.total,
+            self.samples,
+            self.outside_s,
+            self.histogram,
+        ]
+
+    def load_storage(self, data: list) -> None:
+        """Restore state written by as_storage."""
+        quantiles, self.minimum, self.maximum, self.total, self.samples, self.outside_s, histogram = data
+        for estimator, stored in zip(self.quantiles, quantiles):
+            estimator.load_storage(stored)
+        if len(histogram) == len(self.histogram):
+            self.histogram = list(histogram)
+
+
+class GridQuality:
+    """Per-day AC voltage and frequency distributions of one inverter."""
+
+    def __init__(self, limits: dict) -> None:
+        """Initialize with limits: metric -> (low, high)."""
+        self.limits = dict(limits)
+        self._day: str | None = None
+        self._today = {metric: MetricDay(metric) for metric in METRICS}
+        self._days: dict = {}
+        self._last_timestamp: float | None = None
+
+    def add_sample(self, when: datetime, values: dict) -> None:
+        """Add one poll taken at local time when; values maps metric -> value or None."""
+        day = when.strftime("%Y-%m-%d")
+        if day != self._day:
+            self._close_day()
+            self._day = day
+
+        timestamp = when.timestamp()
+        gap = 0.0
+        if self._last_timestamp is not None:
+            gap = min(max(timestamp - self._last_timestamp, 0.0), MAX_SAMPLE_GAP)
+        self._last_timestamp = timestamp
+
+        for metric in METRICS:
+            value = values.get(metric)
+            # The PMU reports zero while the inverter is not measuring the grid
+            if value:
+                self._today[metric].add(value, gap, self.limits[metric])
+
+    def _close_day(self) -> None:
+        """Move the current day into the summaries and start a new one."""
+        if self._day is not None and any(day.samples for day in self._today.values()):
+            self._days[self._day] = {metric: day.summary() for metric, day in self._today.items()}
+            while len(self._days) > MAX_DAYS:
+                del self._days[min(self._days)]
+        self._today = {metric: MetricDay(metric) for metric in METRICS}
+
+    def today(self, metric: str) -> MetricDay:
+        """Return the statistics of a metric for the current day."""
+        return self._today[metric]
+
+    def range(self, start: date | None = None, end: date | None = None) -> list:
+        """Return daily summaries from start to end inclusive, oldest first, including today."""
+        first = start.strftime("%Y-%m-%d") if start else None
+        last = end.strftime("%Y-%m-%d") if end else None
+        days = dict(self._days)
+        if self._day is not None and any(day.samples for day in self._today.values()):
+            days[self._day] = {metric: day.summary() for metric, day in self._today.items()}
+        return [
+            {"date": key, **summary}
+            for key, summary in sorted(days.items())
+            if (first is None or key >= first) and (last is None or key <= last)
+        ]
+
+    def as_storage(self) -> dict:
+        """Return the compact form written to storage."""
+        return {
+            "day": self._day,
+            "last_timestamp": self._last_timestamp,
+            "today": {metric: day.as_storage() for metric, day in self._today.items()},
+            "days": self._days,
+        }
+
+    def load_storage(self, data: dict) -> None:
+        """Restore state written by as_storage."""
+        self._day = data.get("day")
+        self._last_timestamp = data.get("last_timestamp")
+        for metric, stored in data.get("today", {}).items():
+            if metric in self._today:
+                self._today[metric].load_storage(stored)
+        self._days = dict(data.get("days", {}))
@@ -0,0 +1,102 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Live poll values for websocket subscribers.
+
+Subscribers receive compact messages of the fields they asked for, at most
+once per their interval. Nothing here touches entity states or the recorder.
+This module has no Home Assistant dependency.
+"""
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# Scalar poll values a subscription may select
+LIVE_FIELDS = (
+    "power_w", "vac_v", "fac_hz", "e_today_kwh", "e_total_kwh", "h_total_hours",
+    "mode", "pv_v", "pv_a", "pv_w_est", "error_flags", "time_delta",
+)
+DEFAULT_LIVE_FIELDS = ("power_w", "pv_w_est", "pv_v", "pv_a", "vac_v", "fac_hz", "mode")
+
+# Fastest rate a subscription may ask for
+MIN_LIVE_INTERVAL = 1.0
+
+
+def live_message(timestamp: float, data, fields: tuple) -> dict:
+    """Return the compact message for a poll: time and values in field order."""
+    return {"t": round(timestamp, 3), "v": [data.get(field) for field in fields]}
+
+
+class LiveSubscription:
+    """One subscriber: a send callable, its fields and its minimum interval."""
+
+    __slots__ = ("send", "fields", "interval", "last_sent")
+
+    def __init__(self, send, fields: tuple, interval: float | None) -> None:
+        """Initialize subscription; interval None follows the scan interval."""
+        self.send = send
+        self.fields = fields
+        self.interval = interval
+        self.last_sent: float | None = None
+
+
+class LiveFeed:
+    """Fan poll results out to subscribers, rate limited per subscription."""
+
+    def __init__(self) -> None:
+        """Initialize with no subscribers."""
+        self._subscriptions: list = []
+
+        # Counters
+        self.messages_sent = 0
+
+    @property
+    def subscribers(self) -> int:
+        """Return the number of subscriptions."""
+        return len(self._subscriptions)
+
+    @property
+    def min_interval(self) -> float | None:
+        """Return the shortest interval asked for, or None if none asks for one."""
+        intervals = [sub.interval for sub in self._subscriptions if sub.interval is not None]
+        return min(intervals) if intervals else None
+
+    def add(self, send, fields: tuple, interval: float | None = None):
+        """Add a subscription; return a callable that removes it."""
+        subscription = LiveSubscription(send, fields, interval)
+        self._subscriptions.append(subscription)
+
+        def _remove() -> None:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+        return _remove
+
+    def clear(self) -> None:
+        """Drop all subscriptions."""
+        self._subscriptions.clear()
+
+    def publish(self, now: float, timestamp: float, data) -> int:
+        """Send a poll taken at unix time timestamp to every subscription that is due.
+
+        now is a monotonic time; returns the number of messages sent.
+        """
+        sent = 0
+        for subscription in list(self._subscriptions):
+            if (
+                subscription.interval is not None
+                and subscription.last_sent is not None
+                # Allow some jitter so a 1 s poll loop is not halved to 0.5 Hz
+                and now - subscription.last_sent < subscription.interval * 0.9
+            ):
+                continue
+            subscription.last_sent = now
+            try:
+                subscription.send(live_message(timestamp, data, subscription.fields))
+            except Exception:  # One bad subscriber must not stop the others
+                _LOGGER.exception("Error sending live values")
+                continue
+            sent += 1
+        self.messages_sent += sent
+        return sent
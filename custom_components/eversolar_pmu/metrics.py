@@ -0,0 +1,202 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Prometheus metrics endpoint for Eversolar PMU."""
+import logging
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, ERROR_MESSAGES
+from .coordinator import EversolarDataUpdateCoordinator
+from .eversolar_protocol import CODE_NAMES
+
+_LOGGER = logging.getLogger(__name__)
+
+METRICS_URL = f"/api/{DOMAIN}/metrics"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Scaled poll values: data key -> (metric name, help text)
+VALUE_METRICS = {
+    "power_w": ("eversolar_pmu_ac_power_watts", "AC output power"),
+    "vac_v": ("eversolar_pmu_ac_voltage_volts", "AC output voltage"),
+    "fac_hz": ("eversolar_pmu_ac_frequency_hertz", "Grid frequency"),
+    "e_today_kwh": ("eversolar_pmu_energy_today_kwh", "Energy produced today"),
+    "e_total_kwh": ("eversolar_pmu_energy_total_kwh", "Lifetime energy produced"),
+    "h_total_hours": ("eversolar_pmu_operation_hours", "Lifetime operation hours"),
+    "pv_v": ("eversolar_pmu_pv_voltage_volts", "PV string voltage"),
+    "pv_a": ("eversolar_pmu_pv_current_amperes", "PV string current"),
+    "pv_w_est": ("eversolar_pmu_pv_power_watts", "Estimated PV power"),
+    "mode": ("eversolar_pmu_operation_mode", "Inverter operation mode (0=Wait, 1=Normal, 2=Fault, 3=Permanent Fault)"),
+    "error_flags": ("eversolar_pmu_error_flags", "Raw 32-bit error flag word"),
+    "time_delta": ("eversolar_pmu_clock_offset_seconds", "PMU clock minus host clock"),
+}
+
+# Families in exposition order: name -> (type, help text)
+FAMILIES = {
+    **{name: ("gauge", help_text) for name, help_text in VALUE_METRICS.values()},
+    "eversolar_pmu_register_raw": ("gauge", "Raw uint16 register value from the 0x14 response"),
+    "eversolar_pmu_error_active": ("gauge", "1 if the error bit is set"),
+    "eversolar_pmu_up": ("gauge", "1 if the last poll succeeded"),
+    "eversolar_pmu_polls_total": ("counter", "Poll attempts"),
+    "eversolar_pmu_poll_failures_total": ("counter", "Failed poll attempts"),
+    "eversolar_pmu_poll_consecutive_failures": ("gauge", "Failed polls since the last success"),
+    "eversolar_pmu_poll_duration_seconds": ("gauge", "Duration of the last poll"),
+    "eversolar_pmu_last_success_timestamp_seconds": ("gauge", "Unix time of the last successful poll"),
+    "eversolar_pmu_frame_resyncs_total": ("counter", "Framing errors recovered by scanning for the next sync word"),
+    "eversolar_pmu_frame_discarded_bytes_total": ("counter", "Bytes skipped while resynchronising"),
+    "eversolar_pmu_bad_frames_total": ("counter", "Frames dropped for a bad CRC or length"),
+    "eversolar_pmu_request_retries_total": ("counter", "Requests re-sent within a session after a lost response"),
+    "eversolar_pmu_stale_frames_total": ("counter", "Late or duplicate responses skipped"),
+    "eversolar_pmu_rtt_seconds": ("gauge", "Smoothed round-trip time per request command"),
+    "eversolar_pmu_rtt_variance_seconds": ("gauge", "Smoothed mean deviation of the round-trip time per request command"),
+    "eversolar_pmu_request_timeout_seconds": ("gauge", "Adaptive timeout of a re-sendable request per command"),
+    "eversolar_pmu_queue_operations_total": ("counter", "Protocol operations run through the per-PMU queue"),
+    "eversolar_pmu_polls_coalesced_total": ("counter", "Poll requests merged into an already queued poll"),
+    "eversolar_pmu_polls_skipped_total": ("counter", "Scheduled polls skipped because a poll was still running"),
+}
+
+_HEADERS = {
+    name: f"# HELP {name} {help_text}\n# TYPE {name} {metric_type}\n".encode()
+    for name, (metric_type, help_text) in FAMILIES.items()
+}
+
+
+def _escape_label(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value) -> str:
+    """Format a sample value."""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _collector(coordinator: EversolarDataUpdateCoordinator, lines: dict):
+    """Return an add(name, value, labels) function appending to lines."""
+    inverter = _escape_label(coordinator.inverter_id or coordinator.config_entry.entry_id)
+    base = f'inverter_id="{inverter}",host="{_escape_label(coordinator.pmu.host)}"'
+
+    def add(name: str, value, labels: str = "") -> None:
+        if value is None:
+            return
+        label_str = f"{base},{labels}" if labels else base
+        lines.setdefault(name, []).append(f"{name}{{{label_str}}} {_format_value(value)}\n")
+
+    return add
+
+
+def render_poll(coordinator: EversolarDataUpdateCoordinator) -> dict:
+    """Render the samples taken from the last poll result as family name -> encoded lines."""
+    lines: dict = {}
+    add = _collector(coordinator, lines)
+
+    data = coordinator.data
+    error_flags = None
+    if data is not None:
+        for key, (name, _help) in VALUE_METRICS.items():
+            add(name, data.get(key))
+        for code, value in data.iter_registers():
+            add("eversolar_pmu_register_raw", value, f'code="{CODE_NAMES[code]}"')
+        error_flags = data.error_flags
+
+    if error_flags is not None:
+        for bit_pos, error_name in ERROR_MESSAGES.items():
+            add(
+                "eversolar_pmu_error_active",
+                (error_flags >> bit_pos) & 1,
+                f'bit="{bit_pos}",error="{_escape_label(error_name)}"',
+            )
+
+    return {name: "".join(family).encode() for name, family in lines.items()}
+
+
+def render_counters(coordinator: EversolarDataUpdateCoordinator) -> dict:
+    """Render health, protocol and queue samples as family name -> encoded lines.
+
+    These change between polls (failures, retries, live polls, time syncs),
+    so they are rendered on every scrape.
+    """
+    lines: dict = {}
+    add = _collector(coordinator, lines)
+
+    add("eversolar_pmu_up", coordinator.last_update_success)
+    add("eversolar_pmu_polls_total", coordinator.polls_total)
+    add("eversolar_pmu_poll_failures_total", coordinator.poll_failures_total)
+    add("eversolar_pmu_poll_consecutive_failures", coordinator.consecutive_failures)
+    add("eversolar_pmu_poll_duration_seconds", coordinator.last_poll_duration)
+    if coordinator.last_success_time is not None:
+        add("eversolar_pmu_last_success_timestamp_seconds", coordinator.last_success_time.timestamp())
+    add("eversolar_pmu_frame_resyncs_total", coordinator.pmu.resyncs)
+    add("eversolar_pmu_frame_discarded_bytes_total", coordinator.pmu.discarded_bytes)
+    add("eversolar_pmu_bad_frames_total", coordinator.pmu.bad_frames)
+    add("eversolar_pmu_request_retries_total", coordinator.pmu.request_retries)
+    add("eversolar_pmu_stale_frames_total", coordinator.pmu.stale_frames)
+    for cmd, rtt in coordinator.pmu.rtt.items():
+        command = f'command="{CODE_NAMES[cmd]}"'
+        add("eversolar_pmu_rtt_seconds", rtt.srtt, command)
+        add("eversolar_pmu_rtt_variance_seconds", rtt.rttvar, command)
+        add("eversolar_pmu_request_timeout_seconds", rtt.timeout(coordinator.pmu.timeout), command)
+    add("eversolar_pmu_queue_operations_total", coordinator.request_queue.operations)
+    add("eversolar_pmu_polls_coalesced_total", coordinator.request_queue.polls_coalesced)
+    add("eversolar_pmu_polls_skipped_total", coordinator.request_queue.polls_skipped)
+
+    return {name: "".join(family).encode() for name, family in lines.items()}
+
+
+class EversolarMetricsView(HomeAssistantView):
+    """Serve all configured inverters in Prometheus exposition format.
+
+    The samples taken from each coordinator's poll result are rendered once
+    per result and cached by family; the few health and protocol counters are
+    rendered on every scrape.
+    """
+
+    url = METRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize view."""
+        self.hass = hass
+        # entry_id -> (poll result the fragment was rendered from, fragment)
+        self._fragments: dict = {}
+
+    def _render(self) -> bytes:
+        """Return the exposition body, reusing cached poll fragments."""
+        coordinators = [
+            coord
+            for coord in self.hass.data.get(DOMAIN, {}).values()
+            if isinstance(coord, EversolarDataUpdateCoordinator)
+        ]
+
+        fragments = {}
+        rendered = []
+        for coord in coordinators:
+            entry_id = coord.config_entry.entry_id
+            cached = self._fragments.get(entry_id)
+            # coordinator.data is replaced only once a poll has succeeded
+            if cached is None or cached[0] is not coord.data:
+                cached = (coord.data, render_poll(coord))
+            fragments[entry_id] = cached
+            rendered.append(cached[1])
+            rendered.append(render_counters(coord))
+        self._fragments = fragments
+
+        parts = []
+        for name, header in _HEADERS.items():
+            family = [frag[name] for frag in rendered if name in frag]
+            if family:
+                parts.append(header)
+                parts.extend(family)
+        return b"".join(parts)
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Handle a scrape."""
+        return web.Response(body=self._render(), headers={"Content-Type": CONTENT_TYPE})
@@ -0,0 +1,114 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Streaming time-of-day performance baseline."""
+from datetime import datetime
+
+BUCKET_MINUTES = 5
+BUCKETS = 24 * 60 // BUCKET_MINUTES
+
+# Weight of a new sample in its time-of-day baseline once warmed up
+DEFAULT_ALPHA = 0.02
+# Samples a bucket needs before its baseline is compared against
+MIN_BUCKET_SAMPLES = 15
+# Buckets whose PV power baseline is below this share of the highest one (dawn
+# and dusk, where output changes steeply within a bucket) are only learned
+MIN_COMPARE_FRACTION = 0.2
+# Weight of a new ratio in the smoothed ratios used for detection
+SMOOTHING_ALPHA = 0.2
+# PV power below this is night or dawn; nothing is learned or compared
+MIN_PV_W = 50
+
+METRIC_PV_POWER = "pv_power"
+METRIC_PV_VOLTAGE = "pv_voltage"
+METRIC_PV_CURRENT = "pv_current"
+METRIC_CONVERSION = "conversion"
+METRICS = (METRIC_PV_POWER, METRIC_PV_VOLTAGE, METRIC_PV_CURRENT, METRIC_CONVERSION)
+
+# Bucket layout: [samples, one baseline per metric in METRICS order]
+_SAMPLES = 0
+
+
+class PerformanceBaseline:
+    """EWMA baselines of PV power, voltage, current and AC/DC conversion by time of day.
+
+    Each sample is first compared with the baseline of its 5-minute
+    time-of-day bucket, then folded into it, so a poll costs the same however
+    long the model has run. Ratios of actual to baseline are smoothed before
+    they are reported, so a single noisy sample does not count as a deviation.
+    """
+
+    def __init__(self, alpha: float = DEFAULT_ALPHA) -> None:
+        """Initialize empty baselines."""
+        self.alpha = alpha
+        self._buckets: list = [[0, 0.0, 0.0, 0.0, 0.0] for _ in range(BUCKETS)]
+        self._smoothed: dict = {}
+        self.expected_pv_w: float | None = None
+        self._peak_pv_w = 0.0
+
+    @property
+    def ratios(self) -> dict | None:
+        """Return the smoothed actual/baseline ratio per metric, or None."""
+        return dict(self._smoothed) if self._smoothed else None
+
+    def add_sample(
+        self,
+        when: datetime,
+        pv_w: float | None,
+        pv_v: float | None,
+        pv_a: float | None,
+        power_w: float | None,
+    ) -> dict | None:
+        """Add one poll taken at local time when; return the smoothed ratios."""
+        if pv_w is None or pv_v is None or pv_a is None or power_w is None or pv_w < MIN_PV_W:
+            # Start the next production period with fresh smoothing
+            self._smoothed = {}
+            self.expected_pv_w = None
+            return None
+
+        bucket = self._buckets[(when.hour * 60 + when.minute) // BUCKET_MINUTES]
+        values = (pv_w, pv_v, pv_a, power_w / pv_w)
+
+        if (
+            bucket[_SAMPLES] >= MIN_BUCKET_SAMPLES
+            and bucket[1] >= MIN_COMPARE_FRACTION * self._peak_pv_w
+        ):
+            self.expected_pv_w = bucket[1]
+            for i, metric in enumerate(METRICS, start=1):
+                if not bucket[i]:
+                    continue
+                ratio = values[i - 1] / bucket[i]
+                previous = self._smoothed.get(metric)
+                self._smoothed[metric] = (
+                    ratio if previous is None else previous + SMOOTHING_ALPHA * (ratio - previous)
+                )
+        else:
+            self.expected_pv_w = None
+
+        # Plain average while warming up, then an exponential moving average
+        bucket[_SAMPLES] += 1
+        weight = max(self.alpha, 1.0 / bucket[_SAMPLES])
+        for i, value in enumerate(values, start=1):
+            bucket[i] += weight * (value - bucket[i])
+        self._peak_pv_w = max(self._peak_pv_w, bucket[1])
+
+        return self.ratios
+
+    def as_storage(self) -> dict:
+        """Return the compact form written to storage."""
+        return {
+            "bucket_minutes": BUCKET_MINUTES,
+            "buckets": [
+                [b[_SAMPLES], round(b[1], 1), round(b[2], 2), round(b[3], 3), round(b[4], 4)]
+                for b in self._buckets
+            ],
+        }
+
+    def load_storage(self, data: dict) -> None:
+        """Restore baselines written by as_storage; ignore an incompatible layout."""
+        buckets = data.get("buckets")
+        if data.get("bucket_minutes") != BUCKET_MINUTES or not buckets or len(buckets) != BUCKETS:
+            return
+        self._buckets = [list(b) for b in buckets]
+        self._peak_pv_w = max(b[1] for b in self._buckets)
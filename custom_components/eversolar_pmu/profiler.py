@@ -0,0 +1,163 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""On-demand cProfile and tracemalloc capture of the polling path."""
+import cProfile
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_POLLS = 5
+MAX_PROFILE_POLLS = 100
+TRACEMALLOC_FRAMES = 10
+REPORT_TOP = 25
+SUMMARY_TOP = 5
+
+
+def _func_label(func: tuple) -> str:
+    """Format a pstats function key as file:line(name)."""
+    filename, line, name = func
+    return f"{os.path.basename(filename)}:{line}({name})" if line else name
+
+
+class PollProfiler:
+    """Profile the next N polls of one coordinator.
+
+    The event-loop side of each refresh (update handling and the entity updates
+    it triggers) runs under one profiler, which is paused while the blocking PMU
+    exchange runs in the executor; that exchange gets its own profiler in the
+    worker thread. Both are merged when the reports are written. Allocations
+    are measured with tracemalloc between the start of the first profiled poll
+    and the end of the last.
+    """
+
+    def __init__(self, polls: int = DEFAULT_PROFILE_POLLS) -> None:
+        """Initialize profiler."""
+        self.polls = polls
+        self.completed = 0
+        self.wall_time = 0.0
+        self.active = False
+        self._loop_profile = cProfile.Profile()
+        self._thread_profiles: list = []
+        self._started_tracemalloc = False
+        self._snapshot_start: tracemalloc.Snapshot | None = None
+        self._snapshot_end: tracemalloc.Snapshot | None = None
+        self._poll_started = 0.0
+        self.skipped_exchanges = 0
+
+    def begin(self) -> None:
+        """Start profiling one poll."""
+        if self._snapshot_start is None:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                self._started_tracemalloc = True
+            self._snapshot_start = tracemalloc.take_snapshot()
+        self._poll_started = time.perf_counter()
+        self.active = True
+        self.resume()
+
+    def end(self) -> bool:
+        """Stop profiling one poll; return True once N polls are done."""
+        self.pause()
+        self.active = False
+        self.wall_time += time.perf_counter() - self._poll_started
+        self.completed += 1
+        return self.completed >= self.polls
+
+    def pause(self) -> None:
+        """Pause the event-loop profiler."""
+        if self.active:
+            self._loop_profile.disable()
+
+    def resume(self) -> None:
+        """Resume the event-loop profiler."""
+        if self.active:
+            try:
+                self._loop_profile.enable()
+            except ValueError:
+                # Another profiler owns the interpreter (Python 3.12+)
+                self.active = False
+
+    def run_profiled(self, func, *args):
+        """Run a blocking call under its own profiler (executor thread)."""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            self.skipped_exchanges += 1
+            return func(*args)
+        try:
+            return func(*args)
+        finally:
+            profile.disable()
+            self._thread_profiles.append(profile)
+
+    def stop(self) -> None:
+        """Stop all collection."""
+        self.pause()
+        self.active = False
+        if self._snapshot_start is not None and self._snapshot_end is None:
+            self._snapshot_end = tracemalloc.take_snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def write_reports(self, directory: str, basename: str) -> dict:
+        """Write the pstats file and allocation report; return a summary.
+
+        This performs blocking I/O and must run outside the event loop.
+        """
+        self.stop()
+        stats = pstats.Stats()
+        for profile in (self._loop_profile, *self._thread_profiles):
+            if profile.getstats():  # pstats rejects a profile that saw no calls
+                stats.add(profile)
+
+        pstats_path = os.path.join(directory, f"{basename}.pstats")
+        stats.dump_stats(pstats_path)
+
+        top_functions = []
+        for func, (_cc, ncalls, _tt, cumtime, _callers) in sorted(
+            stats.stats.items(), key=lambda item: item[1][3], reverse=True
+        )[:SUMMARY_TOP]:
+            top_functions.append(
+                {"function": _func_label(func), "calls": ncalls, "cumulative_s": round(cumtime, 6)}
+            )
+
+        top_allocations = []
+        alloc_path = os.path.join(directory, f"{basename}_allocations.txt")
+        with open(alloc_path, "w", encoding="utf-8") as f:
+            f.write(f"Top {REPORT_TOP} allocation changes over {self.completed} polls\n\n")
+            if self._snapshot_start is not None and self._snapshot_end is not None:
+                filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+                diff = self._snapshot_end.filter_traces(filters).compare_to(
+                    self._snapshot_start.filter_traces(filters), "lineno"
+                )
+                for stat in diff[:REPORT_TOP]:
+                    f.write(f"{stat}\n")
+                for stat in diff[:SUMMARY_TOP]:
+                    frame = stat.traceback[0]
+                    top_allocations.append(
+                        {
+                            "location": f"{frame.filename}:{frame.lineno}",
+                            "size_diff_kib": round(stat.size_diff / 1024, 1),
+                            "count_diff": stat.count_diff,
+                        }
+                    )
+
+        _LOGGER.info("Wrote poll profile to %s and %s", pstats_path, alloc_path)
+        return {
+            "polls": self.completed,
+            "wall_time_s": round(self.wall_time, 3),
+            "profiled_time_s": round(stats.total_tt, 3),
+            "skipped_exchanges": self.skipped_exchanges,
+            "pstats_file": pstats_path,
+            "allocations_file": alloc_path,
+            "top_functions": top_functions,
+            "top_allocations": top_allocations,
+        }
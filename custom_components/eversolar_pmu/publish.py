@@ -0,0 +1,51 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Minimum publish intervals for slow-moving entities."""
+
+
+def significant_change(old, new, fraction: float) -> bool:
+    """Return True if new differs from old by at least fraction of old.
+
+    Non-numeric values (operation mode, error text) count any change as
+    significant, as does any change away from zero.
+    """
+    if old == new:
+        return False
+    numeric = (int, float)
+    if (
+        isinstance(old, numeric) and isinstance(new, numeric)
+        and not isinstance(old, bool) and not isinstance(new, bool)
+    ):
+        return abs(new - old) >= fraction * abs(old)
+    return True
+
+
+class PublishThrottle:
+    """Decide whether an entity's state should be written on this poll.
+
+    A state is written when the interval has passed since the last write, the
+    value changed significantly, or availability changed. The interval and
+    threshold are passed on every call so option changes apply immediately.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with nothing published yet."""
+        self._time: float | None = None
+        self._value = None
+        self._available: bool | None = None
+
+    def due(self, now: float, value, available: bool, interval: float, change: float) -> bool:
+        """Return True, and remember the state, if it should be written now."""
+        if not (
+            self._time is None
+            or available != self._available
+            or now - self._time >= interval
+            or significant_change(self._value, value, change)
+        ):
+            return False
+        self._time = now
+        self._value = value
+        self._available = available
+        return True
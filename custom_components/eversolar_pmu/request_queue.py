@@ -0,0 +1,120 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Per-PMU serialization of protocol operations."""
+import asyncio
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import DATA_REQUEST_QUEUES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _retrieve(future: asyncio.Future) -> None:
+    """Mark a shared future's exception as retrieved when nobody joined it."""
+    if not future.cancelled():
+        future.exception()
+
+
+class PMURequestQueue:
+    """Run protocol operations against one PMU one at a time.
+
+    PMUs handle concurrent clients poorly, so every operation that opens a
+    connection (polls, time syncs, connection tests) waits its turn in FIFO
+    order. Polls are coalesced: a poll requested while another is waiting
+    joins the waiting one, and a scheduled poll that arrives while a poll is
+    running joins the running one instead of queueing behind it.
+    """
+
+    def __init__(self, host: str, port: int) -> None:
+        """Initialize queue."""
+        self.host = host
+        self.port = port
+        self._lock = asyncio.Lock()
+        self._running_poll: asyncio.Future | None = None
+        self._pending_poll: asyncio.Future | None = None
+        # Holders that got the queue from async_get_request_queue and have not released it
+        self.users = 0
+
+        # Counters
+        self.operations = 0
+        self.polls_coalesced = 0
+        self.polls_skipped = 0
+
+    @property
+    def busy(self) -> bool:
+        """Return True while an operation holds the PMU."""
+        return self._lock.locked()
+
+    async def async_run(self, func, *args):
+        """Await func(*args) once no other operation holds the PMU."""
+        async with self._lock:
+            self.operations += 1
+            return await func(*args)
+
+    async def async_poll(self, func, *args, scheduled: bool = False):
+        """Run a poll through the queue, joining an equivalent poll if possible."""
+        if scheduled and self._running_poll is not None:
+            self.polls_skipped += 1
+            _LOGGER.debug("Poll of %s still running, skipping scheduled poll", self.host)
+            return await asyncio.shield(self._running_poll)
+        if self._pending_poll is not None:
+            self.polls_coalesced += 1
+            return await asyncio.shield(self._pending_poll)
+
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_retrieve)
+        self._pending_poll = future
+        try:
+            async with self._lock:
+                self._pending_poll = None
+                self._running_poll = future
+                self.operations += 1
+                result = await func(*args)
+        except BaseException as err:
+            if not future.done():
+                if isinstance(err, asyncio.CancelledError):
+                    # Joined callers were not cancelled themselves; fail them instead
+                    future.set_exception(UpdateFailed(f"Poll of {self.host} was cancelled"))
+                else:
+                    future.set_exception(err)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._pending_poll is future:
+                self._pending_poll = None
+            if self._running_poll is future:
+                self._running_poll = None
+
+
+def async_get_request_queue(hass: HomeAssistant, host: str, port: int) -> PMURequestQueue:
+    """Return the shared request queue for a PMU address.
+
+    Every call must be matched by async_release_request_queue.
+    """
+    queues = hass.data.setdefault(DATA_REQUEST_QUEUES, {})
+    queue = queues.get((host, port))
+    if queue is None:
+        queue = queues[(host, port)] = PMURequestQueue(host, port)
+    queue.users += 1
+    return queue
+
+
+async def async_release_request_queue(hass: HomeAssistant, queue: PMURequestQueue) -> None:
+    """Release a request queue, forgetting it once nothing else holds it.
+
+    Waits for operations already queued, so a queue created later for the
+    same address never runs alongside them.
+    """
+    queue.users -= 1
+    async with queue._lock:
+        pass
+    queues = hass.data.get(DATA_REQUEST_QUEUES, {})
+    if not queue.users and queues.get((queue.host, queue.port)) is queue:
+        del queues[(queue.host, queue.port)]
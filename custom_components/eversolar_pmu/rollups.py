@@ -0,0 +1,141 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Incremental daily, monthly and yearly production rollups."""
+from datetime import date, datetime, timezone
+
+PERIOD_DAY = "day"
+PERIOD_MONTH = "month"
+PERIOD_YEAR = "year"
+PERIODS = (PERIOD_DAY, PERIOD_MONTH, PERIOD_YEAR)
+
+# Days kept in storage; months and years are kept indefinitely
+MAX_DAYS = 800
+
+# Larger jumps between two polls mean a counter reset or a replaced inverter,
+# not production; the baseline is re-taken without attributing them
+MAX_ENERGY_STEP_KWH = 100.0
+MAX_HOURS_STEP = 24
+
+# Bucket layout: [energy_kwh, peak_power_w, peak_timestamp, run_hours]
+_ENERGY, _PEAK, _PEAK_TS, _HOURS = range(4)
+
+
+def period_key(period: str, when: date) -> str:
+    """Return the bucket key for a date: YYYY-MM-DD, YYYY-MM or YYYY."""
+    if period == PERIOD_DAY:
+        return when.strftime("%Y-%m-%d")
+    if period == PERIOD_MONTH:
+        return when.strftime("%Y-%m")
+    return when.strftime("%Y")
+
+
+class ProductionRollups:
+    """Per-day, per-month and per-year energy, peak power and run hours.
+
+    Each sample updates three buckets from the deltas of the lifetime energy
+    and hour counters, so the cost per poll does not depend on history length.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty rollups."""
+        self._buckets: dict = {period: {} for period in PERIODS}
+        self._last_energy: float | None = None
+        self._last_hours: int | None = None
+        self._last_day: str | None = None
+
+    def add_sample(
+        self,
+        when: datetime,
+        e_total_kwh: float | None,
+        power_w: int | None,
+        h_total_hours: int | None,
+    ) -> None:
+        """Add one poll taken at local time when."""
+        energy = 0.0
+        if e_total_kwh is not None:
+            if self._last_energy is not None:
+                step = e_total_kwh - self._last_energy
+                if 0.0 < step <= MAX_ENERGY_STEP_KWH:
+                    energy = step
+            self._last_energy = e_total_kwh
+
+        hours = 0
+        if h_total_hours is not None:
+            if self._last_hours is not None:
+                step = h_total_hours - self._last_hours
+                if 0 < step <= MAX_HOURS_STEP:
+                    hours = step
+            self._last_hours = h_total_hours
+
+        timestamp = int(when.timestamp())
+        for period in PERIODS:
+            key = period_key(period, when)
+            bucket = self._buckets[period].get(key)
+            if bucket is None:
+                bucket = self._buckets[period][key] = [0.0, 0, None, 0]
+            bucket[_ENERGY] += energy
+            bucket[_HOURS] += hours
+            if power_w is not None and power_w > bucket[_PEAK]:
+                bucket[_PEAK] = power_w
+                bucket[_PEAK_TS] = timestamp
+
+        day = period_key(PERIOD_DAY, when)
+        if day != self._last_day:
+            self._last_day = day
+            days = self._buckets[PERIOD_DAY]
+            while len(days) > MAX_DAYS:
+                del days[min(days)]
+
+    def get(self, period: str, when: date) -> dict | None:
+        """Return the bucket covering when, or None if nothing was recorded."""
+        key = period_key(period, when)
+        bucket = self._buckets[period].get(key)
+        return None if bucket is None else self._as_dict(key, bucket)
+
+    def range(self, period: str, start: date | None = None, end: date | None = None) -> list:
+        """Return buckets from start to end inclusive, oldest first."""
+        first = period_key(period, start) if start else None
+        last = period_key(period, end) if end else None
+        return [
+            self._as_dict(key, bucket)
+            for key, bucket in sorted(self._buckets[period].items())
+            if (first is None or key >= first) and (last is None or key <= last)
+        ]
+
+    @staticmethod
+    def _as_dict(key: str, bucket: list) -> dict:
+        """Return a bucket as a JSON-friendly dict."""
+        return {
+            "period": key,
+            "energy_kwh": round(bucket[_ENERGY], 3),
+            "peak_power_w": bucket[_PEAK],
+            "peak_time": (
+                None
+                if bucket[_PEAK_TS] is None
+                else datetime.fromtimestamp(bucket[_PEAK_TS], timezone.utc).isoformat()
+            ),
+            "run_hours": bucket[_HOURS],
+        }
+
+    def as_storage(self) -> dict:
+        """Return the compact form written to storage."""
+        return {
+            "last_energy": self._last_energy,
+            "last_hours": self._last_hours,
+            **{
+                period: {
+                    key: [round(b[_ENERGY], 3), b[_PEAK], b[_PEAK_TS], b[_HOURS]]
+                    for key, b in buckets.items()
+                }
+                for period, buckets in self._buckets.items()
+            },
+        }
+
+    def load_storage(self, data: dict) -> None:
+        """Restore state written by as_storage."""
+        self._last_energy = data.get("last_energy")
+        self._last_hours = data.get("last_hours")
+        for period in PERIODS:
+            self._buckets[period] = {key: list(b) for key, b in data.get(period, {}).items()}
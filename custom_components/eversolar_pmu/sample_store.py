@@ -0,0 +1,304 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Memory-mapped on-disk store of raw PMU samples.
+
+Each segment file holds a header with the code list, followed by fixed-width
+records of a uint32 unix timestamp and one uint16 per code, all little-endian.
+Records are appended in time order straight into the mapping, so reads are
+slices of the mapped file and need no parsing until a value is used. This
+module has no Home Assistant dependency.
+"""
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+
+from .eversolar_protocol import CODE_NAMES
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"EVSS"
+VERSION = 1
+# magic, version, reserved, code count, record count, capacity
+_HEADER = struct.Struct("<4sBBHII")
+_COUNT_OFFSET = 8
+HEADER_SIZE = 512
+TIMESTAMP = struct.Struct("<I")
+
+DEFAULT_SEGMENT_BYTES = 4 * 1024 * 1024
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# One sparse index entry per this many records
+INDEX_STRIDE = 64
+SEGMENT_SUFFIX = ".seg"
+
+
+def record_struct(code_count: int) -> struct.Struct:
+    """Return the struct of one record for a code list length."""
+    return struct.Struct(f"<I{code_count}H")
+
+
+class Segment:
+    """One mapped segment file."""
+
+    def __init__(self, path: str, mm: mmap.mmap, codes: tuple, count: int, capacity: int) -> None:
+        """Initialize segment state from an open mapping."""
+        self.path = path
+        self.mm = mm
+        self.codes = codes
+        self.count = count
+        self.capacity = capacity
+        self.record_size = TIMESTAMP.size + 2 * len(codes)
+        # Timestamp of every INDEX_STRIDE-th record
+        self.index = array("I", (self.timestamp(i) for i in range(0, count, INDEX_STRIDE)))
+
+    @classmethod
+    def create(cls, path: str, codes: tuple, segment_bytes: int) -> "Segment":
+        """Create and map a new, preallocated segment."""
+        record_size = TIMESTAMP.size + 2 * len(codes)
+        capacity = max(1, (segment_bytes - HEADER_SIZE) // record_size)
+        with open(path, "w+b") as f:
+            f.truncate(HEADER_SIZE + capacity * record_size)
+            mm = mmap.mmap(f.fileno(), 0)
+        _HEADER.pack_into(mm, 0, MAGIC, VERSION, 0, len(codes), 0, capacity)
+        mm[_HEADER.size:_HEADER.size + len(codes)] = bytes(codes)
+        return cls(path, mm, tuple(codes), 0, capacity)
+
+    @classmethod
+    def open(cls, path: str) -> "Segment":
+        """Map an existing segment; raise ValueError if it is not one."""
+        with open(path, "r+b") as f:
+            mm = mmap.mmap(f.fileno(), 0)
+        try:
+            if len(mm) < HEADER_SIZE:
+                raise ValueError("file too short")
+            magic, version, _reserved, code_count, count, capacity = _HEADER.unpack_from(mm, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("not a sample segment")
+            codes = tuple(mm[_HEADER.size:_HEADER.size + code_count])
+            record_size = TIMESTAMP.size + 2 * code_count
+            if count > capacity or len(mm) < HEADER_SIZE + capacity * record_size:
+                raise ValueError("truncated segment")
+        except ValueError:
+            mm.close()
+            raise
+        return cls(path, mm, codes, count, capacity)
+
+    @property
+    def full(self) -> bool:
+        """Return True when no record fits any more."""
+        return self.count >= self.capacity
+
+    @property
+    def first_ts(self) -> int | None:
+        """Return the first timestamp, or None if empty."""
+        return self.timestamp(0) if self.count else None
+
+    @property
+    def last_ts(self) -> int | None:
+        """Return the last timestamp, or None if empty."""
+        return self.timestamp(self.count - 1) if self.count else None
+
+    def timestamp(self, record: int) -> int:
+        """Return the timestamp of a record."""
+        return TIMESTAMP.unpack_from(self.mm, HEADER_SIZE + record * self.record_size)[0]
+
+    def append(self, timestamp: int, raw: array) -> None:
+        """Write one record and commit it by bumping the header count."""
+        offset = HEADER_SIZE + self.count * self.record_size
+        TIMESTAMP.pack_into(self.mm, offset, timestamp)
+        if sys.byteorder == "big":
+            raw = array("H", raw)
+            raw.byteswap()
+        self.mm[offset + TIMESTAMP.size:offset + self.record_size] = raw.tobytes()
+        if self.count % INDEX_STRIDE == 0:
+            self.index.append(timestamp)
+        self.count += 1
+        struct.pack_into("<I", self.mm, _COUNT_OFFSET, self.count)
+
+    def lower_bound(self, timestamp: int) -> int:
+        """Return the first record with a timestamp >= timestamp.
+
+        The sparse index narrows the search to one stride, which is then
+        bisected on the mapped records.
+        """
+        block = bisect_right(self.index, timestamp - 1)
+        lo = max(0, (block - 1) * INDEX_STRIDE)
+        hi = min(self.count, block * INDEX_STRIDE)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.timestamp(mid) < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def slice(self, first: int, last: int) -> memoryview:
+        """Return records first..last-1 as a view of the mapping."""
+        start = HEADER_SIZE + first * self.record_size
+        return memoryview(self.mm)[start:HEADER_SIZE + last * self.record_size]
+
+    def close(self) -> None:
+        """Flush and unmap the segment."""
+        self.mm.flush()
+        self.mm.close()
+
+
+class SampleStore:
+    """Append-only store of raw samples in rotating mapped segments.
+
+    Writes go straight into the mapping of the newest segment; the kernel
+    writes dirty pages back. A segment is rotated when full or when the PMU
+    reports a different code list, and the oldest segments are deleted to
+    keep the store under max_bytes. Methods that open or delete files perform
+    blocking I/O and must run outside the event loop.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+    ) -> None:
+        """Initialize store; segments are opened on first use."""
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_segments = max(2, max_bytes // segment_bytes)
+        self._segments: list | None = None
+        self._lock = threading.Lock()
+
+        # Counters
+        self.samples_written = 0
+        self.segments_rotated = 0
+
+    def _load(self) -> list:
+        """Map the existing segments, oldest first."""
+        if self._segments is not None:
+            return self._segments
+        self._segments = []
+        os.makedirs(self.directory, exist_ok=True)
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(SEGMENT_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                segment = Segment.open(path)
+            except (OSError, ValueError) as err:
+                _LOGGER.warning("Ignoring unreadable sample segment %s: %s", path, err)
+                continue
+            if segment.count:
+                self._segments.append(segment)
+            else:
+                segment.close()
+                os.remove(path)
+        return self._segments
+
+    def append(self, timestamp: int, codes: tuple, raw: array) -> None:
+        """Append one sample taken at unix time timestamp."""
+        with self._lock:
+            segments = self._load()
+            segment = segments[-1] if segments else None
+            if segment is not None and segment.count:
+                # Keep records in time order if the host clock steps back
+                timestamp = max(timestamp, segment.last_ts)
+            if segment is None or segment.full or segment.codes != tuple(codes):
+                segment = self._rotate(timestamp, codes)
+            segment.append(timestamp, raw)
+            self.samples_written += 1
+
+    def _rotate(self, timestamp: int, codes: tuple) -> Segment:
+        """Start a new segment and drop the oldest ones beyond the size limit."""
+        path = os.path.join(self.directory, f"{timestamp:010d}{SEGMENT_SUFFIX}")
+        if os.path.exists(path):
+            path = os.path.join(self.directory, f"{timestamp:010d}_{len(self._segments)}{SEGMENT_SUFFIX}")
+        segment = Segment.create(path, codes, self.segment_bytes)
+        self._segments.append(segment)
+        self.segments_rotated += 1
+        while len(self._segments) > self.max_segments:
+            oldest = self._segments.pop(0)
+            oldest.close()
+            os.remove(oldest.path)
+        return segment
+
+    def read_range(self, start: int, end: int, visit) -> None:
+        """Call visit(codes, records) for each segment slice in [start, end].
+
+        records is a zero-copy view of the mapped records, valid only during the
+        call; unpack it with record_struct(len(codes)).iter_unpack.
+        """
+        with self._lock:
+            for segment in self._load():
+                if not segment.count or segment.last_ts < start or segment.first_ts > end:
+                    continue
+                first = segment.lower_bound(start)
+                last = segment.lower_bound(end + 1)
+                if first >= last:
+                    continue
+                with segment.slice(first, last) as records:
+                    visit(segment.codes, records)
+
+    def read_columns(self, start: int, end: int, codes=None, limit: int | None = None) -> dict:
+        """Return samples in [start, end] as JSON-friendly columns per code list.
+
+        Columns are strided views of the mapped records; only the requested
+        codes are converted to Python values.
+        """
+        blocks = []
+        remaining = [limit]
+        # Set only when a sample in range was left out, not when the limit is met exactly
+        truncated = [False]
+
+        def visit(segment_codes: tuple, records: memoryview) -> None:
+            if remaining[0] is not None and remaining[0] <= 0:
+                truncated[0] = True
+                return
+            stride = len(segment_codes) + 2  # in uint16 units
+            rows = len(records) // (2 * stride)
+            if remaining[0] is not None:
+                if rows > remaining[0]:
+                    truncated[0] = True
+                    rows = remaining[0]
+                remaining[0] -= rows
+            positions = [
+                (code, i) for i, code in enumerate(segment_codes) if codes is None or code in codes
+            ]
+            if sys.byteorder == "little":
+                with records.cast("H") as view:
+                    words = view[:rows * stride]
+                    low, high = words[0::stride].tolist(), words[1::stride].tolist()
+                    timestamps = [lo | (hi << 16) for lo, hi in zip(low, high)]
+                    registers = {
+                        CODE_NAMES[code]: words[2 + i::stride].tolist() for code, i in positions
+                    }
+            else:
+                unpacked = list(record_struct(len(segment_codes)).iter_unpack(records))[:rows]
+                timestamps = [row[0] for row in unpacked]
+                registers = {CODE_NAMES[code]: [row[1 + i] for row in unpacked] for code, i in positions}
+            blocks.append(
+                {"codes": [CODE_NAMES[code] for code in segment_codes], "timestamps": timestamps, "registers": registers}
+            )
+
+        self.read_range(start, end, visit)
+        return {
+            "blocks": blocks,
+            "samples": sum(len(block["timestamps"]) for block in blocks),
+            "truncated": truncated[0],
+        }
+
+    @property
+    def size_bytes(self) -> int:
+        """Return the size of the mapped segments."""
+        with self._lock:
+            return sum(len(segment.mm) for segment in self._segments or ())
+
+    def close(self) -> None:
+        """Flush and unmap all segments."""
+        with self._lock:
+            for segment in self._segments or ():
+                segment.close()
+            self._segments = None
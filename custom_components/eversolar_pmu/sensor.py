@@ -4,6 +4,7 @@
 
 """Sensor platform for Eversolar PMU."""
 import logging
+import time
 from typing import Any, Optional
 
 from homeassistant.components.sensor import (
@@ -13,33 +14,66 @@ from homeassistant.components.sensor import (
     EntityCategory,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    ATTR_EXPECTED_PV_POWER,
     ATTR_INVERTER_ID,
+    ATTR_LOWER_LIMIT,
     ATTR_MODE,
+    ATTR_PEAK_TIME,
+    ATTR_PMU_CLOCK_ERROR,
+    ATTR_PMU_DRIFT_PPM,
     ATTR_PMU_EPOCH,
     ATTR_PMU_EPOCH_STEP,
     ATTR_PMU_TIME_STUCK,
     ATTR_PMU_TIME_UTC,
+    ATTR_SAMPLES,
+    ATTR_UPPER_LIMIT,
+    CODE_REGISTRY,
     CONF_PV_VOLTAGE_STATS_CUTOFF,
     CONF_PV_VOLTAGE_THRESHOLD,
     DOMAIN,
     ERROR_MESSAGES,
+    MODE_NAMES,
+    SENSOR_CLOCK_OFFSET,
+    SENSOR_DAILY_EFFICIENCY,
     SENSOR_DATA_KEYS,
+    SENSOR_ENERGY_MONTH,
     SENSOR_ENERGY_TODAY,
     SENSOR_ENERGY_TOTAL,
+    SENSOR_ENERGY_YEAR,
+    SENSOR_ERROR_MESSAGES,
     SENSOR_FREQUENCY,
+    SENSOR_FREQUENCY_OUTSIDE_TODAY,
+    SENSOR_FREQUENCY_P1_TODAY,
+    SENSOR_FREQUENCY_P50_TODAY,
+    SENSOR_FREQUENCY_P99_TODAY,
     SENSOR_HOURS_TOTAL,
+    SENSOR_OPERATION_MODE,
+    SENSOR_PEAK_POWER_TODAY,
+    SENSOR_PERFORMANCE_RATIO,
     SENSOR_POWER,
     SENSOR_PV_CURRENT,
     SENSOR_PV_POWER,
     SENSOR_PV_VOLTAGE,
+    SENSOR_REGISTERS,
+    SENSOR_RUN_HOURS_TODAY,
     SENSOR_VOLTAGE,
+    SENSOR_VOLTAGE_OUTSIDE_TODAY,
+    SENSOR_VOLTAGE_P1_TODAY,
+    SENSOR_VOLTAGE_P50_TODAY,
+    SENSOR_VOLTAGE_P99_TODAY,
 )
 from .coordinator import EversolarDataUpdateCoordinator
+from .external_statistics import MEAN_STATISTICS, SUM_STATISTICS
+from .grid_quality import METRIC_FREQUENCY, METRIC_VOLTAGE
+from .publish import PublishThrottle
+from .performance import METRIC_CONVERSION, METRIC_PV_CURRENT, METRIC_PV_POWER, METRIC_PV_VOLTAGE
+from .rollups import PERIOD_DAY, PERIOD_MONTH, PERIOD_YEAR
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -134,6 +168,15 @@ async def async_setup_entry(
             "W",
             SensorStateClass.MEASUREMENT,
         ),
+        EversolarDiagnosticSensor(
+            coordinator,
+            SENSOR_CLOCK_OFFSET,
+            "PMU Clock Offset",
+            "time_delta",
+            SensorDeviceClass.DURATION,
+            "s",
+            SensorStateClass.MEASUREMENT,
+        ),
         EversolarACOnlineTimestamp(
             coordinator,
             "ac_online_time",
@@ -149,12 +192,127 @@ async def async_setup_entry(
         EversolarOperationModeSensor(coordinator),
         EversolarErrorMessageSensor(coordinator),
         EversolarDailyEfficiencySensor(coordinator),
+        EversolarRollupSensor(
+            coordinator,
+            SENSOR_ENERGY_MONTH,
+            "Energy This Month",
+            PERIOD_MONTH,
+            "energy_kwh",
+            SensorDeviceClass.ENERGY,
+            "kWh",
+            SensorStateClass.TOTAL_INCREASING,
+        ),
+        EversolarRollupSensor(
+            coordinator,
+            SENSOR_ENERGY_YEAR,
+            "Energy This Year",
+            PERIOD_YEAR,
+            "energy_kwh",
+            SensorDeviceClass.ENERGY,
+            "kWh",
+            SensorStateClass.TOTAL_INCREASING,
+        ),
+        EversolarRollupSensor(
+            coordinator,
+            SENSOR_PEAK_POWER_TODAY,
+            "Peak Power Today",
+            PERIOD_DAY,
+            "peak_power_w",
+            SensorDeviceClass.POWER,
+            "W",
+            SensorStateClass.MEASUREMENT,
+        ),
+        EversolarRollupSensor(
+            coordinator,
+            SENSOR_RUN_HOURS_TODAY,
+            "Run Hours Today",
+            PERIOD_DAY,
+            "run_hours",
+            SensorDeviceClass.DURATION,
+            "h",
+            SensorStateClass.TOTAL_INCREASING,
+        ),
+        EversolarPerformanceRatioSensor(coordinator),
     ]
 
-    async_add_entities(entities)
+    # Daily grid quality: percentiles and time outside the configured limits
+    for metric, prefix, device_class, unit, keys in (
+        (
+            METRIC_VOLTAGE, "AC Voltage", SensorDeviceClass.VOLTAGE, "V",
+            (SENSOR_VOLTAGE_P1_TODAY, SENSOR_VOLTAGE_P50_TODAY,
+             SENSOR_VOLTAGE_P99_TODAY, SENSOR_VOLTAGE_OUTSIDE_TODAY),
+        ),
+        (
+            METRIC_FREQUENCY, "AC Frequency", SensorDeviceClass.FREQUENCY, "Hz",
+            (SENSOR_FREQUENCY_P1_TODAY, SENSOR_FREQUENCY_P50_TODAY,
+             SENSOR_FREQUENCY_P99_TODAY, SENSOR_FREQUENCY_OUTSIDE_TODAY),
+        ),
+    ):
+        p1_key, p50_key, p99_key, outside_key = keys
+        entities.extend(
+            [
+                EversolarGridQualitySensor(
+                    coordinator, p1_key, f"{prefix} P1 Today", metric, "p1", device_class, unit
+                ),
+                EversolarGridQualitySensor(
+                    coordinator, p50_key, f"{prefix} Median Today", metric, "p50", device_class, unit
+                ),
+                EversolarGridQualitySensor(
+                    coordinator, p99_key, f"{prefix} P99 Today", metric, "p99", device_class, unit
+                ),
+                EversolarGridQualitySensor(
+                    coordinator, outside_key, f"{prefix} Outside Limits Today", metric,
+                    "outside_limits_s", SensorDeviceClass.DURATION, "s",
+                ),
+            ]
+        )
 
+    async_add_entities(entities)
 
-class EversolarSensor(CoordinatorEntity, SensorEntity):
+    # One entity per discovered data code, added as new codes show up
+    known_codes: set = set()
+
+    @callback
+    def _async_add_code_sensors() -> None:
+        """Create entities for codes that have not been seen before."""
+        new_codes = [
+            code for code in dict.fromkeys(coordinator.discovered_codes) if code not in known_codes
+        ]
+        if not new_codes:
+            return
+        known_codes.update(new_codes)
+        async_add_entities(EversolarCodeSensor(coordinator, code) for code in new_codes)
+
+    _async_add_code_sensors()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_code_sensors))
+
+
+class EversolarPublishThrottled:
+    """Mixin that applies the slow publish tier to a coordinator entity.
+
+    Subclasses set _publish_key to their sensor type or class; whether that key
+    is in the slow tier is looked up on every poll.
+    """
+
+    _publish_key: Optional[str] = None
+    _publish_throttle: Optional[PublishThrottle] = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the publish tier allows it."""
+        settings = self.coordinator.publish_settings(self._publish_key) if self._publish_key else None
+        if settings is not None:
+            if self._publish_throttle is None:
+                self._publish_throttle = PublishThrottle()
+            interval, change = settings
+            if not self._publish_throttle.due(
+                time.monotonic(), self.native_value, self.available, interval, change
+            ):
+                return
+        super()._handle_coordinator_update()
+
+
+class EversolarSensor(EversolarPublishThrottled, CoordinatorEntity, SensorEntity):
     """Representation of an Eversolar sensor."""
 
     _attr_has_entity_name = True
@@ -178,6 +336,31 @@ class EversolarSensor(CoordinatorEntity, SensorEntity):
         self._attr_device_class = device_class
         self._attr_native_unit_of_measurement = unit
         self._attr_state_class = state_class
+        self._last_written_available: Optional[bool] = None
+
+        # The coordinator imports statistics for these keys itself when states
+        # are suppressed, so the recorder must not compile them a second time
+        self._statistics_suppressed = coordinator.suppress_state_writes and (
+            data_key in MEAN_STATISTICS or data_key in SUM_STATISTICS
+        )
+        if self._statistics_suppressed:
+            self._attr_state_class = None
+        else:
+            self._publish_key = sensor_type
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self._statistics_suppressed:
+            # Only publish once per closed statistics hour or on availability change
+            available = self.available
+            if (
+                not self.coordinator.statistics_hour_closed
+                and available == self._last_written_available
+            ):
+                return
+            self._last_written_available = available
+        super()._handle_coordinator_update()
 
     @property
     def unique_id(self) -> str:
@@ -242,6 +425,7 @@ class EversolarSensor(CoordinatorEntity, SensorEntity):
 class EversolarDiagnosticSensor(EversolarSensor):
     """Diagnostic sensor with additional attributes."""
 
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_entity_registry_enabled_default = True
 
     @property
@@ -263,6 +447,10 @@ class EversolarDiagnosticSensor(EversolarSensor):
             attrs[ATTR_PMU_EPOCH_STEP] = self.coordinator.data.get("pmu_epoch_step")
         if self.coordinator.data.get("pmu_time_stuck") is not None:
             attrs[ATTR_PMU_TIME_STUCK] = self.coordinator.data.get("pmu_time_stuck")
+        if self.coordinator.data.get("pmu_drift_ppm") is not None:
+            attrs[ATTR_PMU_DRIFT_PPM] = self.coordinator.data.get("pmu_drift_ppm")
+        if self.coordinator.data.get("pmu_clock_error") is not None:
+            attrs[ATTR_PMU_CLOCK_ERROR] = self.coordinator.data.get("pmu_clock_error")
 
         return attrs
 
@@ -343,10 +531,11 @@ class EversolarACOfflineTimestamp(CoordinatorEntity, SensorEntity):
         }
 
 
-class EversolarOperationModeSensor(CoordinatorEntity, SensorEntity):
+class EversolarOperationModeSensor(EversolarPublishThrottled, CoordinatorEntity, SensorEntity):
     """Operation Mode sensor."""
 
     _attr_has_entity_name = True
+    _publish_key = SENSOR_OPERATION_MODE
     _attr_name = "Operation Mode"
 
     def __init__(self, coordinator: EversolarDataUpdateCoordinator) -> None:
@@ -357,8 +546,8 @@ class EversolarOperationModeSensor(CoordinatorEntity, SensorEntity):
     def unique_id(self) -> str:
         """Return a unique ID."""
         if self.coordinator.inverter_id:
-            return f"{DOMAIN}_{self.coordinator.inverter_id}_operation_mode"
-        return f"{DOMAIN}_{self.coordinator.config_entry.entry_id}_operation_mode"
+            return f"{DOMAIN}_{self.coordinator.inverter_id}_{SENSOR_OPERATION_MODE}"
+        return f"{DOMAIN}_{self.coordinator.config_entry.entry_id}_{SENSOR_OPERATION_MODE}"
 
     @property
     def native_value(self) -> Optional[str]:
@@ -369,13 +558,7 @@ class EversolarOperationModeSensor(CoordinatorEntity, SensorEntity):
         if mode is None:
             return None
 
-        mode_map = {
-            0x0000: "Wait",
-            0x0001: "Normal",
-            0x0002: "Fault",
-            0x0003: "Permanent Fault",
-        }
-        return mode_map.get(mode, "Unknown")
+        return MODE_NAMES.get(mode, "Unknown")
 
     @property
     def device_info(self) -> dict:
@@ -388,10 +571,11 @@ class EversolarOperationModeSensor(CoordinatorEntity, SensorEntity):
         }
 
 
-class EversolarErrorMessageSensor(CoordinatorEntity, SensorEntity):
+class EversolarErrorMessageSensor(EversolarPublishThrottled, CoordinatorEntity, SensorEntity):
     """Error Message Bit Flags sensor."""
 
     _attr_has_entity_name = True
+    _publish_key = SENSOR_ERROR_MESSAGES
     _attr_name = "Error Messages"
 
     def __init__(self, coordinator: EversolarDataUpdateCoordinator) -> None:
@@ -402,8 +586,8 @@ class EversolarErrorMessageSensor(CoordinatorEntity, SensorEntity):
     def unique_id(self) -> str:
         """Return a unique ID."""
         if self.coordinator.inverter_id:
-            return f"{DOMAIN}_{self.coordinator.inverter_id}_error_messages"
-        return f"{DOMAIN}_{self.coordinator.config_entry.entry_id}_error_messages"
+            return f"{DOMAIN}_{self.coordinator.inverter_id}_{SENSOR_ERROR_MESSAGES}"
+        return f"{DOMAIN}_{self.coordinator.config_entry.entry_id}_{SENSOR_ERROR_MESSAGES}"
 
     @property
     def native_value(self) -> Optional[str]:
@@ -460,10 +644,11 @@ class EversolarErrorMessageSensor(CoordinatorEntity, SensorEntity):
         }
 
 
-class EversolarDailyEfficiencySensor(CoordinatorEntity, SensorEntity):
+class EversolarDailyEfficiencySensor(EversolarPublishThrottled, CoordinatorEntity, SensorEntity):
     """Daily Efficiency sensor."""
 
     _attr_has_entity_name = True
+    _publish_key = SENSOR_DAILY_EFFICIENCY
     _attr_name = "Daily Efficiency"
     _attr_native_unit_of_measurement = "%"
     _attr_state_class = SensorStateClass.MEASUREMENT
@@ -477,8 +662,8 @@ class EversolarDailyEfficiencySensor(CoordinatorEntity, SensorEntity):
     def unique_id(self) -> str:
         """Return a unique ID."""
         if self.coordinator.inverter_id:
-            return f"{DOMAIN}_{self.coordinator.inverter_id}_daily_efficiency"
-        return f"{DOMAIN}_{self.coordinator.config_entry.entry_id}_daily_efficiency"
+            return f"{DOMAIN}_{self.coordinator.inverter_id}_{SENSOR_DAILY_EFFICIENCY}"
+        return f"{DOMAIN}_{self.coordinator.config_entry.entry_id}_{SENSOR_DAILY_EFFICIENCY}"
 
     @property
     def available(self) -> bool:
@@ -520,3 +705,241 @@ class EversolarDailyEfficiencySensor(CoordinatorEntity, SensorEntity):
             "manufacturer": "Eversolar",
             "model": "PMU (TCP/IP)",
         }
+
+
+class EversolarRollupSensor(EversolarPublishThrottled, CoordinatorEntity, SensorEntity):
+    """Sensor for one field of the current day, month or year rollup."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: EversolarDataUpdateCoordinator,
+        sensor_type: str,
+        name: str,
+        period: str,
+        field: str,
+        device_class: Optional[SensorDeviceClass],
+        unit: Optional[str],
+        state_class: Optional[SensorStateClass],
+    ) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self._sensor_type = sensor_type
+        self._publish_key = sensor_type
+        self._period = period
+        self._field = field
+        self._attr_name = name
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique ID."""
+        if self.coordinator.inverter_id:
+            return f"{DOMAIN}_{self.coordinator.inverter_id}_{self._sensor_type}"
+        return f"{DOMAIN}_{self.coordinator.config_entry.entry_id}_{self._sensor_type}"
+
+    @property
+    def native_value(self) -> Optional[float]:
+        """Return the field of the rollup covering the current period."""
+        bucket = self.coordinator.rollups.get(self._period, dt_util.now())
+        # Nothing recorded yet in a new period reads as zero
+        return 0 if bucket is None else bucket[self._field]
+
+    @property
+    def extra_state_attributes(self) -> Optional[dict]:
+        """Return the time of the peak for peak power sensors."""
+        if self._field != "peak_power_w":
+            return None
+        bucket = self.coordinator.rollups.get(self._period, dt_util.now())
+        return {ATTR_PEAK_TIME: None if bucket is None else bucket[ATTR_PEAK_TIME]}
+
+    @property
+    def device_info(self) -> dict:
+        """Return device info."""
+        return {
+            "identifiers": {(DOMAIN, self.coordinator.inverter_id or self.coordinator.config_entry.entry_id)},
+            "name": f"Eversolar Inverter {self.coordinator.inverter_id or 'Unknown'}",
+            "manufacturer": "Eversolar",
+            "model": "PMU (TCP/IP)",
+        }
+
+
+class EversolarPerformanceRatioSensor(EversolarPublishThrottled, CoordinatorEntity, SensorEntity):
+    """PV power against the learned baseline for this time of day."""
+
+    _attr_has_entity_name = True
+    _publish_key = SENSOR_PERFORMANCE_RATIO
+    _attr_name = "Performance Ratio"
+    _attr_native_unit_of_measurement = "%"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator: EversolarDataUpdateCoordinator) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique ID."""
+        if self.coordinator.inverter_id:
+            return f"{DOMAIN}_{self.coordinator.inverter_id}_{SENSOR_PERFORMANCE_RATIO}"
+        return f"{DOMAIN}_{self.coordinator.config_entry.entry_id}_{SENSOR_PERFORMANCE_RATIO}"
+
+    @property
+    def native_value(self) -> Optional[float]:
+        """Return the smoothed PV power ratio in percent."""
+        ratios = self.coordinator.performance.ratios
+        if not ratios or METRIC_PV_POWER not in ratios:
+            return None
+        return round(ratios[METRIC_PV_POWER] * 100, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the baseline and the per-metric ratios."""
+        ratios = self.coordinator.performance.ratios or {}
+        expected = self.coordinator.performance.expected_pv_w
+        attrs = {ATTR_EXPECTED_PV_POWER: None if expected is None else round(expected)}
+        for metric in (METRIC_PV_VOLTAGE, METRIC_PV_CURRENT, METRIC_CONVERSION):
+            ratio = ratios.get(metric)
+            attrs[f"{metric}_ratio"] = None if ratio is None else round(ratio * 100, 1)
+        attrs["deviating"] = self.coordinator.performance_deviations
+        return attrs
+
+    @property
+    def device_info(self) -> dict:
+        """Return device info."""
+        return {
+            "identifiers": {(DOMAIN, self.coordinator.inverter_id or self.coordinator.config_entry.entry_id)},
+            "name": f"Eversolar Inverter {self.coordinator.inverter_id or 'Unknown'}",
+            "manufacturer": "Eversolar",
+            "model": "PMU (TCP/IP)",
+        }
+
+
+class EversolarGridQualitySensor(EversolarPublishThrottled, CoordinatorEntity, SensorEntity):
+    """Sensor for one field of today's AC voltage or frequency distribution."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: EversolarDataUpdateCoordinator,
+        sensor_type: str,
+        name: str,
+        metric: str,
+        field: str,
+        device_class: SensorDeviceClass,
+        unit: str,
+    ) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self._sensor_type = sensor_type
+        self._publish_key = sensor_type
+        self._metric = metric
+        self._field = field
+        self._attr_name = name
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = unit
+        # Time outside limits only grows through the day
+        self._attr_state_class = (
+            SensorStateClass.TOTAL_INCREASING
+            if field == "outside_limits_s"
+            else SensorStateClass.MEASUREMENT
+        )
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique ID."""
+        if self.coordinator.inverter_id:
+            return f"{DOMAIN}_{self.coordinator.inverter_id}_{self._sensor_type}"
+        return f"{DOMAIN}_{self.coordinator.config_entry.entry_id}_{self._sensor_type}"
+
+    @property
+    def native_value(self) -> Optional[float]:
+        """Return the field of today's summary."""
+        return self.coordinator.grid_quality.today(self._metric).field(self._field)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the configured limits and the number of samples today."""
+        low, high = self.coordinator.grid_quality.limits[self._metric]
+        return {
+            ATTR_LOWER_LIMIT: low,
+            ATTR_UPPER_LIMIT: high,
+            ATTR_SAMPLES: self.coordinator.grid_quality.today(self._metric).samples,
+        }
+
+    @property
+    def device_info(self) -> dict:
+        """Return device info."""
+        return {
+            "identifiers": {(DOMAIN, self.coordinator.inverter_id or self.coordinator.config_entry.entry_id)},
+            "name": f"Eversolar Inverter {self.coordinator.inverter_id or 'Unknown'}",
+            "manufacturer": "Eversolar",
+            "model": "PMU (TCP/IP)",
+        }
+
+
+class EversolarCodeSensor(EversolarPublishThrottled, CoordinatorEntity, SensorEntity):
+    """Sensor for a single data code from the PMU code list."""
+
+    _attr_has_entity_name = True
+    _publish_key = SENSOR_REGISTERS
+
+    def __init__(self, coordinator: EversolarDataUpdateCoordinator, code: int) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self._code = code
+        self._scale: Optional[float] = None
+
+        registry = CODE_REGISTRY.get(code)
+        if registry is None:
+            self._attr_name = f"Register 0x{code:02x}"
+            self._attr_entity_registry_enabled_default = False
+            self._attr_entity_category = EntityCategory.DIAGNOSTIC
+            self._attr_state_class = SensorStateClass.MEASUREMENT
+            return
+
+        _key, name, scale, unit, device_class, enabled = registry
+        self._attr_name = name
+        self._scale = scale
+        self._attr_native_unit_of_measurement = unit
+        self._attr_entity_registry_enabled_default = enabled
+        if device_class is not None:
+            self._attr_device_class = SensorDeviceClass(device_class)
+        if device_class == SensorDeviceClass.ENERGY:
+            self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        elif unit is not None:
+            self._attr_state_class = SensorStateClass.MEASUREMENT
+        if not enabled:
+            self._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique ID."""
+        if self.coordinator.inverter_id:
+            return f"{DOMAIN}_{self.coordinator.inverter_id}_code_{self._code:02x}"
+        return f"{DOMAIN}_{self.coordinator.config_entry.entry_id}_code_{self._code:02x}"
+
+    @property
+    def native_value(self) -> Optional[float]:
+        """Return the scaled register value."""
+        if not self.coordinator.data:
+            return None
+        raw = self.coordinator.data.register(self._code)
+        if raw is None or self._scale is None:
+            return raw
+        return round(raw * self._scale, 3)
+
+    @property
+    def device_info(self) -> dict:
+        """Return device info."""
+        return {
+            "identifiers": {(DOMAIN, self.coordinator.inverter_id or self.coordinator.config_entry.entry_id)},
+            "name": f"Eversolar Inverter {self.coordinator.inverter_id or 'Unknown'}",
+            "manufacturer": "Eversolar",
+            "model": "PMU (TCP/IP)",
+        }
@@ -0,0 +1,61 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Websocket API for live Eversolar PMU values."""
+import logging
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN
+from .coordinator import EversolarDataUpdateCoordinator
+from .live import DEFAULT_LIVE_FIELDS, LIVE_FIELDS, MIN_LIVE_INTERVAL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the integration's websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Required("entry_id"): str,
+        vol.Optional("fields"): vol.All(cv.ensure_list, [vol.In(LIVE_FIELDS)], vol.Length(min=1)),
+        vol.Optional("interval"): vol.All(
+            vol.Coerce(float), vol.Range(min=MIN_LIVE_INTERVAL, max=3600)
+        ),
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Stream compact poll values of one inverter until unsubscribed.
+
+    The result lists the fields; each event is {"t": unix time, "v": [values
+    in field order]}. Without an interval, events follow the scan interval.
+    """
+    coordinator = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if not isinstance(coordinator, EversolarDataUpdateCoordinator):
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, f"Config entry {msg['entry_id']} not found"
+        )
+        return
+
+    fields = tuple(msg.get("fields") or DEFAULT_LIVE_FIELDS)
+    interval = msg.get("interval")
+
+    @callback
+    def forward(message: dict) -> None:
+        """Send one live message to the client."""
+        connection.send_message(websocket_api.event_message(msg["id"], message))
+
+    connection.send_result(msg["id"], {"fields": list(fields), "interval": interval})
+    connection.subscriptions[msg["id"]] = coordinator.async_subscribe_live(forward, fields, interval)
@@ -0,0 +1,460 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Command-line tool for polling, capturing and benchmarking Eversolar PMUs.
+
+Uses the integration's protocol, emulator and archive modules without Home
+Assistant. They are loaded by path, so the integration package itself (which
+imports Home Assistant) is never imported. Example:
+
+    python scripts/eversolar_cli.py poll 192.168.1.50
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import types
+from collections import deque
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMPONENT_DIR = os.path.join(REPO_ROOT, "custom_components", "eversolar_pmu")
+# Package name the integration modules are loaded under
+PACKAGE = "eversolar_pmu_standalone"
+
+
+def load_component_module(name: str) -> types.ModuleType:
+    """Import one integration module by path, without the package __init__."""
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [COMPONENT_DIR]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{name}")
+
+
+_const = load_component_module("const")
+_protocol = load_component_module("eversolar_protocol")
+_emulator = load_component_module("emulator")
+_archive = load_component_module("archive")
+
+DEFAULT_PORT = _const.DEFAULT_PORT
+DEFAULT_TIMEOUT = _const.DEFAULT_TIMEOUT
+DEFAULT_TIMEZONE = _const.DEFAULT_TIMEZONE
+CODE_NAMES = _protocol.CODE_NAMES
+HEADER_LEN = _protocol.HEADER_LEN
+EversolarPMU = _protocol.EversolarPMU
+PollResult = _protocol.PollResult
+decode_registers_from_resp14 = _protocol.decode_registers_from_resp14
+parse_resp12 = _protocol.parse_resp12
+EmulatedPMU = _emulator.EmulatedPMU
+iter_samples = _archive.iter_samples
+
+# Polls kept for the rolling latency summary of watch
+WATCH_WINDOW = 100
+
+
+def latency_summary(samples) -> dict:
+    """Return min/mean/p50/p95/max of latencies in seconds, as milliseconds."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    return {
+        key: round(value * 1000.0, 1)
+        for key, value in (
+            ("min_ms", ordered[0]),
+            ("mean_ms", statistics.fmean(ordered)),
+            ("p50_ms", pct(0.5)),
+            ("p95_ms", pct(0.95)),
+            ("max_ms", ordered[-1]),
+        )
+    }
+
+
+def _result_dict(result: PollResult, elapsed: float) -> dict:
+    """Return a poll result as a JSON-friendly dict with its duration."""
+    out = result.as_dict()
+    out["poll_ms"] = round(elapsed * 1000.0, 1)
+    return out
+
+
+def _timed_poll(pmu: EversolarPMU, tz_name: str) -> tuple:
+    """Poll once; return (result or None, elapsed seconds, error or None)."""
+    started = time.perf_counter()
+    try:
+        result = pmu.connect_and_poll(False, tz_name)
+    except Exception as err:
+        return None, time.perf_counter() - started, err
+    return result, time.perf_counter() - started, None
+
+
+def _repeat(count: int, interval: float):
+    """Yield poll numbers, sleeping so polls start interval seconds apart."""
+    n = 0
+    next_start = time.monotonic()
+    while not count or n < count:
+        if n:
+            next_start += interval
+            time.sleep(max(0.0, next_start - time.monotonic()))
+        yield n
+        n += 1
+
+
+def cmd_poll(args) -> int:
+    """Poll and print JSON, once or every interval seconds."""
+    pmu = EversolarPMU(args.host, args.port, args.timeout)
+    count = args.count if args.interval else 1
+    failures = 0
+    for _ in _repeat(count, args.interval):
+        result, elapsed, err = _timed_poll(pmu, args.tz)
+        if err is not None:
+            failures += 1
+            out = {"error": str(err), "poll_ms": round(elapsed * 1000.0, 1)}
+        else:
+            out = _result_dict(result, elapsed)
+        print(json.dumps(out, indent=2 if args.pretty else None), flush=True)
+    return 1 if failures else 0
+
+
+def cmd_watch(args) -> int:
+    """Poll at a high rate and keep a live latency summary on one line."""
+    pmu = EversolarPMU(args.host, args.port, args.timeout)
+    window: deque = deque(maxlen=WATCH_WINDOW)
+    polls = failures = 0
+    last_error = ""
+    try:
+        for _ in _repeat(args.count, args.interval):
+            result, elapsed, err = _timed_poll(pmu, args.tz)
+            polls += 1
+            window.append(elapsed)
+            if err is not None:
+                failures += 1
+                last_error = str(err)
+                power = "-"
+            else:
+                power = f"{result.power_w} W"
+            summary = latency_summary(window)
+            line = (
+                f"polls {polls} fail {failures} | last {elapsed * 1000.0:.1f} ms"
+                f" p50 {summary['p50_ms']} p95 {summary['p95_ms']} max {summary['max_ms']} ms"
+                f" | resyncs {pmu.resyncs} | {power}"
+            )
+            print(f"\r{line:<100}", end="", flush=True)
+    except KeyboardInterrupt:
+        pass
+    print()
+    if last_error:
+        print(f"last error: {last_error}")
+    return 0
+
+
+def cmd_capture(args) -> int:
+    """Poll and write every frame sent and received to a JSON-lines log."""
+    pmu = EversolarPMU(args.host, args.port, args.timeout)
+    failures = 0
+    with open(args.output, "a", encoding="utf-8") as log:
+
+        def _log(direction: str, frame: bytes) -> None:
+            log.write(json.dumps({"t": round(time.time(), 3), "dir": direction, "frame": frame.hex()}) + "\n")
+
+        pmu.frame_log = _log
+        for n in _repeat(args.count, args.interval):
+            result, elapsed, err = _timed_poll(pmu, args.tz)
+            failures += err is not None
+            log.write(
+                json.dumps(
+                    {
+                        "t": round(time.time(), 3),
+                        "event": "poll",
+                        "ok": err is None,
+                        "poll_ms": round(elapsed * 1000.0, 1),
+                        **({"error": str(err)} if err is not None else {}),
+                    }
+                )
+                + "\n"
+            )
+            log.flush()
+            print(f"poll {n + 1}: {'ok' if err is None else err} ({elapsed * 1000.0:.1f} ms)", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def read_frame_log(path: str):
+    """Yield (time, direction, frame) for every frame in a capture."""
+    with open(path, encoding="utf-8") as log:
+        for line in log:
+            entry = json.loads(line)
+            if "frame" in entry:
+                yield entry["t"], entry["dir"], bytes.fromhex(entry["frame"])
+
+
+def _request_key(frame: bytes) -> tuple:
+    """Return the key a recorded response is replayed for: cmd, plus the 0x11 mode byte."""
+    cmd = frame[2]
+    return cmd, frame[HEADER_LEN:HEADER_LEN + 1] if cmd == 0x11 else b""
+
+
+class ReplayPMU(EmulatedPMU):
+    """Emulated PMU that answers with the responses from a capture, in order."""
+
+    def __init__(self, responses: dict, inverter_id: str, **kwargs) -> None:
+        """Initialize with request key -> list of recorded response frames."""
+        super().__init__(inverter_id, **kwargs)
+        self._responses = {key: deque(frames) for key, frames in responses.items()}
+
+    def response(self, cmd: int, payload: bytes) -> bytes | None:
+        """Return the next recorded response for a request, cycling at the end."""
+        key = (cmd, payload[:1] if cmd == 0x11 else b"")
+        frames = self._responses.get(key)
+        if not frames:
+            return None
+        frame = frames[0]
+        frames.rotate(-1)
+        return frame
+
+
+def cmd_replay(args) -> int:
+    """Decode a capture offline, or serve its responses as a fake PMU."""
+    responses: dict = {}
+    discovery = None
+    last_request = None
+    for t, direction, frame in read_frame_log(args.file):
+        if direction == "tx":
+            last_request = frame
+            continue
+        if last_request is not None:
+            responses.setdefault(_request_key(last_request), []).append(frame)
+        if frame[2] == 0x12:
+            try:
+                parsed = parse_resp12(frame)
+            except Exception:
+                continue
+            if parsed.codes:
+                discovery = parsed
+        elif frame[2] == 0x14 and discovery is not None and not args.serve:
+            codes = discovery.codes
+            pmu_epoch = int.from_bytes(frame[HEADER_LEN + 2:HEADER_LEN + 6], "little")
+            result = PollResult(
+                discovery.inverter_id,
+                codes,
+                decode_registers_from_resp14(frame, codes),
+                {code: idx for idx, code in enumerate(codes)},
+                pmu_epoch=pmu_epoch,
+                time_delta=int(pmu_epoch - t),
+            )
+            out = result.as_dict()
+            out["captured_at"] = t
+            print(json.dumps(out, indent=2 if args.pretty else None), flush=True)
+
+    if not args.serve:
+        return 0
+
+    pmu = ReplayPMU(
+        responses,
+        discovery.inverter_id if discovery is not None else "REPLAY0000000000",
+        latency=args.latency,
+    )
+
+    async def _serve() -> None:
+        await pmu.async_start(args.listen, args.port)
+        print(f"Replaying {args.file} on {args.listen}:{pmu.sockname[1]} (Ctrl-C to stop)", file=sys.stderr)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await pmu.async_stop()
+
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+class EmulatorThread:
+    """Run an emulated PMU on its own event loop in a background thread."""
+
+    def __init__(self, pmu: EmulatedPMU) -> None:
+        """Initialize thread state."""
+        self.pmu = pmu
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> tuple:
+        """Start the emulator and return its (host, port)."""
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.pmu.async_start(host, port), self._loop).result()
+        return self.pmu.sockname
+
+    def stop(self) -> None:
+        """Stop the emulator and its loop."""
+        asyncio.run_coroutine_threadsafe(self.pmu.async_stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+def cmd_bench(args) -> int:
+    """Run back-to-back polls and report throughput, latency and CPU time."""
+    emulator = None
+    host, port = args.host, args.port
+    if args.emulator:
+        emulator = EmulatorThread(
+            EmulatedPMU(
+                "EMU0000000000001",
+                latency=args.latency,
+                noise=args.noise,
+                loss=args.loss,
+                corrupt=args.corrupt,
+            )
+        )
+        host, port = emulator.start()
+    elif host is None:
+        print("bench needs a host or --emulator", file=sys.stderr)
+        return 2
+
+    pmu = EversolarPMU(host, port, args.timeout)
+    latencies = []
+    failures = 0
+    try:
+        for _ in range(args.warmup):
+            _timed_poll(pmu, args.tz)
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        for _ in range(args.count):
+            _result, elapsed, err = _timed_poll(pmu, args.tz)
+            latencies.append(elapsed)
+            failures += err is not None
+        wall = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+    finally:
+        if emulator is not None:
+            emulator.stop()
+
+    report = {
+        "target": "emulator" if emulator is not None else f"{host}:{port}",
+        "polls": args.count,
+        "failures": failures,
+        "wall_s": round(wall, 3),
+        "polls_per_s": round(args.count / wall, 1) if wall else None,
+        # Includes the emulator's own CPU time when it runs in-process
+        "cpu_ms_per_poll": round(cpu * 1000.0 / args.count, 3) if args.count else None,
+        "resyncs": pmu.resyncs,
+        "bad_frames": pmu.bad_frames,
+        "retries": pmu.request_retries,
+        "srtt_ms": {
+            f"0x{cmd:02x}": round(rtt.srtt * 1000.0, 2) for cmd, rtt in pmu.rtt.items() if rtt.srtt is not None
+        },
+        "rto_ms": {
+            f"0x{cmd:02x}": round(rtt.timeout(pmu.timeout) * 1000.0, 2)
+            for cmd, rtt in pmu.rtt.items()
+            if rtt.srtt is not None
+        },
+        **latency_summary(latencies),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for key, value in report.items():
+            print(f"{key:>16}: {value}")
+    return 1 if failures else 0
+
+
+def _add_target(parser: argparse.ArgumentParser, required: bool = True) -> None:
+    """Add the PMU address and connection arguments."""
+    parser.add_argument("host", nargs=None if required else "?", help="PMU host or IP address")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"PMU TCP port (default {DEFAULT_PORT})")
+    parser.add_argument(
+        "--timeout", type=float, default=DEFAULT_TIMEOUT, help=f"poll budget in seconds (default {DEFAULT_TIMEOUT})"
+    )
+    parser.add_argument("--tz", default=DEFAULT_TIMEZONE, help="time zone sent in the init frame")
+
+
+def _timestamp(value: str) -> int:
+    """Parse unix seconds or an ISO 8601 date/time (local time if naive)."""
+    try:
+        return int(value)
+    except ValueError:
+        return int(datetime.fromisoformat(value).timestamp())
+
+
+def cmd_archive(args) -> int:
+    """Print the samples of a register archive as JSON lines."""
+    for timestamp, codes, values in iter_samples(args.file, args.start, args.end):
+        registers = {CODE_NAMES[code]: value for code, value in zip(codes, values)}
+        print(json.dumps({"t": timestamp, "registers": registers}), flush=True)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="python scripts/eversolar_cli.py",
+        description="Poll, capture and benchmark Eversolar PMUs without Home Assistant.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    poll = sub.add_parser("poll", help="poll and print JSON")
+    _add_target(poll)
+    poll.add_argument("--interval", type=float, default=0.0, help="repeat every N seconds (default: poll once)")
+    poll.add_argument("--count", type=int, default=0, help="stop after N polls when repeating (default: run forever)")
+    poll.add_argument("--pretty", action="store_true", help="indent JSON output")
+    poll.set_defaults(func=cmd_poll)
+
+    watch = sub.add_parser("watch", help="poll at a high rate with a live latency summary")
+    _add_target(watch)
+    watch.add_argument("--interval", type=float, default=1.0, help="seconds between poll starts (default 1)")
+    watch.add_argument("--count", type=int, default=0, help="stop after N polls (default: until Ctrl-C)")
+    watch.set_defaults(func=cmd_watch)
+
+    capture = sub.add_parser("capture", help="poll and record every frame to a JSON-lines log")
+    _add_target(capture)
+    capture.add_argument("-o", "--output", required=True, help="frame log to append to")
+    capture.add_argument("--interval", type=float, default=10.0, help="seconds between polls (default 10)")
+    capture.add_argument("--count", type=int, default=1, help="polls to capture, 0 for until Ctrl-C (default 1)")
+    capture.set_defaults(func=cmd_capture)
+
+    replay = sub.add_parser("replay", help="decode a frame log, or serve it as a fake PMU")
+    replay.add_argument("file", help="frame log written by capture")
+    replay.add_argument("--pretty", action="store_true", help="indent JSON output")
+    replay.add_argument("--serve", action="store_true", help="answer requests with the recorded responses")
+    replay.add_argument("--listen", default="127.0.0.1", help="address to serve on (default 127.0.0.1)")
+    replay.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port to serve on (default {DEFAULT_PORT})")
+    replay.add_argument("--latency", type=float, default=0.0, help="delay before each response in seconds")
+    replay.set_defaults(func=cmd_replay)
+
+    bench = sub.add_parser("bench", help="measure back-to-back poll throughput and latency")
+    _add_target(bench, required=False)
+    bench.add_argument("--emulator", action="store_true", help="benchmark against an in-process emulated PMU")
+    bench.add_argument("--latency", type=float, default=0.0, help="emulator response delay in seconds")
+    bench.add_argument("--noise", type=float, default=0.0, help="share of emulator responses preceded by garbage")
+    bench.add_argument("--loss", type=float, default=0.0, help="share of emulator responses dropped")
+    bench.add_argument("--corrupt", type=float, default=0.0, help="share of emulator responses with a flipped bit")
+    bench.add_argument("--count", type=int, default=100, help="polls to measure (default 100)")
+    bench.add_argument("--warmup", type=int, default=3, help="unmeasured polls first (default 3)")
+    bench.add_argument("--json", action="store_true", help="print the report as JSON")
+    bench.set_defaults(func=cmd_bench)
+
+    archive = sub.add_parser("archive", help="print the samples of a register archive as JSON lines")
+    archive.add_argument("file", help="archive file (<config>/eversolar_pmu/archive/<entry_id>.evarc)")
+    archive.add_argument("--start", type=_timestamp, help="first time to include (unix seconds or ISO 8601)")
+    archive.add_argument("--end", type=_timestamp, help="last time to include (unix seconds or ISO 8601)")
+    archive.set_defaults(func=cmd_archive)
+    return parser
+
+
+def main(argv=None) -> int:
+    """Run the command line tool."""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
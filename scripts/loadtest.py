@@ -0,0 +1,353 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Fleet-scale load test for the Eversolar PMU integration.
+
+For each fleet size N this starts N emulated PMUs on loopback addresses in a
+separate process, boots a minimal Home Assistant instance (http + recorder on a
+throwaway SQLite database) in a fresh child process, adds one config entry per
+PMU through the config flow and then measures, over a fixed window:
+
+- event-loop lag (how late a 50 ms sleep wakes up)
+- executor queue depth (jobs waiting for a worker thread)
+- CPU use and RSS of the Home Assistant process
+- state_changed events and recorder state rows written per second
+- poll-completion jitter (deviation of the interval between coordinator
+  updates from the scan interval) and poll duration
+
+Requires Home Assistant to be installed. Example:
+
+    python scripts/loadtest.py --counts 1,10,50,100,250 --duration 120
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOMAIN = "eversolar_pmu"
+
+LAG_PROBE_INTERVAL = 0.05
+SAMPLE_INTERVAL = 1.0
+
+CONFIGURATION_YAML = """\
+homeassistant:
+  name: Eversolar load test
+  latitude: -27.47
+  longitude: 153.02
+  elevation: 0
+  unit_system: metric
+  time_zone: {time_zone}
+http:
+  server_host: 127.0.0.1
+  server_port: {http_port}
+recorder:
+  db_url: sqlite:///{db_path}
+  commit_interval: {commit_interval}
+"""
+
+COLUMNS = (
+    ("count", "N", "{:d}"),
+    ("entries_loaded", "loaded", "{:d}"),
+    ("polls", "polls", "{:d}"),
+    ("poll_failures", "fail", "{:d}"),
+    ("loop_lag_p50_ms", "lag p50", "{:.1f}"),
+    ("loop_lag_p99_ms", "lag p99", "{:.1f}"),
+    ("loop_lag_max_ms", "lag max", "{:.1f}"),
+    ("executor_queue_max", "execq max", "{:d}"),
+    ("cpu_percent", "cpu %", "{:.1f}"),
+    ("rss_mib", "rss MiB", "{:.1f}"),
+    ("state_changes_per_s", "states/s", "{:.1f}"),
+    ("recorder_rows_per_s", "rows/s", "{:.1f}"),
+    ("jitter_p50_ms", "jit p50", "{:.0f}"),
+    ("jitter_p99_ms", "jit p99", "{:.0f}"),
+    ("poll_duration_p99_ms", "poll p99", "{:.0f}"),
+)
+
+
+def percentile(values: list, pct: float) -> float:
+    """Return the pct percentile of values by nearest rank, or 0.0 if empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered), math.ceil(pct / 100.0 * len(ordered))) - 1)
+    return ordered[rank]
+
+
+def rss_bytes() -> int:
+    """Return the resident set size of this process."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource  # Not on /proc systems: fall back to peak RSS
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run_fleet(
+    count: int, first_host: str, port: int, latency: float, noise: float, ready, stop
+) -> None:
+    """Run the emulated fleet until stop is set (multiprocessing target)."""
+    sys.path.insert(0, REPO_ROOT)
+    from custom_components.eversolar_pmu.emulator import async_start_fleet
+
+    async def _main() -> None:
+        fleet = await async_start_fleet(count, first_host, port, latency, noise)
+        ready.set()
+        await asyncio.get_running_loop().run_in_executor(None, stop.wait)
+        for pmu in fleet:
+            await pmu.async_stop()
+
+    asyncio.run(_main())
+
+
+async def _async_add_entry(hass, host: str, args) -> bool:
+    """Add one config entry through the config flow; return True if created."""
+    flow = await hass.config_entries.flow.async_init(DOMAIN, context={"source": "user"})
+    flow = await hass.config_entries.flow.async_configure(flow["flow_id"], {"next_step_id": "manual"})
+    result = await hass.config_entries.flow.async_configure(
+        flow["flow_id"],
+        {
+            "host": host,
+            "port": args.port,
+            "scan_interval": args.scan_interval,
+            "timeout": args.timeout,
+        },
+    )
+    return result["type"] == "create_entry"
+
+
+def _count_state_rows(db_path: str) -> int:
+    """Return the number of rows in the recorder states table."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM states").fetchone()[0]
+    finally:
+        conn.close()
+
+
+async def async_measure(args, config_dir: str, db_path: str) -> dict:
+    """Boot Home Assistant against the fleet and measure one window."""
+    from homeassistant import bootstrap
+    from homeassistant.components.recorder import get_instance
+    from homeassistant.const import EVENT_STATE_CHANGED
+    from homeassistant.runner import RuntimeConfig
+
+    sys.path.insert(0, REPO_ROOT)
+    from custom_components.eversolar_pmu.emulator import fleet_hosts
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=args.executor_workers, thread_name_prefix="SyncWorker")
+    loop.set_default_executor(executor)
+
+    hass = await bootstrap.async_setup_hass(RuntimeConfig(config_dir=config_dir, skip_pip=True))
+    if hass is None:
+        raise RuntimeError("Home Assistant failed to set up")
+    await hass.async_start()
+
+    hosts = fleet_hosts(args.count, args.first_host)
+    loaded = 0
+    for host in hosts:
+        if await _async_add_entry(hass, host, args):
+            loaded += 1
+    await hass.async_block_till_done()
+    await asyncio.sleep(args.warmup)
+
+    coordinators = [
+        coord for coord in hass.data.get(DOMAIN, {}).values() if hasattr(coord, "polls_total")
+    ]
+    update_times: dict = {id(coord): [] for coord in coordinators}
+    poll_durations: list = []
+    unsubs = []
+
+    for coord in coordinators:
+        times = update_times[id(coord)]
+
+        def _on_update(coord=coord, times=times) -> None:
+            times.append(loop.time())
+            if coord.last_update_success and coord.last_poll_duration is not None:
+                poll_durations.append(coord.last_poll_duration)
+
+        unsubs.append(coord.async_add_listener(_on_update))
+
+    state_changes = 0
+
+    def _on_state_changed(_event) -> None:
+        nonlocal state_changes
+        state_changes += 1
+
+    unsubs.append(hass.bus.async_listen(EVENT_STATE_CHANGED, _on_state_changed))
+
+    lags: list = []
+    queue_depths: list = []
+
+    async def _lag_probe() -> None:
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            lags.append(max(0.0, loop.time() - start - LAG_PROBE_INTERVAL))
+
+    async def _sampler() -> None:
+        while True:
+            queue_depths.append(executor._work_queue.qsize())
+            await asyncio.sleep(SAMPLE_INTERVAL)
+
+    recorder = get_instance(hass)
+    await recorder.async_block_till_done()
+    rows_start = await loop.run_in_executor(None, _count_state_rows, db_path)
+    polls_start = sum(coord.polls_total for coord in coordinators)
+    failures_start = sum(coord.poll_failures_total for coord in coordinators)
+
+    tasks = [loop.create_task(_lag_probe()), loop.create_task(_sampler())]
+    wall_start = time.monotonic()
+    cpu_start = time.process_time()
+    await asyncio.sleep(args.duration)
+    cpu_used = time.process_time() - cpu_start
+    wall = time.monotonic() - wall_start
+    rss = rss_bytes()
+    for task in tasks:
+        task.cancel()
+    for unsub in unsubs:
+        unsub()
+
+    await recorder.async_block_till_done()
+    rows_end = await loop.run_in_executor(None, _count_state_rows, db_path)
+
+    interval = args.scan_interval
+    jitter = [
+        abs((later - earlier) - interval)
+        for times in update_times.values()
+        for earlier, later in zip(times, times[1:])
+    ]
+
+    result = {
+        "count": args.count,
+        "entries_loaded": loaded,
+        "duration_s": round(wall, 1),
+        "polls": sum(coord.polls_total for coord in coordinators) - polls_start,
+        "poll_failures": sum(coord.poll_failures_total for coord in coordinators) - failures_start,
+        "loop_lag_p50_ms": percentile(lags, 50) * 1000,
+        "loop_lag_p99_ms": percentile(lags, 99) * 1000,
+        "loop_lag_max_ms": max(lags, default=0.0) * 1000,
+        "executor_queue_max": max(queue_depths, default=0),
+        "executor_queue_mean": sum(queue_depths) / len(queue_depths) if queue_depths else 0.0,
+        "cpu_percent": 100.0 * cpu_used / wall,
+        "rss_mib": rss / (1024 * 1024),
+        "state_changes_per_s": state_changes / wall,
+        "recorder_rows_per_s": (rows_end - rows_start) / wall,
+        "jitter_p50_ms": percentile(jitter, 50) * 1000,
+        "jitter_p99_ms": percentile(jitter, 99) * 1000,
+        "poll_duration_p50_ms": percentile(poll_durations, 50) * 1000,
+        "poll_duration_p99_ms": percentile(poll_durations, 99) * 1000,
+    }
+
+    await hass.async_stop()
+    executor.shutdown(wait=False)
+    return result
+
+
+def run_one(args) -> dict:
+    """Measure one fleet size in this process."""
+    with tempfile.TemporaryDirectory(prefix="eversolar-loadtest-") as config_dir:
+        db_path = os.path.join(config_dir, "home-assistant_v2.db")
+        with open(os.path.join(config_dir, "configuration.yaml"), "w", encoding="utf-8") as f:
+            f.write(
+                CONFIGURATION_YAML.format(
+                    time_zone=args.time_zone,
+                    http_port=args.http_port,
+                    db_path=db_path,
+                    commit_interval=args.commit_interval,
+                )
+            )
+        os.symlink(
+            os.path.join(REPO_ROOT, "custom_components"),
+            os.path.join(config_dir, "custom_components"),
+        )
+
+        ctx = multiprocessing.get_context("spawn")
+        ready = ctx.Event()
+        stop = ctx.Event()
+        fleet = ctx.Process(
+            target=run_fleet,
+            args=(args.count, args.first_host, args.port, args.latency, args.noise, ready, stop),
+            daemon=True,
+        )
+        fleet.start()
+        try:
+            if not ready.wait(60):
+                raise RuntimeError("Emulated fleet did not start")
+            return asyncio.run(async_measure(args, config_dir, db_path))
+        finally:
+            stop.set()
+            fleet.join(10)
+
+
+def print_table(results: list) -> None:
+    """Print results as a fixed-width table."""
+    widths = [max(len(title), 9) for _key, title, _fmt in COLUMNS]
+    print("  ".join(title.rjust(width) for (_key, title, _fmt), width in zip(COLUMNS, widths)))
+    for result in results:
+        print(
+            "  ".join(
+                fmt.format(result[key]).rjust(width)
+                for (key, _title, fmt), width in zip(COLUMNS, widths)
+            )
+        )
+
+
+def main(argv=None) -> int:
+    """Run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", default="1,10,50,100", help="Comma-separated fleet sizes")
+    parser.add_argument("--count", type=int, help=argparse.SUPPRESS)  # Internal: one size
+    parser.add_argument("--duration", type=float, default=60.0, help="Measurement window in seconds")
+    parser.add_argument("--warmup", type=float, default=20.0, help="Seconds to run before measuring")
+    parser.add_argument("--scan-interval", type=int, default=10, help="Scan interval per entry (10-300)")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Poll timeout per entry")
+    parser.add_argument("--latency", type=float, default=0.02, help="Emulated PMU response latency")
+    parser.add_argument("--noise", type=float, default=0.0, help="Share of responses preceded by garbage bytes")
+    parser.add_argument("--first-host", default="127.0.1.1", help="First loopback address")
+    parser.add_argument("--port", type=int, default=8080, help="Emulated PMU port")
+    parser.add_argument("--http-port", type=int, default=18123, help="Home Assistant HTTP port")
+    parser.add_argument("--executor-workers", type=int, default=64, help="Executor threads")
+    parser.add_argument("--commit-interval", type=int, default=5, help="Recorder commit interval")
+    parser.add_argument("--time-zone", default="Australia/Brisbane", help="Home Assistant time zone")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.count is not None:
+        print(json.dumps(run_one(args)))
+        return 0
+
+    # Each size runs in a fresh interpreter so RSS and loop state do not carry over
+    results = []
+    passthrough = list(argv if argv is not None else sys.argv[1:])
+    for count in (int(c) for c in args.counts.split(",") if c.strip()):
+        print(f"Measuring N={count} ...", file=sys.stderr)
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), *passthrough, "--count", str(count)],
+            stdout=subprocess.PIPE,
+            check=True,
+            text=True,
+        )
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    print_table(results)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
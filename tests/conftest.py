@@ -0,0 +1,25 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Test setup: expose the integration's modules without Home Assistant.
+
+The integration modules are importable as eversolar_pmu_standalone.<module>;
+the package __init__ (which imports Home Assistant) is never run, so only
+modules without a Home Assistant dependency can be tested here.
+"""
+import os
+import sys
+import types
+
+COMPONENT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    "eversolar_pmu",
+)
+PACKAGE = "eversolar_pmu_standalone"
+
+if PACKAGE not in sys.modules:
+    _package = types.ModuleType(PACKAGE)
+    _package.__path__ = [COMPONENT_DIR]
+    sys.modules[PACKAGE] = _package
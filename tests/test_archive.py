@@ -0,0 +1,75 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Tests for the compressed register archive."""
+from array import array
+
+from eversolar_pmu_standalone.archive import MAGIC, ArchiveWriter, encode_block, iter_samples
+
+CODES = (0x0D, 0x40, 0x41)
+
+
+def _samples(first_ts: int, count: int) -> list:
+    """Return count samples at a 10 s interval from first_ts."""
+    return [(first_ts + 10 * i, array("H", (i, 2300 + i % 3, 5000))) for i in range(count)]
+
+
+def _write(writer: ArchiveWriter, samples: list) -> None:
+    """Write samples to the archive as one block."""
+    for timestamp, raw in samples:
+        writer.add(timestamp, CODES, raw)
+    writer.close_block()
+    writer.write_blocks(writer.take_blocks())
+
+
+def test_round_trip(tmp_path):
+    """Samples read back in order with their codes and values."""
+    samples = _samples(1_700_000_000, 50)
+    _write(ArchiveWriter(str(tmp_path / "a.evarc")), samples)
+    read = list(iter_samples(str(tmp_path / "a.evarc")))
+    assert [(t, tuple(raw)) for t, raw in samples] == [(t, values) for t, _, values in read]
+    assert all(codes == CODES for _, codes, _ in read)
+
+
+def test_truncated_header_ends_stream(tmp_path):
+    """Every cut inside the last block keeps the complete blocks before it."""
+    first = _samples(1_700_000_000, 20)
+    second = _samples(1_700_003_600, 20)
+    block = encode_block(CODES, [t for t, _ in second], [raw for _, raw in second])
+    path = tmp_path / "a.evarc"
+    _write(ArchiveWriter(str(path)), first)
+    complete = path.read_bytes()
+    for cut in range(1, len(block)):
+        path.write_bytes(complete + block[:cut])
+        assert len(list(iter_samples(str(path)))) == len(first), cut
+
+
+def test_append_after_interrupted_write(tmp_path):
+    """A partial tail is cut off before new blocks are appended."""
+    path = tmp_path / "a.evarc"
+    first = _samples(1_700_000_000, 20)
+    _write(ArchiveWriter(str(path)), first)
+    with open(path, "ab") as f:
+        f.write(b"\x80\xd0\x95")
+
+    later = _samples(1_700_003_600, 20)
+    _write(ArchiveWriter(str(path)), later)
+    assert [t for t, _, _ in iter_samples(str(path))] == [t for t, _ in first + later]
+    assert path.read_bytes().startswith(MAGIC)
+
+
+def test_append_after_interrupted_block_body(tmp_path):
+    """A block cut inside its body is removed before the next write."""
+    path = tmp_path / "a.evarc"
+    writer = ArchiveWriter(str(path))
+    first = _samples(1_700_000_000, 20)
+    _write(writer, first)
+    lost = _samples(1_700_001_800, 20)
+    block = encode_block(CODES, [t for t, _ in lost], [raw for _, raw in lost])
+    with open(path, "ab") as f:
+        f.write(block[:-3])
+
+    later = _samples(1_700_003_600, 20)
+    _write(writer, later)
+    assert [t for t, _, _ in iter_samples(str(path))] == [t for t, _ in first + later]
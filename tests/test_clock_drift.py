@@ -0,0 +1,56 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Tests for the PMU clock drift estimator."""
+import math
+import random
+
+from eversolar_pmu_standalone.clock_drift import (
+    DEFAULT_WINDOW_SECONDS,
+    MIN_FIT_SPAN,
+    ClockDriftEstimator,
+)
+
+START = 1_700_000_000.37
+DRIFT_PPM = 100.0
+
+
+def _feed(estimator: ClockDriftEstimator, interval: float, duration: float, first: float = START) -> float:
+    """Feed polls of a drifting PMU clock every interval seconds; return the last host time.
+
+    Poll times jitter by up to a second, as real polls do, so the whole-second
+    PMU epoch does not hide a drift smaller than one second.
+    """
+    jitter = random.Random(interval)
+    host_time = first
+    for i in range(int(duration // interval) + 1):
+        host_time = first + i * interval + jitter.random()
+        estimator.add(host_time, math.floor(host_time + 2.0 + (host_time - START) * DRIFT_PPM / 1e6))
+    return host_time
+
+
+def test_drift_fitted_at_fastest_scan_interval():
+    """At a 10 s cadence the slope is reported once the fit span is reached."""
+    estimator = ClockDriftEstimator()
+    host_time = _feed(estimator, 10.0, MIN_FIT_SPAN - 10.0)
+    assert estimator.drift_ppm is None
+    host_time = _feed(estimator, 10.0, DEFAULT_WINDOW_SECONDS, host_time + 10.0)
+    assert abs(estimator.drift_ppm - DRIFT_PPM) < 30.0
+    expected = 2.0 + (host_time + 3600.0 - START) * DRIFT_PPM / 1e6
+    assert abs(estimator.project(host_time + 3600.0) - expected) < 0.6
+
+
+def test_window_bounded_by_age_at_fast_cadence():
+    """Frequent polls keep about window_seconds of history."""
+    estimator = ClockDriftEstimator()
+    _feed(estimator, 10.0, 3 * DEFAULT_WINDOW_SECONDS)
+    assert len(estimator._samples) == int(DEFAULT_WINDOW_SECONDS // 10.0) + 1
+
+
+def test_window_keeps_sample_count_at_slow_cadence():
+    """Infrequent polls keep the default number of samples."""
+    estimator = ClockDriftEstimator()
+    _feed(estimator, 300.0, 24 * 3600.0)
+    assert len(estimator._samples) == 60
+    assert abs(estimator.drift_ppm - DRIFT_PPM) < 30.0
@@ -0,0 +1,52 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Tests for subnet discovery against the bundled emulator."""
+import asyncio
+
+from eversolar_pmu_standalone.discovery import async_probe_pmu, async_scan_network
+from eversolar_pmu_standalone.emulator import DEFAULT_CODES, EmulatedPMU
+
+INVERTER_ID = "A1B2C3D4E5F60718"
+
+
+async def _scan(pmu: EmulatedPMU, network: str, **kwargs) -> dict:
+    """Start the emulator on a free port, scan network on that port and stop it."""
+    await pmu.async_start("127.0.0.1", 0)
+    try:
+        return await async_scan_network(network, pmu.sockname[1], **kwargs)
+    finally:
+        await pmu.async_stop()
+
+
+def test_scan_finds_emulated_pmu():
+    """A scan of the emulator's address reports its inverter ID and codes."""
+    found = asyncio.run(_scan(EmulatedPMU(INVERTER_ID), "127.0.0.1/32"))
+    assert list(found) == ["127.0.0.1"]
+    assert found["127.0.0.1"].inverter_id == INVERTER_ID
+    assert found["127.0.0.1"].codes == DEFAULT_CODES
+
+
+def test_scan_survives_noisy_link():
+    """Garbage before responses does not hide a PMU."""
+    found = asyncio.run(_scan(EmulatedPMU(INVERTER_ID, noise=1.0), "127.0.0.1/32"))
+    assert found["127.0.0.1"].inverter_id == INVERTER_ID
+
+
+def test_scan_skips_excluded_hosts():
+    """Excluded hosts are not probed."""
+    found = asyncio.run(_scan(EmulatedPMU(INVERTER_ID), "127.0.0.1/32", exclude={"127.0.0.1"}))
+    assert found == {}
+
+
+def test_probe_without_listener_returns_none():
+    """A closed port is not a PMU."""
+    async def _probe():
+        pmu = EmulatedPMU(INVERTER_ID)
+        await pmu.async_start("127.0.0.1", 0)
+        port = pmu.sockname[1]
+        await pmu.async_stop()
+        return await async_probe_pmu("127.0.0.1", port, 0.5)
+
+    assert asyncio.run(_probe()) is None
@@ -0,0 +1,50 @@
+# SPDX-License-Identifier: GPL-3.0
+# Copyright (C) 2026 Anthony Burow
+# https://github.com/aburow/eversolar-pmu-ha
+
+"""Tests for the memory-mapped sample store."""
+from array import array
+
+import pytest
+
+from eversolar_pmu_standalone.sample_store import SampleStore
+
+CODES = (0x0D, 0x40, 0x41)
+START = 1_700_000_000
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Return a store of 10 samples split over two code lists, 5 each."""
+    store = SampleStore(str(tmp_path))
+    for i in range(10):
+        store.append(START + 10 * i, CODES if i < 5 else CODES[:2], array("H", (i, 2300, 5000)[: 3 if i < 5 else 2]))
+    yield store
+    store.close()
+
+
+def test_read_columns_without_limit(store):
+    """Every sample in range is returned, one block per code list."""
+    result = store.read_columns(START, START + 1000)
+    assert result["samples"] == 10
+    assert not result["truncated"]
+    assert [len(block["timestamps"]) for block in result["blocks"]] == [5, 5]
+    assert result["blocks"][0]["registers"]["0x0d"] == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize(
+    ("limit", "samples", "truncated"),
+    [(3, 3, True), (5, 5, True), (9, 9, True), (10, 10, False), (11, 10, False)],
+)
+def test_read_columns_limit(store, limit, samples, truncated):
+    """truncated is set only when samples in range were left out."""
+    result = store.read_columns(START, START + 1000, limit=limit)
+    assert result["samples"] == samples
+    assert result["truncated"] is truncated
+
+
+def test_read_columns_limit_within_range(store):
+    """A limit equal to the samples in a narrower range is not truncation."""
+    result = store.read_columns(START, START + 20, limit=3)
+    assert result["samples"] == 3
+    assert not result["truncated"]